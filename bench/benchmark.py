@@ -0,0 +1,503 @@
+"""
+
+Benchmark suite for HttpCtrl library hot paths: server request throughput, stub lookup, client latency, Json
+access and import time of the libraries. Benchmarks are run offline on localhost, results are written in JSON
+format and can be compared with a stored baseline.
+
+Stored baseline 'bench/baseline.json' has been recorded on a single developer machine, it shows the order of
+values and is not a portable pass/fail threshold. Record a baseline by '--update-baseline' on the machine where
+results are compared.
+
+Usage:
+
+    python3 bench/benchmark.py --output results.json --baseline bench/baseline.json --threshold 0.25
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+
+SOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SOURCE_PATH)
+
+from HttpCtrl import Client, Json, Server                                           # noqa: E402
+from HttpCtrl.http_server import HttpServer                                         # noqa: E402
+from HttpCtrl.http_stub import HttpStubContainer, HttpStubCriteria                  # noqa: E402
+from HttpCtrl.request_storage import RequestStorage                                 # noqa: E402
+from HttpCtrl.response import Response                                             # noqa: E402
+from HttpCtrl.response_selector import SingleResponseSelector                       # noqa: E402
+from HttpCtrl.response_storage import ResponseStorage                               # noqa: E402
+from HttpCtrl.synthetic_body import SyntheticBody                                   # noqa: E402
+from HttpCtrl.tls_certificate import LocalCertificateAuthority, create_server_context  # noqa: E402
+
+
+HIGHER_IS_BETTER = 'higher'
+LOWER_IS_BETTER = 'lower'
+
+# direction of each metric that is used to detect regressions
+METRICS = {
+    'ops_per_sec': HIGHER_IS_BETTER,
+    'requests_per_sec': HIGHER_IS_BETTER,
+    'latency_p50_ms': LOWER_IS_BETTER,
+    'latency_p95_ms': LOWER_IS_BETTER,
+    'import_time_ms': LOWER_IS_BETTER,
+    'encoded_ratio': LOWER_IS_BETTER,
+    'megabytes_per_sec': HIGHER_IS_BETTER,
+    'peak_memory_mb': LOWER_IS_BETTER,
+}
+
+# Robot Framework is loaded before the library is imported, as it is done by a test run.
+IMPORT_SCRIPT = """
+import time
+import robot.api
+
+start_time = time.perf_counter()
+from HttpCtrl import %s
+print((time.perf_counter() - start_time) * 1000.0)
+"""
+
+
+class LocalServer:
+    def __init__(self, ssl_context=None, unix_path=None):
+        if unix_path is None:
+            self.host = '127.0.0.1'
+            self.port = LocalServer.find_free_port(self.host)
+        else:
+            self.host = 'unix:' + unix_path
+            self.port = 0
+
+        self.__server = HttpServer(self.host, self.port, ssl_context)
+        self.__thread = threading.Thread(target=self.__server.start, args=())
+
+
+    def __enter__(self):
+        self.__thread.start()
+        self.__server.wait_run_state()
+        return self
+
+
+    def __exit__(self, *args):
+        self.__server.stop()
+        self.__thread.join()
+
+        ResponseStorage().clear()
+        RequestStorage().clear()
+        HttpStubContainer().clear()
+
+
+    @staticmethod
+    def find_free_port(host):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.bind((host, 0))
+            return probe.getsockname()[1]
+
+
+def measure_operations(operation, amount):
+    start_time = time.perf_counter()
+    for _ in range(amount):
+        operation()
+
+    return amount / (time.perf_counter() - start_time)
+
+
+def measure_latencies(operation, amount):
+    latencies = []
+    for _ in range(amount):
+        start_time = time.perf_counter()
+        operation()
+        latencies.append((time.perf_counter() - start_time) * 1000.0)
+
+    latencies.sort()
+    return {
+        'latency_p50_ms': statistics.median(latencies),
+        'latency_p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    }
+
+
+def send_raw_request(host, port, method, url):
+    connection = http.client.HTTPConnection(host, port)
+    try:
+        connection.request(method, url)
+        connection.getresponse().read()
+    finally:
+        connection.close()
+
+
+def benchmark_server_stub_throughput(scale):
+    with LocalServer() as server:
+        HttpStubContainer().add(HttpStubCriteria(method='GET', url='/bench'),
+                                SingleResponseSelector(Response(200, None, "Benchmark", None, None)))
+
+        operation = lambda: send_raw_request(server.host, server.port, 'GET', '/bench')
+        return {'requests_per_sec': measure_operations(operation, 500 * scale)}
+
+
+def benchmark_server_large_stub_body(scale):
+    """
+    Measures stub replies with 8 MByte text body, the body is encoded by the response once.
+
+    """
+    body = "0123456789abcdef" * 524288
+
+    with LocalServer() as server:
+        HttpStubContainer().add(HttpStubCriteria(method='GET', url='/bench'),
+                                SingleResponseSelector(Response(200, None, body, None, None)))
+
+        amount = 20 * scale
+        operation = lambda: send_raw_request(server.host, server.port, 'GET', '/bench')
+        return {'megabytes_per_sec': measure_operations(operation, amount) * len(body) / 1048576}
+
+
+def benchmark_server_reply_throughput(scale):
+    with LocalServer() as server:
+        amount = 200 * scale
+        response = Response(200, None, "Benchmark", None, {})
+
+        def reply_requests():
+            for _ in range(amount):
+                request = RequestStorage().pop()
+                if request is None:
+                    return
+                ResponseStorage().push(request, response)
+
+        replier = threading.Thread(target=reply_requests)
+        replier.start()
+
+        operation = lambda: send_raw_request(server.host, server.port, 'POST', '/bench')
+        result = {'requests_per_sec': measure_operations(operation, amount)}
+
+        replier.join()
+        return result
+
+
+def benchmark_server_restart(warm, scale):
+    """
+    Measures 'Start Server'/'Stop Server' pairs as they are called by test setup and teardown.
+
+    """
+    host = '127.0.0.1'
+    port = LocalServer.find_free_port(host)
+    server = Server()
+
+    def operation():
+        server.start_server(host, port, warm)
+        server.stop_server()
+
+    try:
+        return {'ops_per_sec': measure_operations(operation, 50 * scale)}
+    finally:
+        server.stop_server(force=True)
+
+
+def benchmark_stub_get(amount_stubs, scale):
+    container = HttpStubContainer()
+    container.clear()
+
+    response = SingleResponseSelector(Response(200, None, None, None, None))
+    for index in range(amount_stubs):
+        container.add(HttpStubCriteria(method='GET', url='/stub/%d' % index), response)
+
+    # the last stub is the worst case for the lookup
+    criteria = HttpStubCriteria(method='GET', url='/stub/%d' % (amount_stubs - 1))
+    amount = max(20, (200000 * scale) // amount_stubs)
+
+    try:
+        return {'ops_per_sec': measure_operations(lambda: container.get(criteria), amount)}
+    finally:
+        container.clear()
+
+
+def benchmark_client_sequential(scale, unix=False):
+    unix_path = os.path.join(tempfile.gettempdir(), 'httpctrl-bench-%d.sock' % os.getpid()) if unix else None
+
+    with LocalServer(unix_path=unix_path) as server:
+        HttpStubContainer().add(HttpStubCriteria(method='GET', url='/bench'),
+                                SingleResponseSelector(Response(200, None, "Benchmark", None, None)))
+
+        client = Client()
+        client.initialize_client(server.host, server.port)
+
+        def operation():
+            client.send_http_request('GET', '/bench')
+            client.get_response_body()
+
+        return measure_latencies(operation, 300 * scale)
+
+
+def benchmark_client_https_sequential(scale):
+    """
+    Measures latency of HTTPS requests where TLS sessions are resumed, it requires package 'cryptography' to
+    generate server certificate, the benchmark is skipped if it is not installed.
+
+    """
+    try:
+        certificate, key = LocalCertificateAuthority().issue('127.0.0.1')
+    except RuntimeError as exception:
+        print("client_https_sequential is skipped (reason: '%s')." % str(exception))
+        return {}
+
+    with LocalServer(create_server_context(certificate, key)) as server:
+        HttpStubContainer().add(HttpStubCriteria(method='GET', url='/bench'),
+                                SingleResponseSelector(Response(200, None, "Benchmark", None, None)))
+
+        client = Client()
+        client.initialize_client(server.host, server.port)
+        client.set_client_ca_bundle(LocalCertificateAuthority().get_ca_certificate_file())
+
+        def operation():
+            client.send_https_request('GET', '/bench')
+            client.get_response_body()
+
+        return measure_latencies(operation, 300 * scale)
+
+
+def benchmark_client_async(scale):
+    with LocalServer() as server:
+        HttpStubContainer().add(HttpStubCriteria(method='GET', url='/bench'),
+                                SingleResponseSelector(Response(200, None, "Benchmark", None, None)))
+
+        client = Client()
+        client.initialize_client(server.host, server.port)
+
+        amount = 300 * scale
+        start_time = time.perf_counter()
+
+        connections = [client.send_http_request_async('GET', '/bench') for _ in range(amount)]
+        for connection in connections:
+            if client.get_async_response(connection, 5) is None:
+                raise RuntimeError("async response is not received")
+
+        return {'requests_per_sec': amount / (time.perf_counter() - start_time)}
+
+
+def benchmark_import(library, scale):
+    """
+    Measures import time of the library in a fresh interpreter, the best result of several runs is taken.
+
+    """
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join(filter(None, [SOURCE_PATH, environment.get('PYTHONPATH')]))
+
+    durations = []
+    for _ in range(5 * scale):
+        output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT % library], env=environment)
+        durations.append(float(output.decode('ascii').strip()))
+
+    return {'import_time_ms': min(durations)}
+
+
+def create_large_json_document():
+    return json.dumps({
+        'catalog': {
+            'books': [{'title': 'Book %d' % index, 'price': index, 'tags': ['tag%d' % tag for tag in range(5)]}
+                      for index in range(10000)]
+        }
+    })
+
+
+def benchmark_client_compressed(encoding, scale):
+    with LocalServer() as server:
+        document = create_large_json_document()
+        criteria = HttpStubCriteria(method='GET', url='/bench')
+
+        HttpStubContainer().add(criteria, SingleResponseSelector(Response(200, None, document, None, None)))
+        HttpStubContainer().set_compression(criteria, [encoding])
+
+        connection = http.client.HTTPConnection(server.host, server.port)
+        try:
+            connection.request('GET', '/bench', headers={'Accept-Encoding': encoding})
+            encoded_size = len(connection.getresponse().read())
+        finally:
+            connection.close()
+
+        client = Client()
+        client.initialize_client(server.host, server.port)
+        client.enable_response_decompression(encoding)
+
+        def operation():
+            client.send_http_request('GET', '/bench')
+            client.get_response_body()
+
+        return {'requests_per_sec': measure_operations(operation, 50 * scale),
+                'encoded_ratio': encoded_size / len(document)}
+
+
+def benchmark_synthetic_body(scale):
+    """
+    Measures download of a synthetic body through the server stub to the client that checks the body digest without
+    keeping it, peak memory is traced for both sides.
+
+    """
+    size = 256 * 1048576 * scale
+
+    with LocalServer() as server:
+        body = SyntheticBody(size, seed=1)
+        HttpStubContainer().add(HttpStubCriteria(method='GET', url='/bench'),
+                                SingleResponseSelector(Response(200, None, body, None, None)))
+
+        client = Client()
+        client.initialize_client(server.host, server.port)
+        client.enable_response_body_digest('sha256', keep_body=False)
+
+        tracemalloc.start()
+        try:
+            start_time = time.perf_counter()
+            client.send_http_request('GET', '/bench')
+            duration = time.perf_counter() - start_time
+
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        if client.get_response_body_digest() != body.get_digest('sha256'):
+            raise RuntimeError("digest of synthetic body is not matched")
+
+        return {'megabytes_per_sec': size / 1048576 / duration, 'peak_memory_mb': peak_memory / 1048576}
+
+
+def benchmark_json_get(scale):
+    document = create_large_json_document()
+    operation = lambda: Json.get_json_value_from_string(document, 'catalog/books/9999/title')
+    return {'ops_per_sec': measure_operations(operation, 20 * scale)}
+
+
+def benchmark_json_set(scale):
+    document = create_large_json_document()
+    operation = lambda: Json.set_json_value_in_string(document, 'catalog/books/9999/price', 0)
+    return {'ops_per_sec': measure_operations(operation, 20 * scale)}
+
+
+BENCHMARKS = {
+    'server_stub_throughput': benchmark_server_stub_throughput,
+    'server_reply_throughput': benchmark_server_reply_throughput,
+    'server_large_stub_body': benchmark_server_large_stub_body,
+    'server_restart_cold': lambda scale: benchmark_server_restart(False, scale),
+    'server_restart_warm': lambda scale: benchmark_server_restart(True, scale),
+    'stub_get_10': lambda scale: benchmark_stub_get(10, scale),
+    'stub_get_1k': lambda scale: benchmark_stub_get(1000, scale),
+    'stub_get_100k': lambda scale: benchmark_stub_get(100000, scale),
+    'client_sequential': benchmark_client_sequential,
+    'client_sequential_unix': lambda scale: benchmark_client_sequential(scale, True),
+    'client_https_sequential': benchmark_client_https_sequential,
+    'client_async': benchmark_client_async,
+    'client_gzip_body': lambda scale: benchmark_client_compressed('gzip', scale),
+    'client_deflate_body': lambda scale: benchmark_client_compressed('deflate', scale),
+    'client_synthetic_body': benchmark_synthetic_body,
+    'json_get_large': benchmark_json_get,
+    'json_set_large': benchmark_json_set,
+    'import_client': lambda scale: benchmark_import('Client', scale),
+    'import_server': lambda scale: benchmark_import('Server', scale),
+    'import_json': lambda scale: benchmark_import('Json', scale),
+    'import_logging': lambda scale: benchmark_import('Logging', scale),
+}
+
+
+def select_best(results):
+    """
+    Returns the best value of each metric among repeated runs to reduce noise.
+
+    """
+    best = {}
+    for metric in results[0]:
+        values = [result[metric] for result in results]
+        best[metric] = max(values) if METRICS[metric] == HIGHER_IS_BETTER else min(values)
+
+    return best
+
+
+def run_benchmarks(names, repeat, scale):
+    results = {}
+    for name in names:
+        results[name] = select_best([BENCHMARKS[name](scale) for _ in range(repeat)])
+        print("%-28s %s" % (name, ", ".join("%s: %.3f" % (key, value) for key, value in results[name].items())))
+
+    return results
+
+
+def compare_with_baseline(results, baseline, threshold):
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get('results', {}).get(name, {}).get(metric)
+            if not expected:
+                continue
+
+            if METRICS[metric] == HIGHER_IS_BETTER:
+                change = (expected - value) / expected
+            else:
+                change = (value - expected) / expected
+
+            if change > threshold:
+                regressions.append("%s.%s: %.3f (baseline: %.3f, worse by %.1f%%)" %
+                                   (name, metric, value, expected, change * 100.0))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for HttpCtrl library.")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help="benchmarks to run (by default all)")
+    parser.add_argument('--repeat', type=int, default=3, help="amount of runs of each benchmark, the best is taken")
+    parser.add_argument('--scale', type=int, default=1, help="multiplier for amount of operations")
+    parser.add_argument('--output', help="file where results are written in JSON format")
+    parser.add_argument('--baseline', help="file with baseline results to compare with")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed relative degradation against the baseline (by default 0.25 - 25%%)")
+    parser.add_argument('--update-baseline', action='store_true', help="write results to the baseline file")
+
+    arguments = parser.parse_args()
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': run_benchmarks(arguments.only, arguments.repeat, arguments.scale)
+    }
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file_stream:
+            json.dump(report, file_stream, indent=4)
+
+    if arguments.baseline:
+        if arguments.update_baseline:
+            with open(arguments.baseline, 'w') as file_stream:
+                json.dump(report, file_stream, indent=4)
+                file_stream.write('\n')
+
+            print("Baseline '%s' is updated." % arguments.baseline)
+            return 0
+
+        with open(arguments.baseline) as file_stream:
+            baseline = json.load(file_stream)
+
+        regressions = compare_with_baseline(report['results'], baseline, arguments.threshold)
+        if regressions:
+            print("Performance regressions against '%s':" % arguments.baseline)
+            for regression in regressions:
+                print("    %s" % regression)
+
+            return 1
+
+        print("No performance regressions against '%s'." % arguments.baseline)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
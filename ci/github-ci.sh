@@ -11,6 +11,10 @@ EXIT_CODE_FAILED_TESTING=2
 echo "Install Robot Framework."
 pip3 install robotframework
 
+# optional packages that are used by the library
+echo "Install optional packages."
+pip3 install cryptography brotli zstandard
+
 # packages to generate documentation
 echo "Install packages to generate documentation."
 pip3 install docutils pygments
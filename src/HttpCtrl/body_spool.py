@@ -0,0 +1,150 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+import weakref
+
+from HttpCtrl.utils.singleton import Singleton
+
+
+class SpooledBody:
+    """
+    Body of incoming request that is streamed to a temporary spool file instead of memory. The file is mapped to
+    memory only when the body is accessed, so pages are loaded by the operating system on demand and they are not
+    counted as memory of the process. The file is removed when the body is not referenced anymore.
+
+    """
+    DEFAULT_CHUNK_SIZE = 1048576    # 1 MByte
+
+
+    def __init__(self, path, length):
+        self.__path = path
+        self.__length = length
+        self.__view = None
+
+        weakref.finalize(self, SpooledBody.__remove, path)
+
+
+    def __str__(self):
+        return "<spooled body: '%d' bytes, file: '%s'>" % (self.__length, self.__path)
+
+
+    def __len__(self):
+        return self.__length
+
+
+    @staticmethod
+    def receive(stream, length, directory=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Reads `length` bytes of the body from the stream to a spool file using one reusable buffer. If the stream is
+        closed earlier then the body contains only received bytes.
+
+        """
+        descriptor, path = tempfile.mkstemp(prefix='httpctrl-body-', suffix='.spool', dir=directory)
+
+        try:
+            buffer = memoryview(bytearray(min(length, chunk_size)))
+            received = 0
+
+            with open(descriptor, 'wb', buffering=0) as spool:
+                while received < length:
+                    amount = stream.readinto(buffer[:min(length - received, len(buffer))])
+                    if not amount:
+                        break
+
+                    spool.write(buffer[:amount])
+                    received += amount
+
+        except BaseException:
+            SpooledBody.__remove(path)
+            raise
+
+        return SpooledBody(path, received)
+
+
+    def get_path(self):
+        return self.__path
+
+
+    def get_view(self):
+        """
+        Returns read-only memory-mapped view of the body (`mmap.mmap`) that supports `len`, indexing, slicing
+        (slice is returned as bytes), `find` and buffer protocol. The file is mapped on the first call.
+
+        """
+        if self.__view is None:
+            if self.__length == 0:
+                return b''  # empty file cannot be mapped
+
+            with open(self.__path, 'rb') as spool:
+                self.__view = mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return self.__view
+
+
+    def get_digest(self, algorithm='sha256'):
+        digest = hashlib.new(algorithm)
+        digest.update(self.get_view())
+        return digest.hexdigest()
+
+
+    def save(self, path):
+        # the file is copied by the kernel (for example, 'sendfile' on Linux) without loading it to the process
+        shutil.copyfile(self.__path, path)
+
+
+    @staticmethod
+    def __remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class BodySpool(metaclass=Singleton):
+    """
+    Defines which bodies of incoming requests are spooled to disk: bodies that are larger than the threshold are
+    streamed to temporary files, smaller bodies are kept in memory. Spooling is disabled by default.
+
+    """
+    def __init__(self):
+        self.__threshold = None
+        self.__directory = None
+
+
+    def set_threshold(self, threshold, directory=None):
+        if (threshold is not None) and (threshold < 0):
+            raise ValueError("spool threshold should be non-negative, but '%d' is provided" % threshold)
+
+        if (directory is not None) and not os.path.isdir(directory):
+            raise ValueError("spool directory '%s' does not exist" % directory)
+
+        self.__threshold, self.__directory = threshold, directory
+
+
+    def get_threshold(self):
+        return self.__threshold
+
+
+    def receive(self, stream, length):
+        """
+        Returns body that is read from the stream: bytes if the body is not larger than the threshold, otherwise
+        spooled body.
+
+        """
+        threshold, directory = self.__threshold, self.__directory
+        if (threshold is None) or (length <= threshold):
+            return stream.read(length)
+
+        return SpooledBody.receive(stream, length, directory)
@@ -0,0 +1,1658 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import datetime
+import hashlib
+import http.client
+import threading
+import time
+
+from robot.api import logger
+
+from HttpCtrl.compression import StreamDecompressor, get_supported_encodings, is_supported, parse_content_encoding
+from HttpCtrl.connection_pool import ConnectionPool
+from HttpCtrl.http_connection import ClientTimeouts, DeadlineWatchdog, ResumableHTTPSConnection, TlsConfiguration, \
+    TlsContextCache, UnixHTTPConnection, abort_connection
+from HttpCtrl.http_headers import HttpHeaderLines, HttpHeaders
+from HttpCtrl.retry_policy import HedgingPolicy, RetryPolicy
+from HttpCtrl.utils.address import get_unix_socket_path
+from HttpCtrl.utils.logger import LoggerAssistant
+from HttpCtrl.utils.profiler import Profiler
+
+from HttpCtrl.response import Response
+
+
+class Client:
+    """
+
+    HTTP/HTTPS Client library that provides comprehensive interface to Robot Framework to control HTTP/HTTPS client.
+
+    See other HttpCtrl libraries:
+
+    - HttpCtrl.Server_ - HTTP Server API for testing where easy-controlled HTTP server is required.
+
+    - HttpCtrl.Json_ - Json related API for testing where work with Json message is required.
+
+    - HttpCtrl.Logging_ - Logging related API to configure the logging system that is used by HttpCtrl library.
+
+    .. _HttpCtrl.Server: server.html
+    .. _HttpCtrl.Json: json.html
+    .. _HttpCtrl.Logging: logging.html
+
+    Example how to send GET request to obtain origin IP address and check that response is not empty:
+
+    .. code:: robotframework
+
+        *** Settings ***
+
+        Library         HttpCtrl.Client
+        Library         HttpCtrl.Json
+
+        *** Test Cases ***
+
+        Get Origin Address
+            Initialize Client   www.httpbin.org
+            Send HTTP Request   GET   /ip
+
+            ${response status}=   Get Response Status
+            ${response body}=     Get Response Body
+
+            ${expected status}=   Convert To Integer   200
+            Should Be Equal   ${response status}   ${expected status}
+
+            ${origin}=    Get Json Value From String   ${response body}   origin
+            Should Not Be Empty   ${origin}
+
+    Example how to sent PATCH request using HTTPS:
+
+    .. code:: robotframework
+
+        *** Settings ***
+
+        Library         HttpCtrl.Client
+        Library         HttpCtrl.Json
+
+        *** Test Cases ***
+
+        Send HTTPS PATCH Request
+            Initialize Client   www.httpbin.org
+
+            ${body}=   Set Variable   { "volume": 77, "mute": false }
+            Send HTTPS Request   PATCH   /patch   ${body}
+
+            ${response status}=   Get Response Status
+            ${response body}=     Get Response Body
+            ${response body}=     Decode Bytes To String   ${response body}   UTF-8
+
+            ${expected status}=   Convert To Integer   200
+            Should Be Equal   ${response status}   ${expected status}
+
+            ${volume}=   Get Json Value From String   ${response body}   json/volume
+            Should Be Equal   ${volume}   ${77}
+
+            ${mute}=   Get Json Value From String   ${response body}   json/mute
+            Should Be Equal   ${mute}   ${False}
+
+    """
+    __BODY_CHUNK_SIZE = 10000000   # 10 MByte
+
+
+    def __init__(self):
+        self.__server_host = None
+        self.__server_port = None
+        self.__client_host = None
+        self.__client_port = None
+        self.__unix_path = None
+
+        self.__request_headers = HttpHeaders()
+        self.__accept_encodings = None
+        self.__digest_algorithm = None
+        self.__keep_digested_body = True
+        self.__tls_configuration = TlsConfiguration()
+        self.__timeouts = ClientTimeouts()
+        self.__request_timeouts = None
+        self.__retry_policy = None
+        self.__hedging_policy = None
+        self.__connection_pool = None
+
+        self.__response_guard = threading.Lock()
+        self.__response_status = None
+        self.__response_message = None
+        self.__response_body_filename = None
+        self.__response_body = None
+        self.__response_body_digest = None
+        self.__response_headers = None
+
+        self.__event_queue = threading.Condition()
+        self.__async_queue = {}
+
+
+    def __del__(self):
+        if self.__connection_pool is not None:
+            self.__connection_pool.close()
+
+
+    def initialize_client(self, server_host, server_port=None, client_host=None, client_port=0):
+        """
+
+        Initialize client using host and port of a server which will be used for communication.
+
+        `server_host` [in] (string): Host of a server that is going to be used for communication by a client or 'unix:<path>' for Unix domain socket.
+
+        `server_port` [in] (string|integer): Port of a server that is going to be used for communication by a client. Optional argument.
+
+        `client_host` [in] (string): Host of a client (source) that is used to bind. Optional argument.
+
+        `client_port` [in] (string|integer): Port of a client (source) that is used to bind. Optional argument.
+
+        Example when server is located on a machine with address 192.168.0.1 and port 8000:
+
+        +-------------------+-------------+------+
+        | Initialize Client | 192.168.0.1 | 8000 |
+        +-------------------+-------------+------+
+
+        Example when server is located on a machine with IPv6 address 0000:0000:0000:0000:0000:0000:0000:0001 and port 8000:
+
+        +-------------------+-----------------------------------------+------+
+        | Initialize Client | 0000:0000:0000:0000:0000:0000:0000:0001 | 8000 |
+        +-------------------+-----------------------------------------+------+
+
+        .. code:: text
+
+            Initialize Client   192.168.0.1   8000
+
+        Example when your server has name:
+
+        +-------------------+-----------------+
+        | Initialize Client | www.httpbin.org |
+        +-------------------+-----------------+
+
+        .. code:: text
+
+            Initialize Client   www.httpbin.org
+
+        Example when a client is bind to the specific address 192.168.0.1 and port 8001:
+
+        +-------------------+-------------+------+-------------+------+
+        | Initialize Client | 192.168.0.5 | 8000 | 192.168.0.1 | 8001 |
+        +-------------------+-------------+------+-------------+------+
+
+        .. code:: text
+
+            Initialize Client   192.168.0.5   8000   192.168.0.1   8001
+
+        Example when a client is bind to the specific address only 192.168.0.1 (without port):
+
+        +-------------------+-------------+------+-------------+
+        | Initialize Client | 192.168.0.5 | 8000 | 192.168.0.1 |
+        +-------------------+-------------+------+-------------+
+
+        .. code:: text
+
+            Initialize Client   192.168.0.5   8000   192.168.0.1
+
+        Example when server listens to Unix domain socket (HTTP only, see \`Start Server\` in HttpCtrl.Server_):
+
+        +-------------------+-------------------------+
+        | Initialize Client | unix:/tmp/httpctrl.sock |
+        +-------------------+-------------------------+
+
+        .. code:: text
+
+            Initialize Client   unix:/tmp/httpctrl.sock
+
+        """
+        try:
+            unix_path = get_unix_socket_path(server_host)
+        except ValueError as exception:
+            raise AssertionError("Impossible to initialize client (reason: '%s')." % str(exception))
+
+        self.__server_host = server_host
+        self.__server_port = server_port or ""
+        self.__unix_path = unix_path
+
+        self.__client_host = client_host
+        self.__client_port = client_port
+
+
+    def __get_source_address(self):
+        if self.__client_host is None:
+            return None
+
+        return self.__client_host, int(self.__client_port)
+
+
+    def __get_endpoint(self):
+        if self.__server_host is None or self.__server_port is None:
+            raise AssertionError("Client is not initialized (host and port are empty).")
+
+        if self.__unix_path is not None:
+            return self.__server_host
+
+        return "%s:%s" % (self.__server_host, str(self.__server_port))
+
+
+    def __get_pool_key(self, connection_type):
+        tls_key = self.__tls_configuration.get_key() if connection_type == 'https' else None
+        return connection_type, self.__get_endpoint(), self.__get_source_address(), tls_key
+
+
+    def __create_connection(self, connection_type, connect_timeout):
+        endpoint = self.__get_endpoint()
+
+        connection_arguments = {'source_address': self.__get_source_address()}
+        if connect_timeout is not None:
+            connection_arguments['timeout'] = connect_timeout
+
+        if self.__unix_path is not None:
+            if connection_type != 'http':
+                raise AssertionError("Impossible to send request to '%s' (reason: 'Unix domain socket is supported "
+                                     "by HTTP only')." % endpoint)
+
+            connection_arguments.pop('source_address')
+            return UnixHTTPConnection(self.__unix_path, **connection_arguments)
+
+        if connection_type == 'http':
+            return http.client.HTTPConnection(endpoint, **connection_arguments)
+        elif connection_type == 'https':
+            context = TlsContextCache().get_context(self.__tls_configuration)
+            return ResumableHTTPSConnection(endpoint, context=context, **connection_arguments)
+
+        raise AssertionError("Internal error of the client, please report to "
+                             "'https://github.com/annoviko/robotframework-httpctrl/issues'.")
+
+
+    def __send(self, connection_type, method, url, body, headers, timeouts, strict=False, connection=None):
+        endpoint = self.__get_endpoint()
+        connect_timeout = timeouts.get_connect_timeout()
+
+        if connection is None:
+            logger.info("Connect to the server (type: '%s', endpoint: '%s')" % (connection_type, endpoint))
+            connection = self.__create_connection(connection_type, connect_timeout)
+        else:
+            logger.info("Reuse connection to the server (type: '%s', endpoint: '%s')" % (connection_type, endpoint))
+
+        # the watchdog shuts the socket down when the deadline is exceeded, so the request is cancelled at any stage
+        deadline = None
+        if timeouts.total is not None:
+            deadline = DeadlineWatchdog().watch(connection, timeouts.total)
+
+        logger.info("Send request to the server (method: '%s', url: '%s')." % (method, url))
+        try:
+            connection.request(method, url, body, headers)
+
+            # connect timeout (or timeout of the previous request) is replaced by read timeout
+            if (connection.sock is not None) and (connection.sock.gettimeout() != timeouts.read):
+                connection.sock.settimeout(timeouts.read)
+        except Exception as exception:
+            logger.info("Impossible to send request to the server (reason: '%s')." % str(exception))
+            if strict is True:
+                DeadlineWatchdog().release(deadline)
+                connection.close()
+                Client.__raise_failure(exception, deadline)
+
+        if isinstance(connection, ResumableHTTPSConnection) and connection.is_session_reused():
+            logger.info("TLS session is resumed (endpoint: '%s')." % endpoint)
+
+        logger.info("Request (type: '%s', method '%s') was sent to '%s'." % (connection_type, method, endpoint))
+        logger.info("%s %s" % (method, url))
+        if body is not None:
+            body_to_log = LoggerAssistant.get_body(body)
+            logger.info("%s" % body_to_log)
+
+        return connection, deadline
+
+
+    @staticmethod
+    def __get_failure_reason(exception, deadline):
+        if (deadline is not None) and (deadline.expired is True):
+            return "request is cancelled, total timeout '%s' seconds is exceeded" % deadline.timeout
+
+        return str(exception)
+
+
+    @staticmethod
+    def __raise_failure(exception, deadline):
+        if (deadline is not None) and (deadline.expired is True):
+            raise TimeoutError(Client.__get_failure_reason(exception, deadline)) from exception
+
+        raise exception
+
+
+    def __create_decompressor(self, server_response):
+        if self.__accept_encodings is None:
+            return None
+
+        encodings = parse_content_encoding(server_response.getheader('Content-Encoding'))
+        if len(encodings) == 0:
+            return None
+
+        if not all(is_supported(encoding) for encoding in encodings):
+            logger.info("Body is not decoded (reason: 'content encoding '%s' is not supported')." % ", ".join(encodings))
+            return None
+
+        return StreamDecompressor(encodings)
+
+
+    def __read_chunks(self, server_response, decompressor):
+        encoded_size, decoded_size = 0, 0
+        while True:
+            obtained_chunk = server_response.read(Client.__BODY_CHUNK_SIZE)
+            if not obtained_chunk:
+                break
+
+            if decompressor is not None:
+                encoded_size += len(obtained_chunk)
+                obtained_chunk = decompressor.decompress(obtained_chunk)
+
+            decoded_size += len(obtained_chunk)
+            yield obtained_chunk
+
+        if decompressor is not None:
+            obtained_chunk = decompressor.flush()
+            decoded_size += len(obtained_chunk)
+            yield obtained_chunk
+
+            logger.info("Body is decoded (encoded size: '%d', decoded size: '%d')." % (encoded_size, decoded_size))
+
+
+    def __create_digest(self):
+        if self.__digest_algorithm is None:
+            return None
+
+        return hashlib.new(self.__digest_algorithm)
+
+
+    def __read_body(self, server_response):
+        """
+        Returns body and its digest (if it is enabled by \`Enable Response Body Digest\`).
+
+        """
+        decompressor = self.__create_decompressor(server_response)
+        digest = self.__create_digest()
+        if (decompressor is None) and (digest is None):
+            return server_response.read(), None
+
+        chunks = []
+        for obtained_chunk in self.__read_chunks(server_response, decompressor):
+            if digest is not None:
+                digest.update(obtained_chunk)
+
+            if (digest is None) or (self.__keep_digested_body is True):
+                chunks.append(obtained_chunk)
+
+        if digest is None:
+            return b"".join(chunks), None
+
+        logger.info("Body digest is calculated (algorithm: '%s', digest: '%s')." % (digest.name, digest.hexdigest()))
+
+        body = b"".join(chunks) if self.__keep_digested_body is True else None
+        return body, digest.hexdigest()
+
+
+    def __read_body_to_file(self, server_response, filename):
+        logger.info("Write body to file '%s'." % filename)
+
+        decompressor = self.__create_decompressor(server_response)
+        digest = self.__create_digest()
+        with open(filename, "wb") as file_stream:
+            for obtained_chunk in self.__read_chunks(server_response, decompressor):
+                if digest is not None:
+                    digest.update(obtained_chunk)
+
+                file_stream.write(obtained_chunk)
+
+        if digest is None:
+            return None
+
+        return digest.hexdigest()
+
+
+    def __receive_response(self, connection, read_body_to_file):
+        server_response = connection.getresponse()
+
+        if read_body_to_file is None:
+            response_body_file = None
+            response_body, response_body_digest = self.__read_body(server_response)
+
+        else:
+            response_body_file = read_body_to_file
+            response_body = None
+
+            response_body_digest = self.__read_body_to_file(server_response, read_body_to_file)
+
+        return Response(server_response.status, server_response.reason, response_body, response_body_file,
+                        HttpHeaders(server_response.headers), response_body_digest)
+
+
+    def __acquire_connection(self, connection_type):
+        if self.__connection_pool is None:
+            return None
+
+        return self.__connection_pool.acquire(self.__get_pool_key(connection_type))
+
+
+    def __release_connection(self, connection_type, connection, is_completed):
+        if (self.__connection_pool is None) or (is_completed is False):
+            connection.close()
+            return
+
+        # connection is closed by http.client if the server does not keep it alive
+        self.__connection_pool.release(self.__get_pool_key(connection_type), connection)
+
+
+    def __exchange(self, connection_type, method, url, body, headers, timeouts, read_body_to_file, register=None):
+        idle_connection = self.__acquire_connection(connection_type)
+        if idle_connection is not None:
+            try:
+                return self.__exchange_by(idle_connection, connection_type, method, url, body, headers, timeouts,
+                                          read_body_to_file, register)
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as exception:
+                # the server has closed idle connection, it has not processed the request
+                logger.info("Idle connection is closed by the server, request is sent by a new connection "
+                            "(reason: '%s')." % str(exception))
+
+        return self.__exchange_by(None, connection_type, method, url, body, headers, timeouts, read_body_to_file,
+                                  register)
+
+
+    def __exchange_by(self, connection, connection_type, method, url, body, headers, timeouts, read_body_to_file,
+                      register):
+        connection, deadline = self.__send(connection_type, method, url, body, headers, timeouts, strict=True,
+                                           connection=connection)
+
+        is_completed = False
+        try:
+            if register is not None:
+                register(connection)
+
+            response = self.__receive_response(connection, read_body_to_file)
+            is_completed = True
+            return response
+
+        except Exception as exception:
+            Client.__raise_failure(exception, deadline)
+
+        finally:
+            DeadlineWatchdog().release(deadline)
+            self.__release_connection(connection_type, connection, is_completed)
+
+
+    def __exchange_hedged(self, connection_type, method, url, body, headers, timeouts):
+        guard = threading.Lock()
+        connections = {}
+        cancelled = set()
+
+        def exchange(index):
+            def register(connection):
+                with guard:
+                    connections[index] = connection
+                    if index in cancelled:
+                        abort_connection(connection)
+
+            return self.__exchange(connection_type, method, url, body, headers, timeouts, None, register)
+
+        def cancel(index):
+            with guard:
+                cancelled.add(index)
+                if index in connections:
+                    abort_connection(connections[index])
+
+        return self.__hedging_policy.execute(exchange, cancel)
+
+
+    def __execute(self, connection_type, method, url, body, headers, timeouts, read_body_to_file):
+        policy = self.__retry_policy or RetryPolicy()
+        hedged = (self.__hedging_policy is not None) and (read_body_to_file is None) and \
+            self.__hedging_policy.is_applicable(method)
+
+        for attempt in range(1, policy.get_attempts() + 1):
+            is_last_attempt = (attempt == policy.get_attempts())
+
+            try:
+                if hedged is True:
+                    response = self.__exchange_hedged(connection_type, method, url, body, headers, timeouts)
+                else:
+                    response = self.__exchange(connection_type, method, url, body, headers, timeouts,
+                                               read_body_to_file)
+
+            except AssertionError:
+                raise   # misuse of the client, for example, it is not initialized
+
+            except Exception as exception:
+                if is_last_attempt or not policy.is_retriable_error(exception):
+                    logger.info("Server has not provided response to the request (reason: %s)." % str(exception))
+                    return None
+
+                delay = policy.get_delay(attempt)
+                logger.info("Request is failed, it is retried (attempt: '%d', delay: '%.3f', reason: '%s')." %
+                            (attempt, delay, str(exception)))
+
+            else:
+                if is_last_attempt or not policy.is_retriable_status(response.get_status()):
+                    return response
+
+                delay = policy.get_delay(attempt, response.get_headers().get('Retry-After'))
+                logger.info("Response status is '%d', request is retried (attempt: '%d', delay: '%.3f')." %
+                            (response.get_status(), attempt, delay))
+
+            time.sleep(delay)
+
+
+    def __wait_response_async(self, connection, deadline, read_body_to_file):
+        try:
+            with Profiler().section():
+                response_instance = self.__receive_response(connection, read_body_to_file)
+
+            with self.__event_queue:
+                self.__async_queue[connection] = response_instance
+                self.__event_queue.notify_all()
+
+        except Exception as exception:
+            logger.info("Server has not provided response to the request (reason: %s)." %
+                        Client.__get_failure_reason(exception, deadline))
+
+        finally:
+            DeadlineWatchdog().release(deadline)
+            connection.close()
+
+
+    def __pop_request_headers(self):
+        headers = self.__request_headers
+        self.__request_headers = HttpHeaders()
+
+        if self.__accept_encodings is not None:
+            if 'Accept-Encoding' not in headers:
+                headers['Accept-Encoding'] = ", ".join(self.__accept_encodings)
+
+        return headers
+
+
+    def __pop_request_timeouts(self):
+        timeouts = self.__timeouts.merge(self.__request_timeouts)
+        self.__request_timeouts = None
+        return timeouts
+
+
+    def __send_request(self, connection_type, method, url, body, read_body_to_file):
+        with Profiler().section():
+            response = self.__execute(connection_type, method, url, body, self.__pop_request_headers(),
+                                      self.__pop_request_timeouts(), read_body_to_file)
+
+        if response is None:
+            return
+
+        with self.__response_guard:
+            self.__response_status = response.get_status()
+            self.__response_message = response.get_headers()
+            self.__response_headers = response.get_headers()
+            self.__response_body_filename = response.get_body_file()
+            self.__response_body = response.get_body() if response.get_body_file() is None else None
+            self.__response_body_digest = response.get_body_digest()
+
+
+    def __sent_request_async(self, connection_type, method, url, body, read_body_to_file):
+        with Profiler().section():
+            connection, deadline = self.__send(connection_type, method, url, body, self.__pop_request_headers(),
+                                               self.__pop_request_timeouts())
+
+        wait_thread = threading.Thread(target=self.__wait_response_async,
+                                       args=(connection, deadline, read_body_to_file))
+        wait_thread.daemon = True
+        wait_thread.start()
+
+        return connection
+
+
+    def send_http_request(self, method, url, body=None, resp_body_to_file=None):
+        """
+
+        Send HTTP request with specified parameters. This function is blocked until server replies or
+        timeout connection.
+
+        `method` [in] (string): Method that is used to send request (GET, POST, PUT, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        `body` [in] (string): Body of the request.
+
+        `resp_body_to_file` [in] (string): Path to file where response body should be written. By default is `None` - response 
+        body is writing in RAM. It is useful to write response body into a file when it is expected to be big enough to keep
+        it in the memory.
+
+        Example where GET request is sent to server:
+
+        +-------------------+-----+-----+
+        | Send HTTP Request | GET | /ip |
+        +-------------------+-----+-----+
+
+        .. code:: text
+
+            Send HTTP Request   GET   /ip
+
+        Example where POST request is sent with specific body:
+
+        +-------------------+------+-------+-------------------------------+
+        | Send HTTP Request | POST | /post | { "message": "Hello World!" } |
+        +-------------------+------+-------+-------------------------------+
+
+        .. code:: text
+
+            ${body}=   Set Variable   { "message": "Hello World!" }
+            Send HTTP Request   POST   /post   ${body}
+        
+        Example where GET request is sent and where response body is written into a file:
+
+        +-------------------+-----+--------------------+-----------------------------------+
+        | Send HTTP Request | GET | /download_big_file | resp_body_to_file=big_archive.tar |
+        +-------------------+-----+--------------------+-----------------------------------+
+
+        .. code:: text
+
+            Send HTTP Request   GET   /download_big_file   resp_body_to_file=big_archive.tar
+
+        """
+        self.__send_request('http', method, url, body, resp_body_to_file)
+
+
+    def send_http_request_async(self, method, url, body=None, resp_body_to_file=None):
+        """
+
+        Send HTTP request with specified parameters asynchronously. Non-blocking function to send request that waits
+        for reply using separate thread. Return connection object that is used as a key to get asynchronous response
+        using function 'Get Async Response'.
+
+        `method` [in] (string): Method that is used to send request (GET, POST, PUT, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        `body` [in] (string): Body of the request.
+
+        `resp_body_to_file` [in] (string): Path to file where response body should be written. By default is `None` - response 
+        body is writing in RAM. It is useful to write response body into a file when it is expected to be big enough to keep
+        it in the memory.
+
+        Example where PUT request is sent with specific body:
+
+        +----------------+-------------------------+-----+------+---------------+
+        | ${connection}= | Send HTTP Request Async | PUT | /put | Hello Server! |
+        +----------------+-------------------------+-----+------+---------------+
+
+        .. code:: text
+
+            ${connection}=   Send HTTP Request Async   PUT   /put   Hello Server!
+
+        Example where GET request is sent and where response body is written into a file:
+
+        +----------------+-------------------------+-----+--------------------+-----------------------------------+
+        | ${connection}= | Send HTTP Request Async | GET | /download_big_file | resp_body_to_file=big_archive.tar |
+        +----------------+-------------------------+-----+--------------------+-----------------------------------+
+
+        .. code:: text
+
+            ${connection}=   Send HTTP Request Async   GET   /download_big_file   resp_body_to_file=big_archive.tar
+
+        """
+        return self.__sent_request_async('http', method, url, body, resp_body_to_file)
+
+
+    def send_https_request(self, method, url, body=None, resp_body_to_file=None):
+        """
+
+        Send HTTPS request with specified parameters.
+
+        `method` [in] (string): Method that is used to send request (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        `body` [in] (string): Body of the request.
+
+        `resp_body_to_file` [in] (string): Path to file where response body should be written. By default is `None` - response 
+        body is writing in RAM. It is useful to write response body into a file when it is expected to be big enough to keep
+        it in the memory.
+
+        Example where PATCH request to update parameters:
+
+        +--------------------+-------+--------+---------------------------------+
+        | Send HTTPS Request | PATCH | /patch | { "volume": 77, "mute": false } |
+        +--------------------+-------+--------+---------------------------------+
+
+        .. code:: text
+
+            ${body}=   Set Variable   { "volume": 77, "mute": false }
+            Send HTTPS Request   PATCH   /patch   ${body}
+
+        """
+        self.__send_request('https', method, url, body, resp_body_to_file)
+
+
+    def send_https_request_async(self, method, url, body=None, resp_body_to_file=None):
+        """
+
+        Send HTTPS request with specified parameters asynchronously. Non-blocking function to send request that waits
+        for reply using separate thread. Return connection object that is used as a key to get asynchronous response
+        using function 'Get Async Response'.
+
+        `method` [in] (string): Method that is used to send request (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        `body` [in] (string): Body of the request.
+
+        `resp_body_to_file` [in] (string): Path to file where response body should be written. By default is `None` - response 
+        body is writing in RAM. It is useful to write response body into a file when it is expected to be big enough to keep
+        it in the memory.
+
+        Example where DELETE request is sent with specific body:
+
+        +----------------+--------------------------+--------+---------+
+        | ${connection}= | Send HTTPS Request Async | DELETE | /delete |
+        +----------------+--------------------------+--------+---------+
+
+        .. code:: text
+
+            ${connection}=   Send HTTPS Request Async   DELETE   /delete
+
+        """
+        return self.__sent_request_async('https', method, url, body, resp_body_to_file)
+
+
+    def __send_replayed_request(self, connection_type, method, url, headers, body):
+        with Profiler().section():
+            return self.__exchange(connection_type, method, url, body, HttpHeaderLines(headers), self.__timeouts,
+                                   None)
+
+
+    def __replay_traffic(self, connection_type, filename, speed, connections):
+        def send_function(method, url, headers, body):
+            return self.__send_replayed_request(connection_type, method, url, headers, body)
+
+        from HttpCtrl.traffic_replayer import TrafficReplayer
+
+        try:
+            replayer = TrafficReplayer(send_function, float(speed), int(connections))
+            report = replayer.replay(filename)
+        except Exception as exception:
+            raise AssertionError("Impossible to replay traffic (reason: '%s')." % str(exception))
+
+        logger.info("Traffic is replayed (requests: '%d', mismatches: '%d', errors: '%d', p50: '%s', p95: '%s', "
+                    "max: '%s')." % (report['total'], len(report['mismatches']), len(report['errors']),
+                                     report['p50'], report['p95'], report['max']))
+
+        return report
+
+
+    def replay_http_traffic(self, filename, speed=1.0, connections=1):
+        """
+
+        Replay requests that have been recorded by \`Start Traffic Recording\` (see HttpCtrl.Server_) to the server
+        that is specified by \`Initialize Client\` using HTTP. This function is blocked until all requests are replied.
+        Returns report as a dictionary:
+
+        - `total` - amount of replayed requests;
+
+        - `latencies` - latencies (in seconds) of replied requests in order of the traffic log;
+
+        - `p50`, `p95`, `p99`, `max` - percentiles and maximum of latencies (in seconds);
+
+        - `mismatches` - list of requests where status differs from the recorded one, each item is a dictionary with
+          keys `index`, `method`, `url`, `expected` and `actual`;
+
+        - `errors` - list of requests that were not replied, each item is a dictionary with keys `index`, `method`,
+          `url` and `reason`.
+
+        `filename` [in] (string): Path to the traffic log.
+
+        `speed` [in] (float|string): Replay speed relatively to the original inter-arrival timing, for example, `2` -
+        twice faster than original. Requests are sent as fast as possible if speed is `0` (by default is `1`).
+
+        `connections` [in] (int|string): Amount of parallel connections that are used to replay requests (by default
+        is `1`).
+
+        Example how to replay traffic with the original timing:
+
+        +-------------+---------------------+----------------+
+        | ${report}=  | Replay HTTP Traffic | traffic.ndjson |
+        +-------------+---------------------+----------------+
+
+        Example how to replay traffic as fast as possible using 8 connections and check that statuses are the same:
+
+        .. code:: text
+
+            ${report}=   Replay HTTP Traffic   traffic.ndjson   speed=0   connections=8
+            Should Be Empty   ${report}[mismatches]
+            Should Be Empty   ${report}[errors]
+
+        """
+        return self.__replay_traffic('http', filename, speed, connections)
+
+
+    def replay_https_traffic(self, filename, speed=1.0, connections=1):
+        """
+
+        Replay requests that have been recorded by \`Start Traffic Recording\` (see HttpCtrl.Server_) to the server
+        that is specified by \`Initialize Client\` using HTTPS. The function has the same arguments and returns the
+        same report as \`Replay HTTP Traffic\`.
+
+        `filename` [in] (string): Path to the traffic log.
+
+        `speed` [in] (float|string): Replay speed relatively to the original inter-arrival timing, requests are sent
+        as fast as possible if speed is `0` (by default is `1`).
+
+        `connections` [in] (int|string): Amount of parallel connections that are used to replay requests (by default
+        is `1`).
+
+        Example how to replay traffic twice faster than original:
+
+        +-------------+----------------------+----------------+---+
+        | ${report}=  | Replay HTTPS Traffic | traffic.ndjson | 2 |
+        +-------------+----------------------+----------------+---+
+
+        .. code:: text
+
+            ${report}=   Replay HTTPS Traffic   traffic.ndjson   2
+
+        """
+        return self.__replay_traffic('https', filename, speed, connections)
+
+
+    def __warm_up_connections(self, connection_type, connections):
+        try:
+            connections = int(connections)
+            if connections < 1:
+                raise ValueError("amount of connections should be at least 1, but '%d' is provided" % connections)
+
+            if self.__connection_pool is None:
+                self.__connection_pool = ConnectionPool()
+
+            connect_timeout = self.__timeouts.get_connect_timeout()
+            opened = self.__connection_pool.warm_up(self.__get_pool_key(connection_type),
+                                                    lambda: self.__create_connection(connection_type, connect_timeout),
+                                                    connections)
+        except AssertionError:
+            raise
+        except Exception as exception:
+            raise AssertionError("Impossible to warm up connections (reason: '%s')." % str(exception))
+
+        logger.info("Connections are warmed up (type: '%s', endpoint: '%s', opened: '%d', requested: '%d')." %
+                    (connection_type, self.__get_endpoint(), opened, connections))
+
+        return opened
+
+
+    def warm_up_http_connections(self, connections=1):
+        """
+
+        Open connections to the server that is specified by \`Initialize Client\` in parallel ahead of time and
+        enable reuse of persistent connections by \`Send HTTP Request\` and \`Replay HTTP Traffic\`, so timed
+        requests do not pay for connection establishment. Connection is returned to the pool after the response if
+        the server keeps it alive (HTTP/1.1 keep-alive), a connection that has been closed by the server while it was
+        idle is replaced by a new one transparently. Async requests always use new connections. Returns amount of
+        opened connections. Be aware that HttpCtrl.Server_ handles connections one by one and closes them after the
+        response, therefore idle connections to it delay other clients.
+
+        `connections` [in] (int): Amount of connections that are opened, by default `1`. Optional argument.
+
+        Example how to start measurement from a pool of 8 connections:
+
+        +--------------------------+---+
+        | Warm Up HTTP Connections | 8 |
+        +--------------------------+---+
+
+        .. code:: text
+
+            Initialize Client          api.example.com   80
+            Warm Up HTTP Connections   8
+            ${report}=   Replay HTTP Traffic   traffic.ndjson   connections=8
+
+        """
+        return self.__warm_up_connections('http', connections)
+
+
+    def warm_up_https_connections(self, connections=1):
+        """
+
+        Open connections to the server that is specified by \`Initialize Client\` in parallel ahead of time
+        (including TLS handshakes) and enable reuse of persistent connections by \`Send HTTPS Request\` and
+        \`Replay HTTPS Traffic\`. See \`Warm Up HTTP Connections\` for details. Returns amount of opened
+        connections.
+
+        `connections` [in] (int): Amount of connections that are opened, by default `1`. Optional argument.
+
+        .. code:: text
+
+            Warm Up HTTPS Connections   8
+
+        """
+        return self.__warm_up_connections('https', connections)
+
+
+    def close_client_connections(self):
+        """
+
+        Close idle connections that have been opened by \`Warm Up HTTP Connections\` or \`Warm Up HTTPS
+        Connections\` and disable reuse of connections, each next request is sent by a new connection.
+
+        +--------------------------+
+        | Close Client Connections |
+        +--------------------------+
+
+        .. code:: text
+
+            Close Client Connections
+
+        """
+        if self.__connection_pool is not None:
+            self.__connection_pool.close()
+            self.__connection_pool = None
+
+
+    def set_request_header(self, key, value):
+        """
+
+        Set HTTP header for request that is going to be sent. Should be called before 'Send HTTP Request' or
+        'Send HTTPS Request'.
+
+        `key` [in] (string): Header name that should be used in the request (be aware of case-sensitive headers).
+
+        `value` [in] (string): Value that corresponds to specified header.
+
+        Example where several specific headers 'Content-Type' and 'Some Header' are set to request:
+
+        +--------------------+------------------+-------------------+
+        | Set Request Header | Important-Header | important-value   |
+        +--------------------+------------------+-------------------+
+        | Set Request Header | Some-Header      | some-value-for-it |
+        +--------------------+------------------+-------------------+
+
+        .. code:: text
+
+            Set Request Header   Important-Header   important-value
+            Set Request Header   Some-Header        some-value-for-it
+
+        """
+        self.__request_headers[key] = value
+
+
+    def enable_response_decompression(self, encodings=None):
+        """
+
+        Enables decompression of response bodies. Requests are sent with header `Accept-Encoding` (unless it is set
+        by \`Set Request Header\`) and bodies that are encoded by the server (header `Content-Encoding`) are
+        decoded on the fly while they are received to memory or written to a file, therefore the whole compressed
+        body is never kept in memory. Encodings `gzip` and `deflate` are always supported, `br` and `zstd` are
+        supported if packages `brotli` and `zstandard` are installed (see `pip install robotframework-httpctrl[compression]`).
+        Response headers are not changed, so `Content-Encoding` and `Content-Length` describe the encoded body.
+
+        `encodings` [in] (string): Comma-separated encodings that are accepted by the client, by default all supported encodings. Optional argument.
+
+        Example how to receive gzip-compressed body:
+
+        +-------------------------------+------+
+        | Enable Response Decompression | gzip |
+        +-------------------------------+------+
+
+        .. code:: text
+
+            Enable Response Decompression   gzip
+            Send HTTP Request               GET   /api/v1/large
+            ${body}=   Get Response Body
+
+        """
+        if encodings is None:
+            encodings = get_supported_encodings()
+        else:
+            encodings = [encoding.strip().lower() for encoding in encodings.split(',') if encoding.strip()]
+
+        for encoding in encodings:
+            if not is_supported(encoding):
+                raise AssertionError("Impossible to enable response decompression (reason: 'encoding '%s' is not "
+                                     "supported')." % encoding)
+
+        self.__accept_encodings = encodings
+        logger.info("Response decompression is enabled (encodings: '%s')." % ", ".join(encodings))
+
+
+    def disable_response_decompression(self):
+        """
+
+        Disables decompression of response bodies that has been enabled by \`Enable Response Decompression\`.
+        Header `Accept-Encoding` is not sent anymore and bodies are stored as they are received.
+
+        +--------------------------------+
+        | Disable Response Decompression |
+        +--------------------------------+
+
+        .. code:: text
+
+            Disable Response Decompression
+
+        """
+        self.__accept_encodings = None
+
+
+    def enable_response_body_digest(self, algorithm='sha256', keep_body=True):
+        """
+
+        Enables calculation of response body digest while the body is received (after decompression if it is
+        enabled by \`Enable Response Decompression\`). The digest is obtained by \`Get Response Body Digest\` or
+        by \`Get Body Digest From Response\`. If body is not kept then it is dropped chunk by chunk while it is
+        received, so multi-gigabyte bodies (for example, see \`Set Stub Synthetic Reply\` in HttpCtrl.Server_)
+        are checked with trivial memory.
+
+        `algorithm` [in] (string): Hash algorithm (any algorithm that is supported by 'hashlib'), by default 'sha256'. Optional argument.
+
+        `keep_body` [in] (bool): Keep the body to get it by \`Get Response Body\`, by default `${True}`. Optional argument.
+
+        Example how to check digest of a big body:
+
+        +-----------------------------+--------+--------------------+
+        | Enable Response Body Digest | sha256 | keep_body=${False} |
+        +-----------------------------+--------+--------------------+
+
+        .. code:: text
+
+            Enable Response Body Digest   sha256   keep_body=${False}
+            Send HTTP Request   GET   /api/v1/archive
+            ${digest}=   Get Response Body Digest
+
+        """
+        try:
+            algorithm = hashlib.new(algorithm).name
+        except (ValueError, TypeError) as exception:
+            raise AssertionError("Impossible to enable response body digest (reason: '%s')." % str(exception))
+
+        self.__digest_algorithm = algorithm
+        self.__keep_digested_body = keep_body
+        logger.info("Response body digest is enabled (algorithm: '%s', keep body: '%s')." % (algorithm, keep_body))
+
+
+    def disable_response_body_digest(self):
+        """
+
+        Disables calculation of response body digest that has been enabled by \`Enable Response Body Digest\`.
+
+        +------------------------------+
+        | Disable Response Body Digest |
+        +------------------------------+
+
+        .. code:: text
+
+            Disable Response Body Digest
+
+        """
+        self.__digest_algorithm = None
+        self.__keep_digested_body = True
+
+
+    @staticmethod
+    def __create_timeouts(connect, read, total):
+        try:
+            return ClientTimeouts(connect, read, total)
+        except (ValueError, TypeError) as exception:
+            raise AssertionError("Impossible to set timeout (reason: '%s')." % str(exception))
+
+
+    def set_client_timeout(self, connect=None, read=None, total=None):
+        """
+
+        Set timeouts in seconds for all next requests of the client (including \`Replay HTTP Traffic\`). By default
+        requests are not limited in time. If a timeout is exceeded then request is cancelled: the connection is
+        closed and the request is handled as a request without response (for example, \`Get Response Status\`
+        returns `${None}`, \`Get Async Response\` returns `${None}`), so a silent server does not block a test.
+
+        `connect` [in] (float): Timeout to establish connection (including TLS handshake). Optional argument.
+
+        `read` [in] (float): Timeout to wait for each portion of response data (status line, headers, body chunks), it is not a limit of the whole response. Optional argument.
+
+        `total` [in] (float): Deadline of the whole request since it is started: connection, sending, waiting and receiving of the response. Optional argument.
+
+        Example how to limit each request by 5 seconds and connection by 1 second:
+
+        +--------------------+-----------+---------+
+        | Set Client Timeout | connect=1 | total=5 |
+        +--------------------+-----------+---------+
+
+        .. code:: text
+
+            Set Client Timeout   connect=1   total=5
+            Send HTTP Request    GET   /api/v1/slow
+            ${status}=   Get Response Status
+
+        """
+        self.__timeouts = Client.__create_timeouts(connect, read, total)
+        logger.info("Client timeouts are set (%s)." % self.__timeouts)
+
+
+    def set_request_timeout(self, connect=None, read=None, total=None):
+        """
+
+        Set timeouts in seconds for the next request only, they override timeouts that are set by
+        \`Set Client Timeout\`. Should be called before 'Send HTTP Request' or 'Send HTTPS Request' (or their async
+        versions).
+
+        `connect` [in] (float): Timeout to establish connection (including TLS handshake). Optional argument.
+
+        `read` [in] (float): Timeout to wait for each portion of response data. Optional argument.
+
+        `total` [in] (float): Deadline of the whole request. Optional argument.
+
+        Example how to send request that should be replied in 2 seconds:
+
+        +---------------------+---------+
+        | Set Request Timeout | total=2 |
+        +---------------------+---------+
+
+        .. code:: text
+
+            Set Request Timeout       total=2
+            ${connection}=   Send HTTP Request Async   GET   /api/v1/slow
+            ${response}=     Get Async Response        ${connection}   3
+
+        """
+        self.__request_timeouts = Client.__create_timeouts(connect, read, total)
+
+
+    def set_client_retry_policy(self, attempts, statuses=None, errors=None, backoff=0.1, max_delay=30.0, jitter=True,
+                                retry_after=True):
+        """
+
+        Set retry policy for \`Send HTTP Request\` and \`Send HTTPS Request\`: request is sent again if response
+        status or error is retriable, so tests do not need retry loops. Delay before the next attempt is growing
+        exponentially (`backoff`, `2 * backoff`, `4 * backoff`, ...), it is limited by `max_delay` and randomized by
+        jitter. If response contains header `Retry-After` then the delay is taken from it (it is limited by `max_delay`
+        as well). Response of the last attempt is returned as it is. Timeouts (see \`Set Client Timeout\`) are
+        applied to each attempt. Async requests are sent once.
+
+        `attempts` [in] (int): Maximum amount of attempts including the first one, `1` disables retries.
+
+        `statuses` [in] (string): Comma-separated retriable status codes or ranges, by default '429, 502, 503, 504'. Optional argument.
+
+        `errors` [in] (string): Comma-separated names of retriable exceptions (base classes are taken into account), by default 'ConnectionError, TimeoutError, timeout'. Optional argument.
+
+        `backoff` [in] (float): Delay in seconds before the second attempt, by default `0.1`. Optional argument.
+
+        `max_delay` [in] (float): Maximum delay in seconds between attempts, by default `30`. Optional argument.
+
+        `jitter` [in] (bool): Randomize delays (full jitter), by default `${True}`. Optional argument.
+
+        `retry_after` [in] (bool): Take delay from header `Retry-After`, by default `${True}`. Optional argument.
+
+        Example how to send request up to 5 times while server is not available or replies by `503`:
+
+        +-------------------------+---+----------+-------------+
+        | Set Client Retry Policy | 5 | 503      | backoff=0.5 |
+        +-------------------------+---+----------+-------------+
+
+        .. code:: text
+
+            Set Client Retry Policy   5   503   backoff=0.5
+            Send HTTP Request         GET   /api/v1/status
+            ${status}=   Get Response Status
+
+        """
+        try:
+            arguments = {'attempts': int(attempts), 'backoff': float(backoff), 'max_delay': float(max_delay),
+                         'jitter': jitter, 'retry_after': retry_after}
+
+            if statuses is not None:
+                arguments['statuses'] = RetryPolicy.parse_statuses(statuses)
+
+            if errors is not None:
+                arguments['errors'] = [error.strip() for error in str(errors).split(',') if error.strip()]
+
+            policy = RetryPolicy(**arguments)
+        except (ValueError, TypeError) as exception:
+            raise AssertionError("Impossible to set client retry policy (reason: '%s')." % str(exception))
+
+        self.__retry_policy = policy if policy.get_attempts() > 1 else None
+        logger.info("Client retry policy is set (%s)." % policy)
+
+
+    def enable_request_hedging(self, delay, copies=1, methods=None):
+        """
+
+        Enables hedged requests for \`Send HTTP Request\` and \`Send HTTPS Request\`: if response is not received
+        in `delay` seconds then a copy of the request is sent by another connection, up to `copies` copies. The
+        first received response is used and other requests are cancelled, so a slow server replica does not
+        define latency of the test. A failed request is replaced by the next copy without delay. Requests that write
+        response body to a file are not hedged.
+
+        `delay` [in] (float): Time in seconds to wait for response before the next copy is sent.
+
+        `copies` [in] (int): Maximum amount of additional copies of the request, by default `1`. Optional argument.
+
+        `methods` [in] (string): Comma-separated methods that are hedged, by default 'GET, HEAD, OPTIONS' (methods that are safe to repeat). Optional argument.
+
+        Example how to send one more request if server does not reply in 200 milliseconds:
+
+        +------------------------+-----+
+        | Enable Request Hedging | 0.2 |
+        +------------------------+-----+
+
+        .. code:: text
+
+            Enable Request Hedging   0.2
+            Send HTTP Request        GET   /api/v1/get
+
+        """
+        try:
+            arguments = {'delay': float(delay), 'copies': int(copies)}
+            if methods is not None:
+                arguments['methods'] = [method.strip() for method in str(methods).split(',') if method.strip()]
+
+            self.__hedging_policy = HedgingPolicy(**arguments)
+        except (ValueError, TypeError) as exception:
+            raise AssertionError("Impossible to enable request hedging (reason: '%s')." % str(exception))
+
+        logger.info("Request hedging is enabled (%s)." % self.__hedging_policy)
+
+
+    def disable_request_hedging(self):
+        """
+
+        Disables hedged requests that have been enabled by \`Enable Request Hedging\`.
+
+        +-------------------------+
+        | Disable Request Hedging |
+        +-------------------------+
+
+        .. code:: text
+
+            Disable Request Hedging
+
+        """
+        self.__hedging_policy = None
+
+
+    def __set_tls_configuration(self, **kwargs):
+        configuration = vars(self.__tls_configuration).copy()
+        configuration.update(kwargs)
+
+        try:
+            configuration = TlsConfiguration(**configuration)
+            TlsContextCache().get_context(configuration)
+        except Exception as exception:
+            raise AssertionError("Impossible to configure TLS for the client (reason: '%s')." % str(exception))
+
+        self.__tls_configuration = configuration
+
+
+    def set_client_ca_bundle(self, ca_bundle):
+        """
+
+        Set file with CA certificates (PEM format) that are used to verify server certificate by \`Send HTTPS
+        Request\` and \`Send HTTPS Request Async\`. By default system CA certificates are used.
+
+        SSL context is created once for each TLS configuration and shared by all tests, TLS session is resumed by the
+        next connection to the same server, therefore repeated HTTPS requests do not perform full TLS handshake.
+
+        `ca_bundle` [in] (string): Path to the file with CA certificates, `${None}` to use system CA certificates.
+
+        Example how to trust to a server that uses certificate signed by a local CA:
+
+        +----------------------+------------+
+        | Set Client CA Bundle | ca.pem     |
+        +----------------------+------------+
+
+        .. code:: text
+
+            Set Client CA Bundle   ${CURDIR}/ca.pem
+            Send HTTPS Request     GET   /api/v1/get
+
+        """
+        self.__set_tls_configuration(ca_bundle=ca_bundle)
+
+
+    def set_client_certificate(self, certificate, key=None, password=None):
+        """
+
+        Set client certificate that is sent to the server if it requires client authentication (mutual TLS).
+
+        `certificate` [in] (string): Path to the file with client certificate in PEM format (the file may contain private key as well), `${None}` to remove client certificate.
+
+        `key` [in] (string): Path to the file with private key. Optional argument.
+
+        `password` [in] (string): Password to decrypt the private key. Optional argument.
+
+        Example how to use client certificate:
+
+        +------------------------+------------+------------+
+        | Set Client Certificate | client.pem | client.key |
+        +------------------------+------------+------------+
+
+        .. code:: text
+
+            Set Client Certificate   ${CURDIR}/client.pem   ${CURDIR}/client.key
+
+        """
+        self.__set_tls_configuration(certificate=certificate, key=key, password=password)
+
+
+    def set_client_verification_mode(self, mode):
+        """
+
+        Set how server certificate is verified by the client.
+
+        `mode` [in] (string): Verification mode: 'required' - certificate and host name are verified (default mode), 'no-hostname' - certificate is verified, but host name is not, 'none' - certificate is not verified.
+
+        Example how to send request to a server with self-signed certificate without verification:
+
+        +------------------------------+------+
+        | Set Client Verification Mode | none |
+        +------------------------------+------+
+
+        .. code:: text
+
+            Set Client Verification Mode   none
+            Send HTTPS Request             GET   /api/v1/get
+
+        """
+        self.__set_tls_configuration(verification=mode)
+
+
+    def get_response_status(self):
+        """
+
+        Return response code as an integer value. This method should be called once after 'Send HTTP Request' or
+        'Send HTTPS Request'. It returns None, in case of attempt to get response code more then once or if
+        'Send HTTP Request' or 'Send HTTPS Request' is not called before.
+
+        Example how to get response code:
+
+        +---------------------+---------------------+
+        | ${response status}= | Get Response Status |
+        +---------------------+---------------------+
+
+        .. code:: text
+
+            ${response status}=   Get Response Status
+
+        """
+        with self.__response_guard:
+            status = self.__response_status
+            self.__response_status = None
+            return status
+
+
+    def get_response_message(self):
+        with self.__response_guard:
+            message = self.__response_message
+            self.__response_message = None
+            return message
+
+
+    def get_response_headers(self):
+        """
+
+        Return response headers as a dictionary. This method should be called once after 'Send HTTP Request' or
+        'Send HTTPS Request'. Header names are case-insensitive, the first value is returned for repeated headers
+        (all values are returned by method `get_all`, for example, `${response headers.get_all('Set-Cookie')}`). It returns None, in case of attempt to get response code more then once or if
+        'Send HTTP Request' or 'Send HTTPS Request' is not called before.
+
+        Example how to get response code:
+
+        +----------------------+----------------------+
+        | ${response headers}= | Get Response Headers |
+        +----------------------+----------------------+
+
+        .. code:: text
+
+            ${response headers}=   Get Response Headers
+
+        """
+        with self.__response_guard:
+            headers = self.__response_headers
+            self.__response_headers = None
+            return headers
+
+
+    def get_response_body(self):
+        """
+
+        Return response body as a byte array. This method should be called once after 'Send HTTP Request' or
+        'Send HTTPS Request'. It returns None, in case of attempt to get response code more then once or if
+        'Send HTTP Request' or 'Send HTTPS Request' is not called before.
+
+        Example how to get response code:
+
+        +-------------------+-------------------+
+        | ${response body}= | Get Response Body |
+        +-------------------+-------------------+
+
+        .. code:: text
+
+            ${response body}=   Get Response Body
+
+        """
+        with self.__response_guard:
+            body = None
+
+            if self.__response_body is not None:
+                body = self.__response_body
+
+            elif self.__response_body_filename is not None:
+                with open(self.__response_body_filename) as file_stream:
+                    body = file_stream.read()
+
+            self.__response_body_filename = None
+            self.__response_body = None
+
+            return body
+
+
+    def get_response_body_digest(self):
+        """
+
+        Return hex digest of response body that is calculated if it is enabled by \`Enable Response Body Digest\`.
+        This method should be called once after 'Send HTTP Request' or 'Send HTTPS Request'. It returns None, in
+        case of attempt to get the digest more then once or if the digest is not enabled.
+
+        +---------------------+--------------------------+
+        | ${response digest}= | Get Response Body Digest |
+        +---------------------+--------------------------+
+
+        .. code:: text
+
+            ${response digest}=   Get Response Body Digest
+
+        """
+        with self.__response_guard:
+            digest = self.__response_body_digest
+            self.__response_body_digest = None
+            return digest
+
+
+    def get_async_response(self, connection, timeout=0):
+        """
+
+        Return response as an object for the specified connection. This method should be called once after
+        'Send HTTP Request Async' or 'Send HTTPS Request Async'. It returns None if there is no response for the
+        specified connection.
+
+        `connection` [in] (object): Connection for that response should be obtained.
+
+        `timeout` [in] (int): Period of time in seconds to obtain response (by default is 0).
+
+        Example how to get response object:
+
+        +--------------+--------------------+
+        | ${response}= | Get Async Response |
+        +--------------+--------------------+
+
+        Example how to try to get response object during 10 seconds:
+
+        +--------------+--------------------+----+
+        | ${response}= | Get Async Response | 10 |
+        +--------------+--------------------+----+
+
+        .. code:: text
+
+            ${connection}=   Send HTTP Async Request   POST            /post   Hello Server!
+            ${response}=     Get Async Response        ${connection}   5
+
+        """
+        with self.__event_queue:
+            start_time = datetime.datetime.now()
+            end_time = start_time
+
+            while (end_time - start_time).total_seconds() < int(timeout):
+                if connection in self.__async_queue:
+                    return self.__async_queue.pop(connection)
+
+                def predicate():
+                    return connection in self.__async_queue
+
+                self.__event_queue.wait_for(predicate, int(timeout))
+                end_time = datetime.datetime.now()
+
+            return self.__async_queue.pop(connection, None)
+
+
+    def get_status_from_response(self, response : Response):
+        """
+
+        Return response status as an integer value from the specified response object that was obtained by function
+        'Get Async Response'. Return 'None' if response object is None.
+
+        Example how to get response status from a response object:
+
+        +---------------------+--------------------------+-------------+
+        | ${response status}= | Get Status From Response | ${response} |
+        +---------------------+--------------------------+-------------+
+
+        .. code:: text
+
+            ${connection}=      Send HTTP Async Request   GET             /get
+
+            # Some other actions ...
+
+            ${response}=          Get Async Response         ${connection}   5
+            ${response status}=   Get Status From Response   ${response}
+
+        """
+        if response is None:
+            logger.error("Impossible to get status from 'None' response object.")
+            return None
+
+        return response.get_status()
+
+
+    def get_reason_from_response(self, response : Response):
+        """
+
+        Return response reason as a string from the specified response object that was obtained by function
+        'Get Async Response'. For example, response code and reason are '200 OK', in this case 'OK' is going
+        to be returned by this function.
+
+        Example how to get response reason from a response object:
+
+        +---------------------+--------------------------+-------------+
+        | ${response reason}= | Get Reason From Response | ${response} |
+        +---------------------+--------------------------+-------------+
+
+        .. code:: text
+
+            ${connection}=      Send HTTP Async Request   GET             /get
+
+            # Some other actions ...
+
+            ${response}=          Get Async Response         ${connection}   5
+            ${response reason}=   Get Reason From Response   ${response}
+
+        """
+        if response is None:
+            logger.error("Impossible to get reason from 'None' response object.")
+            return None
+
+        return response.get_reason()
+
+
+    def get_headers_from_response(self, response : Response) -> HttpHeaders:
+        """
+
+        Return response headers as a dictionary from the specified response object that was obtained by function
+        'Get Async Response'. Return 'None' if response object is None. Header names are case-insensitive (see
+        \`Get Response Headers\`).
+
+        Example how to get response headers from a response object:
+
+        +----------------------+---------------------------+-------------+
+        | ${response headers}= | Get Headers From Response | ${response} |
+        +----------------------+---------------------------+-------------+
+
+        .. code:: text
+
+            ${connection}=      Send HTTP Async Request   GET             /get
+
+            # Some other actions ...
+
+            ${response}=           Get Async Response          ${connection}   5
+            ${response headers}=   Get Headers From Response   ${response}
+
+        """
+        if response is None:
+            logger.error("Impossible to get headers from 'None' response object.")
+            return None
+
+        return response.get_headers()
+
+
+    def get_body_from_response(self, response : Response):
+        """
+
+        Return response body as a byte array from the specified response object that was obtained by function
+        'Get Async Response'. Return 'None' if response object is None.
+
+        Example how to get response code from a response object:
+
+        +-------------------+------------------------+-------------+
+        | ${response body}= | Get Body From Response | ${response} |
+        +-------------------+------------------------+-------------+
+
+        .. code:: text
+
+            ${connection}=      Send HTTP Async Request   GET             /get
+
+            # Some other actions ...
+
+            ${response}=        Get Async Response        ${connection}   5
+            ${response body}=   Get Body From Response    ${response}
+
+        """
+        if response is None:
+            logger.error("Impossible to get body from 'None' response object.")
+            return None
+
+        return response.get_body()
+
+
+    def get_body_digest_from_response(self, response : Response):
+        """
+
+        Return hex digest of response body from the specified response object that was obtained by function
+        'Get Async Response'. Return 'None' if response object is None or the digest is not enabled by
+        \`Enable Response Body Digest\`.
+
+        +---------------------+-------------------------------+-------------+
+        | ${response digest}= | Get Body Digest From Response | ${response} |
+        +---------------------+-------------------------------+-------------+
+
+        .. code:: text
+
+            ${response}=          Get Async Response              ${connection}   5
+            ${response digest}=   Get Body Digest From Response   ${response}
+
+        """
+        if response is None:
+            logger.error("Impossible to get body digest from 'None' response object.")
+            return None
+
+        return response.get_body_digest()
@@ -0,0 +1,231 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import importlib
+import zlib
+
+
+ENCODING_GZIP = 'gzip'
+ENCODING_DEFLATE = 'deflate'
+ENCODING_BROTLI = 'br'
+ENCODING_ZSTD = 'zstd'
+ENCODING_IDENTITY = 'identity'
+
+# result of encoding selection when neither available encodings nor identity are acceptable by client
+NOT_ACCEPTABLE = object()
+
+# brotli and zstd are supported only if the corresponding optional packages are installed
+_OPTIONAL_MODULES = {
+    ENCODING_BROTLI: 'brotli',
+    ENCODING_ZSTD: 'zstandard',
+}
+
+# legacy names that are equivalent to registered encodings (RFC 9110, section 8.4.1.3)
+_ENCODING_ALIASES = {
+    'x-gzip': ENCODING_GZIP,
+}
+
+_loaded_modules = {}
+
+
+def _get_optional_module(encoding):
+    if encoding not in _loaded_modules:
+        try:
+            _loaded_modules[encoding] = importlib.import_module(_OPTIONAL_MODULES[encoding])
+        except ImportError:
+            _loaded_modules[encoding] = None
+
+    return _loaded_modules[encoding]
+
+
+def get_supported_encodings():
+    encodings = [ENCODING_GZIP, ENCODING_DEFLATE]
+    for encoding in _OPTIONAL_MODULES:
+        if _get_optional_module(encoding) is not None:
+            encodings.append(encoding)
+
+    return encodings
+
+
+def is_supported(encoding):
+    if encoding in (ENCODING_GZIP, ENCODING_DEFLATE):
+        return True
+
+    if encoding in _OPTIONAL_MODULES:
+        return _get_optional_module(encoding) is not None
+
+    return False
+
+
+def compress(data, encoding):
+    if encoding == ENCODING_GZIP:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+
+    if encoding == ENCODING_DEFLATE:
+        return zlib.compress(data, 9)
+
+    if encoding == ENCODING_BROTLI:
+        return _get_optional_module(encoding).compress(data)
+
+    if encoding == ENCODING_ZSTD:
+        return _get_optional_module(encoding).ZstdCompressor().compress(data)
+
+    raise ValueError("Unsupported content encoding '%s'." % encoding)
+
+
+def _normalize_encoding(encoding):
+    encoding = encoding.strip().lower()
+    return _ENCODING_ALIASES.get(encoding, encoding)
+
+
+def parse_content_encoding(value):
+    """
+    Returns list of encodings from 'Content-Encoding' header in order of their application, legacy names are
+    replaced by registered ones (for example, 'x-gzip' by 'gzip').
+
+    """
+    if value is None:
+        return []
+
+    encodings = [_normalize_encoding(encoding) for encoding in value.split(',')]
+    return [encoding for encoding in encodings if encoding and encoding != ENCODING_IDENTITY]
+
+
+def select_encoding(accept_encoding, available):
+    """
+    Returns the most preferred encoding by client from the available encodings in line with 'Accept-Encoding'
+    header (RFC 9110, section 12.5.3) or None if the body should be sent without encoding. The order of available
+    encodings is used when client's preferences are equal. Returns NOT_ACCEPTABLE if none of the available
+    encodings is accepted and identity is excluded by 'identity;q=0' or by '*;q=0'.
+
+    """
+    if not accept_encoding:
+        return None
+
+    preferences = {}
+    for item in accept_encoding.split(','):
+        parts = item.split(';')
+        encoding = _normalize_encoding(parts[0])
+        if not encoding:
+            continue
+
+        quality = 1.0
+        for parameter in parts[1:]:
+            name, _, value = parameter.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        preferences[encoding] = quality
+
+    default_quality = preferences.get('*', 0.0)
+
+    best_encoding, best_quality = None, 0.0
+    for encoding in available:
+        quality = preferences.get(encoding, default_quality)
+        if quality > best_quality:
+            best_encoding, best_quality = encoding, quality
+
+    if best_encoding is None:
+        # identity is acceptable unless it is excluded explicitly or by '*' without its own entry
+        if preferences.get(ENCODING_IDENTITY, preferences.get('*', 1.0)) <= 0.0:
+            return NOT_ACCEPTABLE
+
+    return best_encoding
+
+
+class _DeflateDecompressor:
+    """
+    'deflate' content coding is zlib format (RFC 1950), but some servers send raw deflate stream (RFC 1951), both
+    variants are detected by the first chunk.
+
+    """
+    def __init__(self):
+        self.__decompressor = None
+
+
+    def decompress(self, data):
+        if self.__decompressor is None:
+            self.__decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+            try:
+                return self.__decompressor.decompress(data)
+            except zlib.error:
+                self.__decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+        return self.__decompressor.decompress(data)
+
+
+    def flush(self):
+        if self.__decompressor is None:
+            return b''
+
+        return self.__decompressor.flush()
+
+
+class _BrotliDecompressor:
+    def __init__(self, brotli):
+        self.__decompressor = brotli.Decompressor()
+
+
+    def decompress(self, data):
+        return self.__decompressor.process(data)
+
+
+    def flush(self):
+        return b''
+
+
+class StreamDecompressor:
+    """
+    Decodes body chunk by chunk in line with the list of encodings from 'Content-Encoding' header, so the whole
+    encoded body is never kept in memory.
+
+    """
+    def __init__(self, encodings):
+        # encodings are applied in the listed order, therefore they are removed in the reverse one
+        self.__decompressors = [StreamDecompressor.__create(encoding) for encoding in reversed(encodings)]
+
+
+    def decompress(self, data):
+        for decompressor in self.__decompressors:
+            data = decompressor.decompress(data)
+
+        return data
+
+
+    def flush(self):
+        data = b''
+        for decompressor in self.__decompressors:
+            if data:
+                data = decompressor.decompress(data)
+            data += decompressor.flush()
+
+        return data
+
+
+    @staticmethod
+    def __create(encoding):
+        if encoding == ENCODING_GZIP:
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        if encoding == ENCODING_DEFLATE:
+            return _DeflateDecompressor()
+
+        module = _get_optional_module(encoding) if encoding in _OPTIONAL_MODULES else None
+        if module is None:
+            raise ValueError("Unsupported content encoding '%s'." % encoding)
+
+        if encoding == ENCODING_BROTLI:
+            return _BrotliDecompressor(module)
+
+        return module.ZstdDecompressor().decompressobj()
@@ -0,0 +1,141 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import collections
+import select
+import threading
+
+
+class ConnectionPool:
+    """
+    Idle persistent connections of the client that are reused by the next requests to the same endpoint. Connections
+    are taken in the order they have been opened (FIFO), so a server that handles connections one by one receives
+    requests in the order it has accepted connections. A connection that has been closed by the server while it
+    was idle is dropped when it is taken from the pool.
+
+    """
+    DEFAULT_MAX_IDLE = 64
+
+
+    def __init__(self, max_idle=DEFAULT_MAX_IDLE):
+        self.__lock = threading.Lock()
+        self.__idle = {}
+        self.__max_idle = max_idle
+
+
+    def acquire(self, key):
+        """
+        Returns idle connection to the endpoint or None if there is no alive connection.
+
+        """
+        while True:
+            with self.__lock:
+                connections = self.__idle.get(key)
+                if not connections:
+                    return None
+
+                connection = connections.popleft()
+
+            if not ConnectionPool.is_stale(connection):
+                return connection
+
+            connection.close()
+
+
+    def release(self, key, connection):
+        """
+        Returns connection to the pool if the server keeps it open, otherwise the connection is closed.
+
+        """
+        if connection.sock is None:
+            connection.close()
+            return
+
+        with self.__lock:
+            connections = self.__idle.setdefault(key, collections.deque())
+            if len(connections) < self.__max_idle:
+                connections.append(connection)
+                return
+
+        connection.close()
+
+
+    def warm_up(self, key, factory, amount):
+        """
+        Opens connections by `factory` in parallel (including TLS handshake) and puts them to the pool. Returns
+        amount of opened connections, the first error is raised if all attempts are failed.
+
+        """
+        # the executor is needed only to pre-warm connections, it is not loaded with the client library
+        from concurrent.futures import ThreadPoolExecutor
+
+        def open_connection(_):
+            connection = factory()
+            try:
+                connection.connect()
+            except Exception:
+                connection.close()
+                raise
+
+            return connection
+
+        with self.__lock:
+            self.__max_idle = max(self.__max_idle, len(self.__idle.get(key, ())) + amount)
+
+        errors = []
+        opened = 0
+        with ThreadPoolExecutor(max_workers=min(amount, ConnectionPool.DEFAULT_MAX_IDLE)) as executor:
+            futures = [executor.submit(open_connection, index) for index in range(amount)]
+
+            for future in futures:
+                try:
+                    self.release(key, future.result())
+                    opened += 1
+                except Exception as exception:
+                    errors.append(exception)
+
+        if (opened == 0) and errors:
+            raise errors[0]
+
+        return opened
+
+
+    def get_size(self, key=None):
+        with self.__lock:
+            if key is not None:
+                return len(self.__idle.get(key, ()))
+
+            return sum(len(connections) for connections in self.__idle.values())
+
+
+    def close(self):
+        with self.__lock:
+            idle, self.__idle = self.__idle, {}
+
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+    @staticmethod
+    def is_stale(connection):
+        """
+        Idle connection should not have incoming data, readable socket means that the server has closed it.
+
+        """
+        if connection.sock is None:
+            return True
+
+        try:
+            readable, _, _ = select.select([connection.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+
+        return len(readable) > 0
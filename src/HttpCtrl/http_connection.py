@@ -0,0 +1,318 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import heapq
+import http.client
+import itertools
+import socket
+import ssl
+import threading
+import time
+
+from HttpCtrl.utils.singleton import Singleton
+
+
+class TlsConfiguration:
+    VERIFY_REQUIRED = 'required'
+    VERIFY_NO_HOSTNAME = 'no-hostname'
+    VERIFY_NONE = 'none'
+
+    VERIFICATION_MODES = (VERIFY_REQUIRED, VERIFY_NO_HOSTNAME, VERIFY_NONE)
+
+
+    def __init__(self, ca_bundle=None, certificate=None, key=None, password=None, verification=VERIFY_REQUIRED):
+        if verification not in TlsConfiguration.VERIFICATION_MODES:
+            raise ValueError("Unknown verification mode '%s' (supported: '%s')." %
+                             (verification, "', '".join(TlsConfiguration.VERIFICATION_MODES)))
+
+        self.ca_bundle = ca_bundle
+        self.certificate = certificate
+        self.key = key
+        self.password = password
+        self.verification = verification
+
+
+    def get_key(self):
+        return self.ca_bundle, self.certificate, self.key, self.password, self.verification
+
+
+class TlsContextCache(metaclass=Singleton):
+    """
+    Process-wide cache of client SSL contexts and TLS sessions. Context creation loads CA certificates, therefore
+    contexts are created once per configuration and shared by all clients (client library instance is created for
+    each test). TLS sessions are kept per context and endpoint to resume them by the next connections.
+
+    """
+    __MAX_SESSIONS = 1024
+
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__contexts = {}
+        self.__sessions = {}
+
+
+    def get_context(self, configuration):
+        key = configuration.get_key()
+
+        with self.__lock:
+            context = self.__contexts.get(key)
+            if context is None:
+                context = TlsContextCache.__create_context(configuration)
+                self.__contexts[key] = context
+
+            return context
+
+
+    def get_session(self, context, host, port):
+        with self.__lock:
+            return self.__sessions.get((id(context), host, port))
+
+
+    def put_session(self, context, host, port, session):
+        with self.__lock:
+            key = (id(context), host, port)
+            self.__sessions.pop(key, None)
+
+            if len(self.__sessions) >= TlsContextCache.__MAX_SESSIONS:
+                self.__sessions.pop(next(iter(self.__sessions)))
+
+            self.__sessions[key] = session
+
+
+    def clear(self):
+        with self.__lock:
+            self.__contexts.clear()
+            self.__sessions.clear()
+
+
+    @staticmethod
+    def __create_context(configuration):
+        context = ssl.create_default_context(cafile=configuration.ca_bundle)
+
+        if configuration.verification != TlsConfiguration.VERIFY_REQUIRED:
+            context.check_hostname = False
+
+        if configuration.verification == TlsConfiguration.VERIFY_NONE:
+            context.verify_mode = ssl.CERT_NONE
+
+        if configuration.certificate is not None:
+            context.load_cert_chain(configuration.certificate, configuration.key, configuration.password)
+
+        return context
+
+
+class ResumableHTTPSConnection(http.client.HTTPSConnection):
+    """
+    HTTPS connection that resumes TLS session of the previous connection to the same endpoint. TLS 1.3 delivers
+    session tickets after the handshake, therefore the session is stored when the connection is closed.
+
+    """
+    def __init__(self, *args, context, **kwargs):
+        http.client.HTTPSConnection.__init__(self, *args, context=context, **kwargs)
+        self.__context = context
+
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+
+        server_hostname = self._tunnel_host or self.host
+        session = TlsContextCache().get_session(self.__context, self.host, self.port)
+
+        self.sock = self.__context.wrap_socket(self.sock, server_hostname=server_hostname, session=session)
+
+
+    def is_session_reused(self):
+        return isinstance(self.sock, ssl.SSLSocket) and self.sock.session_reused
+
+
+    def close(self):
+        if isinstance(self.sock, ssl.SSLSocket):
+            try:
+                session = self.sock.session
+                if session is not None:
+                    TlsContextCache().put_session(self.__context, self.host, self.port, session)
+            except (OSError, ValueError):
+                pass
+
+        http.client.HTTPSConnection.close(self)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over Unix domain socket, requests are sent with host 'localhost'.
+
+    """
+    def __init__(self, path, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+        http.client.HTTPConnection.__init__(self, 'localhost', timeout=timeout)
+        self.__path = path
+
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            if self.timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+                sock.settimeout(self.timeout)
+
+            sock.connect(self.__path)
+        except OSError:
+            sock.close()
+            raise
+
+        self.sock = sock
+
+
+def abort_connection(connection):
+    """
+    Shuts down socket of the connection that might be used by another thread, so the thread is released.
+
+    """
+    sock = connection.sock
+    if sock is not None:
+        try:
+            # plain socket shutdown, SSL object of TLS socket might be used by the thread that is released
+            socket.socket.shutdown(sock, socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class ClientTimeouts:
+    """
+    Timeouts of client requests in seconds: `connect` - to establish connection (including TLS handshake), `read` -
+    to wait for each portion of response data, `total` - deadline of the whole request. None means no timeout.
+
+    """
+    def __init__(self, connect=None, read=None, total=None):
+        self.connect = ClientTimeouts.__to_seconds('connect', connect)
+        self.read = ClientTimeouts.__to_seconds('read', read)
+        self.total = ClientTimeouts.__to_seconds('total', total)
+
+
+    def __str__(self):
+        return "connect: '%s', read: '%s', total: '%s'" % (self.connect, self.read, self.total)
+
+
+    def merge(self, other):
+        """
+        Returns timeouts where values of other timeouts (if they are defined) override the current ones.
+
+        """
+        if other is None:
+            return self
+
+        return ClientTimeouts(other.connect if other.connect is not None else self.connect,
+                              other.read if other.read is not None else self.read,
+                              other.total if other.total is not None else self.total)
+
+
+    def get_connect_timeout(self):
+        if self.total is None:
+            return self.connect
+
+        if self.connect is None:
+            return self.total
+
+        return min(self.connect, self.total)
+
+
+    @staticmethod
+    def __to_seconds(name, value):
+        if (value is None) or (isinstance(value, str) and value.strip().lower() in ('', 'none')):
+            return None
+
+        seconds = float(value)
+        if seconds <= 0:
+            raise ValueError("%s timeout should be positive, but '%s' is provided" % (name, value))
+
+        return seconds
+
+
+class RequestDeadline:
+    def __init__(self, connection, timeout):
+        self.connection = connection
+        self.timeout = timeout
+        self.expiration = time.monotonic() + timeout
+        self.expired = False
+        self.released = False
+
+
+    def expire(self):
+        """
+        Cancels the request: socket is shut down, so threads that are blocked by the connection are released.
+
+        """
+        self.expired = True
+        abort_connection(self.connection)
+
+
+class DeadlineWatchdog(metaclass=Singleton):
+    """
+    Cancels client requests when their deadlines are exceeded. One thread serves all requests of the process, so
+    deadlines do not require a thread per request.
+
+    """
+    def __init__(self):
+        self.__condition = threading.Condition()
+        self.__deadlines = []
+        self.__released = 0
+        self.__counter = itertools.count()
+        self.__thread = None
+
+
+    def watch(self, connection, timeout):
+        deadline = RequestDeadline(connection, timeout)
+
+        with self.__condition:
+            heapq.heappush(self.__deadlines, (deadline.expiration, next(self.__counter), deadline))
+
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name="HttpCtrl-DeadlineWatchdog", daemon=True)
+                self.__thread.start()
+
+            self.__condition.notify()
+
+        return deadline
+
+
+    def release(self, deadline):
+        if deadline is None:
+            return
+
+        with self.__condition:
+            if (deadline.released is True) or (deadline.expired is True):
+                return
+
+            deadline.released = True
+            self.__released += 1
+
+            # released deadlines are removed lazily, they are purged if they take most of the queue
+            if self.__released > len(self.__deadlines) // 2:
+                self.__deadlines = [entry for entry in self.__deadlines if entry[2].released is False]
+                heapq.heapify(self.__deadlines)
+                self.__released = 0
+
+
+    def __run(self):
+        with self.__condition:
+            while True:
+                current_time = time.monotonic()
+                while self.__deadlines and ((self.__deadlines[0][2].released is True) or
+                                            (self.__deadlines[0][0] <= current_time)):
+                    _, _, deadline = heapq.heappop(self.__deadlines)
+                    if deadline.released is True:
+                        self.__released -= 1
+                    else:
+                        deadline.expire()
+
+                timeout = None
+                if self.__deadlines:
+                    timeout = self.__deadlines[0][0] - current_time
+
+                self.__condition.wait(timeout)
@@ -11,17 +11,27 @@ Copyright: The 3-Clause BSD License
 from http.server import SimpleHTTPRequestHandler
 from robot.api import logger
 
+from HttpCtrl.body_spool import BodySpool
 from HttpCtrl.internal_messages import TerminationRequest, IgnoreRequest
 from HttpCtrl.request import Request
+from HttpCtrl.request_history import RequestHistory
 from HttpCtrl.request_storage import RequestStorage
 from HttpCtrl.response_storage import ResponseStorage
 from HttpCtrl.http_stub import HttpStubContainer, HttpStubCriteria
+from HttpCtrl.stream_body import StreamBody
+from HttpCtrl.traffic_recorder import TrafficRecorder
+from HttpCtrl.utils.address import UNIX_SOCKET_PREFIX
+from HttpCtrl.utils.profiler import Profiler
 
 
 class HttpHandler(SimpleHTTPRequestHandler):
+    __INLINE_REPLY_TIMEOUT = 0.05
+
+
     def __init__(self, *args, **kwargs):
         self.server_version = "HttpCtrl.Server/"
         self.sys_version = ""
+        self.__detached_reply = None
 
         SimpleHTTPRequestHandler.__init__(self, *args, **kwargs)
 
@@ -66,32 +76,124 @@ class HttpHandler(SimpleHTTPRequestHandler):
         return
 
 
+    def finish(self):
+        if self.__detached_reply is not None:
+            # reply is passed to a worker thread when the server thread does not use the connection anymore, the
+            # worker sends the reply and finishes the connection
+            self.server.detach_request(self.request, self.__detached_reply)
+            return
+
+        SimpleHTTPRequestHandler.finish(self)
+
+
     def __extract_body(self):
         body_length = int(self.headers.get('Content-Length', 0))
         if body_length > 0:
-            return self.rfile.read(body_length)
+            return BodySpool().receive(self.rfile, body_length)
 
         return None
 
 
-    def __default_handler(self, method):
-        host, port = self.client_address[:2]
-        body = self.__extract_body()
+    def __get_source_address(self):
+        if isinstance(self.client_address, tuple):
+            return self.client_address[:2]
 
-        logger.info("'%s' request is received from '%s:%s'." % (method, host, port))
+        # client of Unix domain socket is identified by its path (usually it is not bound to a path)
+        client_path = self.client_address.decode() if isinstance(self.client_address, bytes) else self.client_address
+        return UNIX_SOCKET_PREFIX + (client_path or ""), 0
 
-        stub = HttpStubContainer().get(HttpStubCriteria(method=method, url=self.path))
-        if stub is not None:
-            response = stub.response
 
-        else:
+    def __default_handler(self, method):
+        with Profiler().section():
+            host, port = self.__get_source_address()
+            body = self.__extract_body()
+
+            logger.info("'%s' request is received from '%s:%s'." % (method, host, port))
+
             request = Request(host, port, method, self.path, self.headers, body)
-            RequestStorage().push(request)
+            RequestHistory().push(request)
 
-            response = ResponseStorage().pop()
-            if isinstance(response, TerminationRequest) or isinstance(response, IgnoreRequest):
+            criteria = HttpStubCriteria(method=method, url=self.path)
+            response = HttpStubContainer().get(criteria, self.headers.get('Accept-Encoding'))
+            if response is None:
+                self.__wait_test_reply(request)
                 return
 
+            self.__reply(request, response)
+
+
+    def __wait_test_reply(self, request):
+        """
+        Passes the request to the test and waits for its reply. Reply that is provided quickly is sent by the server
+        thread, otherwise the request is detached: it waits for reply in a worker thread that closes the connection,
+        so the server continues to receive requests while the test is waiting for another one.
+
+        """
+        ResponseStorage().expect(request)
+        dropped = RequestStorage().push(request)
+        if dropped is not None:
+            # the oldest request is not received by the test, its connection is closed to release its reply worker
+            ResponseStorage().push(dropped, IgnoreRequest())
+
+        response = ResponseStorage().pop(request, HttpHandler.__INLINE_REPLY_TIMEOUT, keep=True)
+        if response is not None:
+            self.__complete(request, response)
+            return
+
+        self.close_connection = True
+        self.__detached_reply = lambda: self.__wait_detached_reply(request)
+
+
+    def __wait_detached_reply(self, request):
+        try:
+            response = ResponseStorage().pop(request, keep=True)
+            if response is None:
+                # request that is not received by the test in time is expired, it is not passed to the test anymore
+                RequestStorage().remove(request)
+                response = ResponseStorage().pop(request, 0)
+
+            self.__complete(request, response)
+        finally:
+            self.__finish_detached()
+
+
+    def __finish_detached(self):
+        try:
+            SimpleHTTPRequestHandler.finish(self)
+        except OSError:
+            pass    # client has closed the connection
+
+
+    def __complete(self, request, response):
+        if isinstance(response, TerminationRequest) or isinstance(response, IgnoreRequest):
+            TrafficRecorder().record(request, None)
+            return
+
+        self.__reply(request, response)
+
+
+    def __reply(self, request, response):
+        # record before sending to keep order of records and responses that are observed by clients
+        TrafficRecorder().record(request, response)
+
+        if (self.__detached_reply is None) and (response is not None) and isinstance(response.get_body(), StreamBody):
+            # streamed body might be endless or read slowly by the client, it is sent by a worker thread, so the
+            # server continues to receive requests
+            self.close_connection = True
+            self.__detached_reply = lambda: self.__send_detached_response(response)
+            return
+
+        self.__send_response_safely(response)
+
+
+    def __send_detached_response(self, response):
+        try:
+            self.__send_response_safely(response)
+        finally:
+            self.__finish_detached()
+
+
+    def __send_response_safely(self, response):
         try:
             self.__send_response(response)
         except Exception as exception:
@@ -103,21 +205,65 @@ class HttpHandler(SimpleHTTPRequestHandler):
             logger.error("Response is not provided for incoming request.")
             return
 
+        body = response.get_body()
+        if isinstance(body, StreamBody):
+            self.__send_stream_response(response)
+            return
+
         self.send_response(response.get_status())
+        self.__send_headers(response)
+
+        if body is not None:
+            self.send_header('Content-Length', str(response.get_body_length()))
+
+        self.end_headers()
+
+        # body is already encoded by the response, it is written without copying
+        if body is not None:
+            self.wfile.write(body)
 
+
+    def __send_headers(self, response):
         headers = response.get_headers()
         if headers is not None:
-            for key, value in headers.items():
+            for key, value in headers.raw_items():
                 self.send_header(key, value)
 
+
+    def __send_stream_response(self, response):
         body = response.get_body()
-        if body is not None:
-            if isinstance(response.get_body(), str):
-                body = response.get_body().encode("utf-8")
+        length = body.get_length()
 
-            self.send_header('Content-Length', str(len(body)))
+        # chunked transfer encoding requires HTTP/1.1 on both sides, HTTP/1.0 client reads the body until close
+        chunked = (length is None) and (self.request_version != 'HTTP/0.9') and (self.request_version >= 'HTTP/1.1')
+        if chunked is True:
+            self.protocol_version = 'HTTP/1.1'
 
+        self.send_response(response.get_status())
+        self.__send_headers(response)
+        if length is not None:
+            self.send_header('Content-Length', str(length))
+        elif chunked is True:
+            self.send_header('Transfer-Encoding', 'chunked')
+
+        self.send_header('Connection', 'close')
         self.end_headers()
 
-        if body is not None:
-            self.wfile.write(body)
+        if self.command == 'HEAD':
+            return
+
+        chunks = body.chunks()
+        try:
+            for chunk in chunks:
+                if chunked is True:
+                    self.wfile.write(b'%X\r\n%s\r\n' % (len(chunk), chunk))
+                else:
+                    self.wfile.write(chunk)
+
+                self.wfile.flush()
+
+            if chunked is True:
+                self.wfile.write(b'0\r\n\r\n')
+                self.wfile.flush()
+        finally:
+            chunks.close()
@@ -0,0 +1,236 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+from collections.abc import MutableMapping
+
+
+class HttpHeaders(MutableMapping):
+    """
+    Case-insensitive multi-value container of HTTP headers that is used by requests and responses of the client and
+    the server. Headers are stored compactly in a flat list of names and values in the order they are received,
+    repeated headers are kept. A raw header block is parsed only on the first access and the lookup index is built
+    only on the first lookup, so headers that are only passed through are never converted.
+
+    Mapping interface returns the first value of a header (as `http.client.HTTPMessage` does), all values are
+    returned by `get_all`.
+
+    """
+    __slots__ = ('__fields', '__raw', '__index')
+
+
+    def __init__(self, items=None, raw=None):
+        """
+        Creates headers from (name, value) pairs (or another mapping) or from a raw header block (bytes) where each
+        header is terminated by CRLF.
+
+        """
+        self.__fields = None
+        self.__raw = raw
+        self.__index = None
+
+        if raw is None:
+            self.__fields = []
+            if items is not None:
+                if hasattr(items, 'raw_items'):
+                    items = items.raw_items()
+                elif hasattr(items, 'items'):
+                    items = items.items()
+
+                for name, value in items:
+                    self.__fields.append(str(name))
+                    self.__fields.append(str(value))
+
+
+    def __getitem__(self, name):
+        positions = self.__get_index().get(name.lower())
+        if positions is None:
+            raise KeyError(name)
+
+        return self.__fields[positions[0] + 1]
+
+
+    def __setitem__(self, name, value):
+        """
+        Replaces all values of the header by the value, position of the first occurrence is kept.
+
+        """
+        fields = self.__get_fields()
+        positions = self.__get_index().get(name.lower())
+        if positions is None:
+            self.add(name, value)
+            return
+
+        fields[positions[0]] = str(name)
+        fields[positions[0] + 1] = str(value)
+        if len(positions) > 1:
+            self.__remove(positions[1:])
+
+
+    def __delitem__(self, name):
+        positions = self.__get_index().get(name.lower())
+        if positions is None:
+            raise KeyError(name)
+
+        self.__remove(positions)
+
+
+    def __contains__(self, name):
+        return isinstance(name, str) and (name.lower() in self.__get_index())
+
+
+    def __iter__(self):
+        fields = self.__get_fields()
+        index = self.__get_index()
+        for position in range(0, len(fields), 2):
+            if index[fields[position].lower()][0] == position:
+                yield fields[position]
+
+
+    def __len__(self):
+        return len(self.__get_index())
+
+
+    def __eq__(self, other):
+        if isinstance(other, HttpHeaders):
+            return self.raw_items() == other.raw_items()
+
+        return MutableMapping.__eq__(self, other)
+
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.raw_items())
+
+
+    def __str__(self):
+        return str(dict(self.items()))
+
+
+    def __copy__(self):
+        if self.__fields is None:
+            return HttpHeaders(raw=self.__raw)
+
+        headers = HttpHeaders()
+        headers.__fields = list(self.__fields)
+        return headers
+
+
+    def copy(self):
+        return self.__copy__()
+
+
+    def add(self, name, value):
+        """
+        Adds one more value of the header, existing values are kept.
+
+        """
+        fields = self.__get_fields()
+        fields.append(str(name))
+        fields.append(str(value))
+
+        if self.__index is not None:
+            self.__index.setdefault(name.lower(), []).append(len(fields) - 2)
+
+
+    def get_all(self, name, default=None):
+        positions = self.__get_index().get(name.lower())
+        if positions is None:
+            return default
+
+        return [self.__fields[position + 1] for position in positions]
+
+
+    def raw_items(self):
+        """
+        Returns all (name, value) pairs in the received order including repeated headers.
+
+        """
+        fields = self.__get_fields()
+        return [(fields[position], fields[position + 1]) for position in range(0, len(fields), 2)]
+
+
+    def to_bytes(self):
+        """
+        Returns raw header block where each header is terminated by CRLF.
+
+        """
+        if self.__fields is None:
+            return self.__raw
+
+        fields = self.__fields
+        return "".join("%s: %s\r\n" % (fields[position], fields[position + 1])
+                       for position in range(0, len(fields), 2)).encode('iso-8859-1')
+
+
+    def __get_fields(self):
+        if self.__fields is None:
+            self.__fields = HttpHeaders.__parse(self.__raw)
+            self.__raw = None
+
+        return self.__fields
+
+
+    def __get_index(self):
+        if self.__index is None:
+            fields = self.__get_fields()
+
+            index = {}
+            for position in range(0, len(fields), 2):
+                index.setdefault(fields[position].lower(), []).append(position)
+
+            self.__index = index
+
+        return self.__index
+
+
+    def __remove(self, positions):
+        fields = self.__get_fields()
+        for position in sorted(positions, reverse=True):
+            del fields[position:position + 2]
+
+        self.__index = None
+
+
+    @staticmethod
+    def __parse(raw):
+        fields = []
+        for line in raw.decode('iso-8859-1').split("\r\n"):
+            if len(line) == 0:
+                continue
+
+            if line[0] in " \t" and len(fields) > 0:    # continuation of folded header value
+                fields[-1] = "%s %s" % (fields[-1], line.strip())
+            else:
+                name, value = line.split(":", 1)
+                fields.append(name)
+                fields.append(value.strip())
+
+        return fields
+
+
+class HttpHeaderLines:
+    """
+    Headers in the form that is accepted by `http.client.HTTPConnection.request` where each (name, value) pair is
+    sent as a separate header line, so repeated headers are sent as they are (mapping interface of `HttpHeaders`
+    returns only the first value of a header).
+
+    """
+    __slots__ = ('__lines',)
+
+
+    def __init__(self, lines):
+        self.__lines = [(str(name), str(value)) for name, value in lines]
+
+
+    def __iter__(self):
+        return (name for name, _ in self.__lines)
+
+
+    def items(self):
+        return list(self.__lines)
@@ -8,32 +8,301 @@ Copyright: The 3-Clause BSD License
 
 """
 
+import collections
+import errno
 import ipaddress
+import os
+import selectors
 import socket
+import ssl
+import stat
 import threading
 
-from socketserver import TCPServer
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import TCPServer, ThreadingMixIn
 
 from robot.api import logger
 
 from HttpCtrl.http_handler import HttpHandler
-from HttpCtrl.internal_messages import TerminationRequest
 from HttpCtrl.response_storage import ResponseStorage
+from HttpCtrl.socket_options import ServerSocketOptions
+from HttpCtrl.utils.address import get_unix_socket_path
 
 
-class TCPServerIPv6(TCPServer):
+class WakeableServerMixIn:
+    """
+    Serving loop that waits for the listening socket and for a wake-up socket pair (self-pipe) instead of polling
+    shutdown flag each 0.5 seconds as it is done by \`socketserver.BaseServer.serve_forever\`, therefore server
+    is stopped immediately.
+
+    The listening socket is non-blocking: all pending connections are accepted per wake-up (epoll on Linux) and
+    they are handled one by one from the queue, the queue is refilled before each connection, so the kernel backlog
+    does not overflow while a request is handled. Connection of a request that is waiting for reply of the test is
+    detached from the loop, it is closed by the thread that sends the reply.
+
+    """
+    __MAX_PENDING_CONNECTIONS = 1024
+    __MAX_DETACHED_WORKERS = 256
+
+
+    def __init__(self, *args, socket_options=None, **kwargs):
+        self.__wakeup_reader, self.__wakeup_writer = socket.socketpair()
+        self.__wakeup_reader.setblocking(False)
+        self.__wakeup_writer.setblocking(False)
+
+        self.__shutdown_request = False
+        self.__is_shut_down = threading.Event()
+
+        self.__socket_options = socket_options or ServerSocketOptions()
+        self.__pending_connections = collections.deque()
+        self.__detached_connections = set()
+        self.__detached_lock = threading.Lock()
+        self.__detached_executor = None
+        self.request_queue_size = self.__socket_options.get_backlog()
+
+        super().__init__(*args, **kwargs)
+
+
+    def server_bind(self):
+        self.__socket_options.apply_to_listener(self.socket)
+        super().server_bind()
+
+
+    def server_activate(self):
+        super().server_activate()
+        self.socket.setblocking(False)
+
+
+    def get_request(self):
+        connection, client_address = super().get_request()
+
+        # connection might inherit non-blocking mode of the listener on some platforms (for example, BSD, Windows)
+        connection.setblocking(True)
+        self.__socket_options.apply_to_connection(connection)
+        return connection, client_address
+
+
+    def serve_forever(self, poll_interval=None):
+        self.__is_shut_down.clear()
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self, selectors.EVENT_READ)
+                selector.register(self.__wakeup_reader, selectors.EVENT_READ)
+
+                while not self.__shutdown_request:
+                    # pending connections are handled without waiting, new ones are accepted in between
+                    timeout = 0 if self.__pending_connections else None
+                    for key, _ in selector.select(timeout):
+                        if self.__shutdown_request:
+                            break
+
+                        if key.fileobj is self.__wakeup_reader:
+                            self.__drain_wakeup()
+                        else:
+                            self.__accept_pending_connections()
+
+                    if self.__pending_connections and not self.__shutdown_request:
+                        self.__handle_connection(*self.__pending_connections.popleft())
+
+                    self.service_actions()
+        finally:
+            self.__close_pending_connections()
+            self.__shutdown_request = False
+            self.__is_shut_down.set()
+
+
+    def shutdown(self):
+        self.__shutdown_request = True
+        self.wakeup()
+        self.__is_shut_down.wait()
+
+
+    def wakeup(self):
+        try:
+            self.__wakeup_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass  # the loop is already woken up
+
+
+    def server_close(self):
+        super().server_close()
+        self.__wakeup_reader.close()
+        self.__wakeup_writer.close()
+
+        with self.__detached_lock:
+            # workers that are sending streamed bodies are released by shutdown of their connections, workers that
+            # are waiting for replies are released by interruption of responses
+            for request in self.__detached_connections:
+                WakeableServerMixIn.__abort_connection(request)
+
+            if self.__detached_executor is not None:
+                self.__detached_executor.shutdown(wait=False)
+                self.__detached_executor = None
+
+
+    def detach_request(self, request, function):
+        """
+        Calls `function` by a worker thread that owns the connection: it is not closed when the handler returns,
+        it is closed when the function is finished. Idle workers are reused, so a thread is not created for each
+        request.
+
+        """
+        with self.__detached_lock:
+            self.__detached_connections.add(request)
+            if self.__detached_executor is None:
+                self.__detached_executor = ThreadPoolExecutor(max_workers=WakeableServerMixIn.__MAX_DETACHED_WORKERS,
+                                                              thread_name_prefix="HttpCtrl-Reply")
+
+            self.__detached_executor.submit(self.__run_detached, request, function)
+
+
+    def __run_detached(self, request, function):
+        try:
+            function()
+        finally:
+            with self.__detached_lock:
+                self.__detached_connections.discard(request)
+
+            self.shutdown_request(request)
+
+
+    def shutdown_request(self, request):
+        with self.__detached_lock:
+            if request in self.__detached_connections:
+                return
+
+        super().shutdown_request(request)
+
+
+    @staticmethod
+    def __abort_connection(request):
+        try:
+            # TLS layer is bypassed, it is not thread-safe to unwrap the connection that is used by the worker
+            socket.socket.shutdown(request, socket.SHUT_RDWR)
+        except OSError:
+            pass    # connection is already closed
+
+
+    def __accept_pending_connections(self):
+        while len(self.__pending_connections) < WakeableServerMixIn.__MAX_PENDING_CONNECTIONS:
+            try:
+                self.__pending_connections.append(self.get_request())
+            except (BlockingIOError, InterruptedError):
+                return      # all pending connections are accepted
+            except OSError:
+                return      # connection is reset before it is accepted
+
+
+    def __handle_connection(self, request, client_address):
+        if not self.verify_request(request, client_address):
+            self.shutdown_request(request)
+            return
+
+        try:
+            self.process_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+        except BaseException:
+            self.shutdown_request(request)
+            raise
+
+
+    def __close_pending_connections(self):
+        while self.__pending_connections:
+            request, _ = self.__pending_connections.popleft()
+            self.shutdown_request(request)
+
+
+    def __drain_wakeup(self):
+        try:
+            while self.__wakeup_reader.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+
+class WakeableTCPServer(WakeableServerMixIn, TCPServer):
+    pass
+
+
+class WakeableTCPServerIPv6(WakeableTCPServer):
     address_family = socket.AF_INET6
 
 
+if hasattr(socket, 'AF_UNIX'):
+    from socketserver import UnixStreamServer
+
+    class WakeableUnixServer(WakeableServerMixIn, UnixStreamServer):
+        pass
+else:
+    WakeableUnixServer = None
+
+
+class TLSServerMixIn(ThreadingMixIn):
+    """
+    TLS handshake of each accepted connection is performed by a separate thread, so slow or broken clients do not
+    stall the accept loop. Requests are handled one by one after the handshake as they are handled by HTTP server.
+
+    """
+    daemon_threads = True
+    handshake_timeout = 5.0
+
+
+    def wrap_socket(self, context):
+        self.socket = context.wrap_socket(self.socket, server_side=True, do_handshake_on_connect=False)
+        self.__handling_lock = threading.Lock()
+        self.__stopped = False
+
+
+    def stop_handling(self):
+        # connections that are waiting for the lock are closed, the current one is released by termination request
+        self.__stopped = True
+
+
+    def process_request_thread(self, request, client_address):
+        try:
+            request.settimeout(self.handshake_timeout)
+            request.do_handshake()
+            request.settimeout(None)
+        except (OSError, ssl.SSLError) as exception:
+            logger.info("TLS handshake with '%s' is failed (reason: '%s')." % (client_address[0], str(exception)))
+            self.shutdown_request(request)
+            return
+
+        with self.__handling_lock:
+            if self.__stopped is True:
+                self.shutdown_request(request)
+                return
+
+            ThreadingMixIn.process_request_thread(self, request, client_address)
+
+
+    def handle_error(self, request, client_address):
+        logger.info("Connection with '%s' is closed due to error." % client_address[0])
+
+
+class TLSServer(TLSServerMixIn, WakeableTCPServer):
+    pass
+
+
+class TLSServerIPv6(TLSServerMixIn, WakeableTCPServerIPv6):
+    pass
+
+
 class HttpServer:
-    def __init__(self, host, port):
+    def __init__(self, host, port, ssl_context=None, socket_options=None):
         self.__host = host
         self.__port = port
+        self.__ssl_context = ssl_context
+        self.__socket_options = socket_options
+        self.__unix_path = get_unix_socket_path(host)
 
         self.__handler = None
         self.__server = None
 
         self.__is_run_state = False
+        self.__start_error = None
         self.__cv_run = threading.Condition()
 
 
@@ -44,8 +313,15 @@ class HttpServer:
 
     def start(self):
         self.__handler = HttpHandler
-        self.__server = self.__create_tcp_server()
-        self.__server.allow_reuse_address = True
+
+        try:
+            self.__server = self.__create_tcp_server()
+        except Exception as exception:
+            # the error is delivered to the thread that is waiting for the server
+            with self.__cv_run:
+                self.__start_error = exception
+                self.__cv_run.notify()
+            return
 
         try:
             with self.__cv_run:
@@ -61,48 +337,139 @@ class HttpServer:
 
     def wait_run_state(self):
         with self.__cv_run:
-            while not self.__is_run_state:
+            while (not self.__is_run_state) and (self.__start_error is None):
                 self.__cv_run.wait()
 
+            if self.__start_error is not None:
+                raise self.__start_error
+
+
+    def get_port(self):
+        """
+        Returns port that is really used by the server, it differs from the requested one if port '0' is specified.
+        Server that listens to Unix domain socket does not have port, None is returned.
+
+        """
+        if self.__unix_path is not None:
+            return None
+
+        if self.__server is None:
+            return self.__port
+
+        return self.__server.server_address[1]
+
+
+    def get_socket_option(self, name):
+        if self.__server is None:
+            raise ValueError("server is not started")
+
+        return ServerSocketOptions.get_listener_option(self.__server.socket, name)
+
 
     def stop(self):
         if self.__server is not None:
-            ResponseStorage().push(TerminationRequest())
+            if self.__ssl_context is not None:
+                self.__server.stop_handling()
 
             self.__server.shutdown()
             self.__server.server_close()
             self.__server = None
 
+            # requests that are waiting for reply are released after the server stops receiving new ones
+            ResponseStorage().interrupt()
+
+            if self.__unix_path is not None:
+                HttpServer.__remove_unix_socket(self.__unix_path)
+
             with self.__cv_run:
                 self.__is_run_state = False
 
 
     def __create_tcp_server(self):
+        if self.__unix_path is not None:
+            return self.__create_unix_server()
+
         tcp_server = self.__create_ipv6_tcp_server()
-        if tcp_server is not None:
-            return tcp_server
+        if tcp_server is None:
+            tcp_server = self.__create_ipv4_tcp_server()
 
-        return self.__create_ipv4_tcp_server()
+        if self.__ssl_context is not None:
+            tcp_server.wrap_socket(self.__ssl_context)
+
+        return tcp_server
+
+
+    def __get_protocol(self):
+        return "HTTPS" if self.__ssl_context is not None else "HTTP"
 
 
     def __create_ipv6_tcp_server(self):
         try:
-            TCPServerIPv6.allow_reuse_address = True
-            ipaddress.IPv6Address(self.__host)  # if throws exception then address is not IPv6
+            ipaddress.IPv6Address(self.__host)
+        except ValueError:
+            return None  # address is not IPv6
 
-            tcp_server = TCPServerIPv6((self.__host, self.__port), self.__handler)
+        # bind errors are not hidden by the attempt to create IPv4 server
+        server_type = TLSServerIPv6 if self.__ssl_context is not None else WakeableTCPServerIPv6
+        server_type.allow_reuse_address = True
+        tcp_server = server_type((self.__host, self.__port), self.__handler, socket_options=self.__socket_options)
 
-            logger.info("IPv6 TCP server '%s:%s' is created for HTTP." % (self.__host, str(self.__port)))
+        logger.info("IPv6 TCP server '%s:%s' is created for %s." % (self.__host, str(tcp_server.server_address[1]), self.__get_protocol()))
 
-            return tcp_server
-        except:
-            return None
+        return tcp_server
 
 
     def __create_ipv4_tcp_server(self):
-        TCPServer.allow_reuse_address = True
-        tcp_server = TCPServer((self.__host, self.__port), self.__handler)
+        server_type = TLSServer if self.__ssl_context is not None else WakeableTCPServer
+        server_type.allow_reuse_address = True
+        tcp_server = server_type((self.__host, self.__port), self.__handler, socket_options=self.__socket_options)
 
-        logger.info("IPv4 TCP server '%s:%s' is created for HTTP." % (self.__host, str(self.__port)))
+        logger.info("IPv4 TCP server '%s:%s' is created for %s." % (self.__host, str(tcp_server.server_address[1]), self.__get_protocol()))
 
         return tcp_server
+
+
+    def __create_unix_server(self):
+        if WakeableUnixServer is None:
+            raise OSError(errno.EAFNOSUPPORT, "Unix domain sockets are not supported by the platform")
+
+        if self.__ssl_context is not None:
+            raise OSError(errno.EPROTONOSUPPORT, "Unix domain socket is supported by HTTP server only")
+
+        HttpServer.__remove_stale_unix_socket(self.__unix_path)
+        unix_server = WakeableUnixServer(self.__unix_path, self.__handler, socket_options=self.__socket_options)
+
+        logger.info("Unix domain socket server '%s' is created for %s." % (self.__unix_path, self.__get_protocol()))
+
+        return unix_server
+
+
+    @staticmethod
+    def __remove_stale_unix_socket(path):
+        """
+        Removes socket file that is left by a server that has not been stopped properly, socket of a running server
+        is not removed.
+
+        """
+        try:
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                return
+        except FileNotFoundError:
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                HttpServer.__remove_unix_socket(path)
+                return
+
+        raise OSError(errno.EADDRINUSE, "Address already in use")
+
+
+    @staticmethod
+    def __remove_unix_socket(path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -10,6 +10,10 @@ Copyright: The 3-Clause BSD License
 
 from threading import Lock
 
+from HttpCtrl.compression import NOT_ACCEPTABLE, compress, select_encoding
+from HttpCtrl.http_headers import HttpHeaders
+from HttpCtrl.response import Response
+from HttpCtrl.stream_body import StreamBody
 from HttpCtrl.utils.singleton import Singleton
 
 
@@ -28,11 +32,86 @@ class HttpStubCriteria:
         return (self.method == other.method) and (self.url == other.url)
 
 
+class HttpStubThrottling:
+    def __init__(self, limiter, status, body):
+        self.limiter = limiter
+        self.status = status
+        self.body = body
+
+
+class HttpStubCompression:
+    """
+    Encoded variants of stub responses. Bodies are compressed once for each response and encoding, therefore stub
+    only chooses the variant in line with 'Accept-Encoding' header of a request. Request that does not accept any
+    encoding including identity is replied by 406 (Not Acceptable).
+
+    """
+    def __init__(self, responses, encodings):
+        self.__encodings = list(encodings)
+        self.__variants = {}
+        self.__not_acceptable = Response(406, None, None, None, HttpHeaders([('Vary', 'Accept-Encoding')]))
+
+        for response in responses:
+            variants = {None: HttpStubCompression.__create_variant(response, None)}
+            for encoding in self.__encodings:
+                variants[encoding] = HttpStubCompression.__create_variant(response, encoding)
+
+            self.__variants[id(response)] = variants
+
+
+    def get(self, response, accept_encoding):
+        variants = self.__variants.get(id(response))
+        if variants is None:
+            return response
+
+        encoding = select_encoding(accept_encoding, self.__encodings)
+        if encoding is NOT_ACCEPTABLE:
+            return self.__not_acceptable
+
+        return variants[encoding]
+
+
+    @staticmethod
+    def __create_variant(response, encoding):
+        body = response.get_body()
+        headers = HttpHeaders(response.get_headers())
+        headers['Vary'] = 'Accept-Encoding'
+
+        # streamed body is produced while it is sent, therefore it is not compressed in advance
+        if (encoding is None) or (body is None) or isinstance(body, StreamBody) or (len(body) == 0):
+            return Response(response.get_status(), response.get_reason(), body, None, headers)
+
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        headers['Content-Encoding'] = encoding
+        return Response(response.get_status(), response.get_reason(), compress(body, encoding), None, headers)
+
+
 class HttpStub:
-    def __init__(self, criteria, response):
+    def __init__(self, criteria, selector):
         self.criteria = criteria
-        self.response = response
+        self.selector = selector
+        self.throttling = None
+        self.compression = None
         self.count = 0
+        self.rejected = 0
+
+
+    def reply(self, accept_encoding=None):
+        self.count += 1
+
+        if (self.throttling is None) or self.throttling.limiter.try_acquire():
+            response = self.selector.select()
+            if self.compression is not None:
+                response = self.compression.get(response, accept_encoding)
+
+            return response
+
+        self.rejected += 1
+
+        headers = HttpHeaders([('Retry-After', str(self.throttling.limiter.retry_after()))])
+        return Response(self.throttling.status, None, self.throttling.body, None, headers)
 
 
 class HttpStubContainer(metaclass=Singleton):
@@ -41,28 +120,61 @@ class HttpStubContainer(metaclass=Singleton):
         self.__lock = Lock()
 
 
-    def add(self, criteria, response):
+    def add(self, criteria, selector):
         with self.__lock:
-            self.__stubs.append(HttpStub(criteria, response))
+            self.__stubs.append(HttpStub(criteria, selector))
+
+
+    def set_throttling(self, criteria, throttling):
+        with self.__lock:
+            stub = self.__find(criteria)
+            if stub is None:
+                return False
+
+            stub.throttling = throttling
+            return True
+
+
+    def set_compression(self, criteria, encodings):
+        with self.__lock:
+            stub = self.__find(criteria)
+            if stub is None:
+                return False
+
+            stub.compression = HttpStubCompression(stub.selector.get_responses(), encodings)
+            return True
 
 
     def count(self, criteria):
         with self.__lock:
-            for stub in self.__stubs:
-                if self.__is_satisfy(stub, criteria) is True:
-                    return stub.count
-            
-            return 0
+            stub = self.__find(criteria)
+            if stub is None:
+                return 0
+
+            return stub.count
 
 
-    def get(self, criteria):
+    def rejected(self, criteria):
         with self.__lock:
-            for stub in self.__stubs:
-                if self.__is_satisfy(stub, criteria) is True:
-                    stub.count += 1
-                    return stub
-        
-            return None
+            stub = self.__find(criteria)
+            if stub is None:
+                return 0
+
+            return stub.rejected
+
+
+    def get(self, criteria, accept_encoding=None):
+        """
+        Returns response that should be sent by a stub that satisfies the criteria or None if there is no such stub.
+        Encoded response is returned if the stub is compressed and the encoding is accepted by the client.
+
+        """
+        with self.__lock:
+            stub = self.__find(criteria)
+            if stub is None:
+                return None
+
+            return stub.reply(accept_encoding)
 
 
     def clear(self):
@@ -70,6 +182,14 @@ class HttpStubContainer(metaclass=Singleton):
             self.__stubs.clear()
 
 
+    def __find(self, criteria):
+        for stub in self.__stubs:
+            if self.__is_satisfy(stub, criteria) is True:
+                return stub
+
+        return None
+
+
     def __is_satisfy(self, stub, criteria):
         if stub.criteria == criteria:
             return True
@@ -0,0 +1,193 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import json
+
+
+class Json:
+    """
+
+    Json library provide comprehensive interface to Robot Framework to work with JSON structures that are actively
+    used for Internet communication nowadays.
+
+    See other HttpCtrl libraries:
+
+    - HttpCtrl.Client_ - HTTP/HTTP Client API for testing where easy-controlled HTTP/HTTPS client is required.
+
+    - HttpCtrl.Server_ - HTTP Server API for testing where easy-controlled HTTP server is required.
+
+    - HttpCtrl.Logging_ - Logging related API to configure the logging system that is used by HttpCtrl library.
+
+    .. _HttpCtrl.Client: client.html
+    .. _HttpCtrl.Server: server.html
+    .. _HttpCtrl.Logging: logging.html
+
+    Example where Json values are updated in a string and then read from it:
+
+    .. code:: robotframework
+
+        *** Settings ***
+
+        Library         HttpCtrl.Client
+        Library         HttpCtrl.Json
+
+        *** Test Cases ***
+
+        Write And Read Json Nesting Value
+            ${json template}=   Catenate
+            ...   {
+            ...      "book": {
+            ...         "title": "St Petersburg: A Cultural History",
+            ...         "author": "Solomon Volkov",
+            ...         "price": 0,
+            ...         "currency": ""
+            ...      }
+            ...   }
+
+            ${catalog}=   Set Json Value In String   ${json template}   book/price      ${500}
+            ${catalog}=   Set Json Value In String   ${catalog}         book/currency   RUB
+
+            ${title}=      Get Json Value From String   ${catalog}   book/title
+            ${price}=      Get Json Value From String   ${catalog}   book/price
+            ${currency}=   Get Json Value From String   ${catalog}   book/currency
+
+
+    Here is an another example where Json array's values are updated and then read from it:
+
+    .. code:: robotframework
+
+        *** Settings ***
+
+        Library         HttpCtrl.Client
+        Library         HttpCtrl.Json
+
+        *** Test Cases ***
+
+        Write And Read Json Array Value
+            ${json template}=   Catenate
+            ...   {
+            ...      "array": [
+            ...         "red", "green", "blue", "yellow"
+            ...      ]
+            ...   }
+
+            ${colors}=   Set Json Value In String   ${json template}   array/3   white
+
+            ${red}=     Get Json Value From String   ${colors}   array/0
+            ${green}=   Get Json Value From String   ${colors}   array/1
+            ${blue}=    Get Json Value From String   ${colors}   array/2
+            ${white}=   Get Json Value From String   ${colors}   array/3
+
+    """
+
+    @staticmethod
+    def get_json_value_from_string(json_string, path):
+        """
+
+        Return value from Json that is represented by string. Be aware, returned value's type corresponds to its
+        type in Json.
+
+        `json_string` [in] (string): Json that is represented by string.
+
+        `path` [in] (string): Path to Json node value.
+
+        Example how to obtain Json value:
+
+        +-----------+----------------------------+------------------------------------+------------+
+        | ${value}= | Get Json Value From String | { "book": { "title": "Unknown" } } | book/title |
+        +-----------+----------------------------+------------------------------------+------------+
+
+        .. code:: text
+
+            ${json}=    Catenate
+            ...   {
+            ...      "book": {
+            ...         "title": "Unknown"
+            ...      }
+            ...   }
+            ${value}=   Get Json Value From String   ${json}   book/title
+
+        """
+        json_content = json.loads(json_string)
+        keys = path.split('/')
+
+        current_element = json_content
+        for key in keys:
+            if isinstance(current_element, list):
+                key = int(key)
+
+            current_element = current_element[key]
+
+        return current_element
+
+
+    @staticmethod
+    def set_json_value_in_string(json_string, path, value):
+        """
+
+        Set value in Json that is represented by string. Be aware type of updated value should correspond to its
+        type in Json, otherwise type will be changed with new value.
+
+        `json_string` [in] (string): Json that is represented by string.
+
+        `path` [in] (string): Path to Json node value.
+
+        `value` [in] (any): New value for the Json node.
+
+        Example how to set Json value:
+
+        +-----------+--------------------------+------------------------------------+------------+--------+
+        | ${value}= | Set Json Value In String | { "book": { "title": "Unknown" } } | book/title | "Math" |
+        +-----------+--------------------------+------------------------------------+------------+--------+
+
+        .. code:: text
+
+            ${json}=    Catenate
+            ...   {
+            ...      "book": {
+            ...         "title": "Unknown"
+            ...      }
+            ...   }
+            ${value}=   Set Json Value In String   ${json}   book/title   "Math"
+
+        Example how to set value in Json array node:
+
+        +-----------+--------------------------+--------------------------------------+---------+---------+
+        | ${value}= | Set Json Value In String | { "array": [ "one", "two", "ten" ] } | array/2 | "three" |
+        +-----------+--------------------------+--------------------------------------+---------+---------+
+
+        .. code:: text
+
+            ${json}=    Catenate
+            ...   {
+            ...      "array": [
+            ...         "one", "two", "ten"
+            ...      ]
+            ...   }
+            ${value}=   Set Json Value In String   ${json}   array/2   "three"
+
+        """
+        json_content = json.loads(json_string)
+        keys = path.split('/')
+
+        current_element = json_content
+        for key in keys:
+            if key == keys[-1]:
+                if isinstance(current_element, list):
+                    key = int(key)
+
+                current_element[key] = value
+            else:
+                if isinstance(current_element, list):
+                    key = int(key)
+
+                current_element = current_element[key]
+
+        return json.dumps(json_content)
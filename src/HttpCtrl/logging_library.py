@@ -0,0 +1,141 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+from robot.api import logger
+
+from HttpCtrl.utils.logger import LoggerAssistant
+from HttpCtrl.utils.profiler import Profiler
+
+
+class Logging:
+    """
+
+    Logging library provide functionality to configure the logging system that is used by HttpCtrl library.
+
+    See other HttpCtrl libraries:
+
+    - HttpCtrl.Client_ - HTTP/HTTP Client API for testing where easy-controlled HTTP/HTTPS client is required.
+
+    - HttpCtrl.Server_ - HTTP Server API for testing where easy-controlled HTTP server is required.
+
+    - HttpCtrl.Json_ - Json related API for testing where work with Json message is required.
+
+    .. _HttpCtrl.Client: client.html
+    .. _HttpCtrl.Server: server.html
+    .. _HttpCtrl.Json: json.html
+
+    """
+
+    @staticmethod
+    def set_body_size_limit_to_log(body_size):
+        """
+
+        Set body (HTTP request/response) size that is allowed to log. By default the library logs `512` symbols of the body. If the
+        limit should be removed then `${None}` value can be provided to the function.
+
+        The logging body limit protects test logs to be too large if tests use big data for testing.
+
+        Example how to set the logging body limit to 1024 symbols:
+
+        +----------------------------+------+
+        | Set Body Size Limit To Log | 1024 |
+        +----------------------------+------+
+
+        .. code:: text
+
+            Set Body Size Limit To Log    1024
+
+        Example how to remove the logging body limit:
+
+        +----------------------------+---------+
+        | Set Body Size Limit To Log | ${None} |
+        +----------------------------+---------+
+
+        .. code:: text
+
+            Set Body Size Limit To Log    ${None}
+
+        """
+
+        LoggerAssistant.set_body_size(body_size)
+
+
+    @staticmethod
+    def start_profiling(trace_memory=True):
+        """
+
+        Start profiling of HttpCtrl library: CPU time is measured by `cProfile` for request handling in server
+        threads and for client calls (sending requests and receiving responses), memory allocations that are made
+        by HttpCtrl code are traced by `tracemalloc`. Other threads and keywords of the test are not profiled.
+        Profiling slows down the library, therefore it should be used only to find bottlenecks.
+
+        `trace_memory` [in] (bool): Trace memory allocations, by default `${True}`. Optional argument.
+
+        Example how to profile a test:
+
+        +-----------------+
+        | Start Profiling |
+        +-----------------+
+
+        .. code:: text
+
+            Start Profiling
+            Send HTTP Request   GET   /api/v1/get
+            Stop Profiling      httpctrl_profile
+
+        Example how to profile only CPU time:
+
+        .. code:: text
+
+            Start Profiling   trace_memory=${False}
+
+        """
+        try:
+            Profiler().start(bool(trace_memory))
+        except Exception as exception:
+            raise AssertionError("Impossible to start profiling (reason: '%s')." % str(exception))
+
+        logger.info("Profiling is started (trace memory: '%s')." % trace_memory)
+
+
+    @staticmethod
+    def stop_profiling(prefix='httpctrl_profile', top=20):
+        """
+
+        Stop profiling that has been started by \`Start Profiling\`. CPU profile is written to '<prefix>.pstats'
+        file (it can be analyzed by `pstats` module or `snakeviz`), memory snapshot is written to '<prefix>.snapshot'
+        file (it can be loaded by `tracemalloc.Snapshot.load`). Summary with the top functions by cumulative time
+        and the top allocators is written to the log. Returns list of written files.
+
+        `prefix` [in] (string): Path prefix for the output files, by default 'httpctrl_profile'. Optional argument.
+
+        `top` [in] (int): Amount of functions and allocators in the summary, by default `20`. Optional argument.
+
+        Example how to stop profiling and write results to the output directory:
+
+        +------------+----------------+-----------------------------+
+        | ${files}=  | Stop Profiling | ${OUTPUT DIR}/server_profile |
+        +------------+----------------+-----------------------------+
+
+        .. code:: text
+
+            ${files}=   Stop Profiling   ${OUTPUT DIR}/server_profile
+
+        """
+        try:
+            result = Profiler().stop()
+            filenames = result.dump(prefix)
+        except Exception as exception:
+            raise AssertionError("Impossible to stop profiling (reason: '%s')." % str(exception))
+
+        logger.info(result.summarize(int(top)))
+        logger.info("Profiling is stopped, results are written to '%s'." % "', '".join(filenames))
+
+        return filenames
@@ -0,0 +1,209 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import atexit
+import errno
+import os
+import socket
+import tempfile
+import threading
+
+from HttpCtrl.utils.singleton import Singleton
+
+
+class PortLease(metaclass=Singleton):
+    """
+    File-based port leases to coordinate ports between processes on the same host (for example, pabot executors)
+    without any lock. A lease is a file '<port>.lease' in the lease directory that contains PID of the owner, it is
+    created atomically by O_CREAT | O_EXCL, so only one process leases the port. Leases of dead processes are
+    reclaimed by the next processes, leases of the current process are released on exit.
+
+    The lease directory is '<temp>/httpctrl-ports' by default, it can be changed by environment variable
+    'HTTPCTRL_PORT_LEASE_DIR' (all processes that are coordinated should use the same directory).
+
+    """
+    DEFAULT_FIRST_PORT = 20000
+    DEFAULT_LAST_PORT = 29999
+
+    __SUFFIX = '.lease'
+
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__ports = set()
+        self.__directory = os.environ.get('HTTPCTRL_PORT_LEASE_DIR',
+                                          os.path.join(tempfile.gettempdir(), 'httpctrl-ports'))
+
+        atexit.register(self.release_all)
+
+
+    def get_directory(self):
+        return self.__directory
+
+
+    def acquire(self, host, first_port=DEFAULT_FIRST_PORT, last_port=DEFAULT_LAST_PORT):
+        """
+        Leases a port from the range [first_port, last_port] that is free on the host and returns it. Processes
+        start the search from different positions (depends on PID), so they do not compete for the same ports.
+
+        """
+        if not (0 < first_port <= last_port <= 65535):
+            raise ValueError("Invalid port range '%d-%d'." % (first_port, last_port))
+
+        os.makedirs(self.__directory, exist_ok=True)
+
+        amount = last_port - first_port + 1
+        offset = (os.getpid() * 7919) % amount
+
+        for index in range(amount):
+            port = first_port + (offset + index) % amount
+            if not self.__create_lease(port):
+                continue
+
+            try:
+                bindable = PortLease.__is_bindable(host, port)
+            except OSError:
+                self.__remove_lease(port)
+                raise
+
+            if bindable:
+                with self.__lock:
+                    self.__ports.add(port)
+                return port
+
+            # the port is used by a process that does not take part in leasing
+            self.__remove_lease(port)
+
+        raise RuntimeError("there is no free port in range '%d-%d'" % (first_port, last_port))
+
+
+    def release(self, port):
+        """
+        Releases port that is leased by the current process, returns False if the port is not leased by it.
+
+        """
+        with self.__lock:
+            if port not in self.__ports:
+                return False
+
+            self.__ports.discard(port)
+
+        self.__remove_lease(port)
+        return True
+
+
+    def release_all(self):
+        with self.__lock:
+            ports, self.__ports = self.__ports, set()
+
+        for port in ports:
+            self.__remove_lease(port)
+
+
+    def __get_path(self, port):
+        return os.path.join(self.__directory, str(port) + PortLease.__SUFFIX)
+
+
+    def __create_lease(self, port, reclaim=True):
+        path = self.__get_path(port)
+        try:
+            descriptor = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            if reclaim and self.__reclaim_lease(port):
+                return self.__create_lease(port, reclaim=False)
+            return False
+
+        with os.fdopen(descriptor, 'w') as file_stream:
+            file_stream.write(str(os.getpid()))
+
+        return True
+
+
+    def __reclaim_lease(self, port):
+        """
+        Removes lease of a dead process. The lease is renamed to a unique name first (rename is atomic), so only one
+        process reclaims it. If another process has leased the port between the check and the rename, the lease is
+        restored by a hard link that does not overwrite a lease that is created in the meantime.
+
+        """
+        path = self.__get_path(port)
+        if PortLease.__is_owner_alive(PortLease.__read_owner(path)):
+            return False
+
+        reclaimed_path = "%s.%d.reclaimed" % (path, os.getpid())
+        try:
+            os.rename(path, reclaimed_path)
+        except OSError:
+            return False  # another process has reclaimed or released it
+
+        if PortLease.__is_owner_alive(PortLease.__read_owner(reclaimed_path)):
+            try:
+                os.link(reclaimed_path, path)
+            except OSError:
+                pass
+            os.unlink(reclaimed_path)
+            return False
+
+        os.unlink(reclaimed_path)
+        return True
+
+
+    def __remove_lease(self, port):
+        path = self.__get_path(port)
+        if PortLease.__read_owner(path) == os.getpid():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+    @staticmethod
+    def __read_owner(path):
+        try:
+            with open(path, 'r') as file_stream:
+                return int(file_stream.read().strip())
+        except (OSError, ValueError):
+            return None
+
+
+    @staticmethod
+    def __is_owner_alive(pid):
+        if pid is None:
+            return True  # the lease is being written by its owner
+
+        if pid == os.getpid():
+            return True
+
+        if os.name == 'nt':
+            return True  # signal 0 terminates process on Windows, leases of dead processes are not reclaimed
+
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+
+        return True
+
+
+    @staticmethod
+    def __is_bindable(host, port):
+        try:
+            family = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][0]
+            with socket.socket(family, socket.SOCK_STREAM) as probe:
+                probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                probe.bind((host, port))
+        except OSError as error:
+            if error.errno in (errno.EADDRINUSE, errno.EACCES):
+                return False
+            raise
+
+        return True
@@ -0,0 +1,60 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import math
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket that allows `rate` requests per second with bursts up to `burst` requests. The bucket does not use
+    its own lock - it is expected to be used under the lock of its owner (for example, stub container).
+
+    """
+    def __init__(self, rate, burst):
+        if rate <= 0:
+            raise ValueError("Rate limit should be positive (current value: '%s')." % rate)
+
+        if burst < 1:
+            raise ValueError("Burst size should be at least 1 (current value: '%s')." % burst)
+
+        self.__rate = float(rate)
+        self.__burst = float(burst)
+        self.__tokens = float(burst)
+        self.__timestamp = time.monotonic()
+
+
+    def try_acquire(self):
+        self.__refill()
+
+        if self.__tokens >= 1.0:
+            self.__tokens -= 1.0
+            return True
+
+        return False
+
+
+    def retry_after(self):
+        """
+        Returns amount of seconds (rounded up) after that the next token is going to be available.
+
+        """
+        self.__refill()
+
+        if self.__tokens >= 1.0:
+            return 0
+
+        return math.ceil((1.0 - self.__tokens) / self.__rate)
+
+
+    def __refill(self):
+        current_time = time.monotonic()
+        self.__tokens = min(self.__burst, self.__tokens + (current_time - self.__timestamp) * self.__rate)
+        self.__timestamp = current_time
@@ -8,26 +8,53 @@ Copyright: The 3-Clause BSD License
 
 """
 
+import hashlib
+import sys
+import time
 
+from HttpCtrl.body_spool import SpooledBody
+from HttpCtrl.http_headers import HttpHeaders
 from HttpCtrl.utils.logger import LoggerAssistant
 
 
 class Request:
-    def __init__(self, host, port, method, url, headers, body=None):
-        self.__source_host = host
+    # Requests are kept by the server for a long time, therefore they are stored compactly: headers are kept as a
+    # raw header block that is parsed only on the first access, body is shared between copies. Large body might be
+    # spooled to disk, it is mapped to memory only when it is accessed.
+    __slots__ = ('__source_host', '__source_port', '__method', '__url', '__body', '__raw_headers', '__headers',
+                 '__timestamp')
+
+    def __init__(self, host, port, method, url, headers, body=None, timestamp=None):
+        self.__source_host = sys.intern(host) if isinstance(host, str) else host
         self.__source_port = port
         self.__method = method
         self.__url = url
         self.__body = body
-        self.__headers = headers
+        self.__raw_headers = Request.__get_raw_headers(headers)
+        self.__headers = None
+        self.__timestamp = timestamp if timestamp is not None else time.time()
 
     def __copy__(self):
-        return Request(self.__source_host, self.__source_port, self.__method, self.__url, self.__headers, self.__body)
+        return Request(self.__source_host, self.__source_port, self.__method, self.__url, self.__raw_headers,
+                       self.__body, self.__timestamp)
 
     def __str__(self):
-        body_to_log = LoggerAssistant.get_body(self.__body)
+        body_to_log = LoggerAssistant.get_body(self.get_body())
         return "%s %s\n%s" % (self.__method, self.__url, body_to_log)
 
+    @staticmethod
+    def __get_raw_headers(headers):
+        if (headers is None) or isinstance(headers, bytes):
+            return headers
+
+        if isinstance(headers, HttpHeaders):
+            return headers.to_bytes()
+
+        if hasattr(headers, 'raw_items'):
+            headers = headers.raw_items()
+
+        return "".join("%s: %s\r\n" % (key, value) for key, value in headers).encode('iso-8859-1')
+
     def get_source_address(self):
         return self.__source_host
 
@@ -38,10 +65,61 @@ class Request:
         return self.__method
 
     def get_headers(self):
+        if (self.__headers is None) and (self.__raw_headers is not None):
+            self.__headers = HttpHeaders(raw=self.__raw_headers)
+
         return self.__headers
 
+    def get_header_items(self):
+        """
+        Returns list of (name, value) pairs without keeping parsed headers.
+
+        """
+        if self.__headers is not None:
+            return self.__headers.raw_items()
+
+        if self.__raw_headers is None:
+            return []
+
+        return HttpHeaders(raw=self.__raw_headers).raw_items()
+
     def get_url(self):
         return self.__url
 
     def get_body(self):
+        if isinstance(self.__body, SpooledBody):
+            return self.__body.get_view()
+
         return self.__body
+
+    def get_body_view(self):
+        body = self.get_body()
+        if body is None:
+            return None
+
+        return memoryview(body)
+
+    def get_body_length(self):
+        if self.__body is None:
+            return 0
+
+        return len(self.__body)
+
+    def get_body_digest(self, algorithm='sha256'):
+        if isinstance(self.__body, SpooledBody):
+            return self.__body.get_digest(algorithm)
+
+        body = self.__body if self.__body is not None else b''
+        return hashlib.new(algorithm, body).hexdigest()
+
+    def save_body(self, path):
+        if isinstance(self.__body, SpooledBody):
+            self.__body.save(path)
+            return
+
+        with open(path, 'wb') as file:
+            if self.__body is not None:
+                file.write(self.__body)
+
+    def get_timestamp(self):
+        return self.__timestamp
@@ -0,0 +1,270 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import collections
+import threading
+
+from HttpCtrl.utils.singleton import Singleton
+
+
+class RequestHistoryCriteria:
+    def __init__(self, **kwargs):
+        self.method = kwargs.get('method', None)
+        if self.method is not None:
+            self.method = self.method.upper()
+
+        self.path = kwargs.get('path', None)
+
+        self.header = kwargs.get('header', None)
+        if self.header is not None:
+            self.header = self.header.lower()
+
+        self.value = kwargs.get('value', None)
+        self.since = kwargs.get('since', None)
+        self.until = kwargs.get('until', None)
+
+
+class RequestHistory(metaclass=Singleton):
+    """
+    Bounded ring buffer of received requests with secondary indexes on method, path and the chosen header. Each
+    index keeps identifiers of requests in order of arrival, therefore the oldest identifiers are removed from the
+    head of the index when requests are evicted from the buffer. Time range is found by binary search because
+    requests are placed to the buffer in order of arrival.
+
+    """
+    __DEFAULT_CAPACITY = 10000
+
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__capacity = RequestHistory.__DEFAULT_CAPACITY
+        self.__header = None
+        self.__reset()
+
+
+    def set_capacity(self, capacity):
+        with self.__lock:
+            self.__capacity = capacity
+            self.__reset()
+
+
+    def set_index_header(self, header):
+        with self.__lock:
+            self.__header = header.lower() if header is not None else None
+
+            self.__index_header = {}
+            for identifier in range(self.__first_id, self.__next_id):
+                for key in self.__get_header_keys(self.__get(identifier)):
+                    self.__add_to_index(self.__index_header, key, identifier)
+
+
+    def push(self, request):
+        with self.__lock:
+            if self.__capacity == 0:
+                return
+
+            if self.__next_id - self.__first_id == self.__capacity:
+                self.__evict()
+
+            identifier = self.__next_id
+            self.__next_id += 1
+
+            self.__buffer[identifier % self.__capacity] = request
+
+            self.__add_to_index(self.__index_method, request.get_method(), identifier)
+            self.__add_to_index(self.__index_path, RequestHistory.__get_path(request), identifier)
+            for key in self.__get_header_keys(request):
+                self.__add_to_index(self.__index_header, key, identifier)
+
+
+    def find(self, criteria):
+        with self.__lock:
+            return [self.__get(identifier) for identifier in self.__find_identifiers(criteria)]
+
+
+    def count(self, criteria):
+        with self.__lock:
+            candidates, is_exact = self.__get_candidates(criteria)
+            if is_exact is True:
+                return len(candidates)
+
+            return sum(1 for _ in self.__filter(candidates, criteria))
+
+
+    def clear(self):
+        with self.__lock:
+            self.__reset()
+
+
+    def __reset(self):
+        self.__buffer = [None] * self.__capacity
+        self.__first_id = 0
+        self.__next_id = 0
+
+        self.__index_method = {}
+        self.__index_path = {}
+        self.__index_header = {}
+
+
+    def __get(self, identifier):
+        return self.__buffer[identifier % self.__capacity]
+
+
+    def __evict(self):
+        identifier = self.__first_id
+        request = self.__get(identifier)
+
+        self.__remove_from_index(self.__index_method, request.get_method(), identifier)
+        self.__remove_from_index(self.__index_path, RequestHistory.__get_path(request), identifier)
+        for key in self.__get_header_keys(request):
+            self.__remove_from_index(self.__index_header, key, identifier)
+
+        self.__buffer[identifier % self.__capacity] = None
+        self.__first_id += 1
+
+
+    def __find_identifiers(self, criteria):
+        candidates, is_exact = self.__get_candidates(criteria)
+        if is_exact is True:
+            return candidates
+
+        return list(self.__filter(candidates, criteria))
+
+
+    def __get_candidates(self, criteria):
+        """
+        Returns the smallest sequence of request identifiers that is provided by indexes for the criteria and flag
+        that defines whether the sequence satisfies the criteria without additional checks.
+
+        """
+        indexed = []
+        amount_criteria = 0
+
+        if criteria.method is not None:
+            indexed.append(self.__index_method.get(criteria.method, ()))
+            amount_criteria += 1
+
+        if criteria.path is not None:
+            indexed.append(self.__index_path.get(criteria.path, ()))
+            amount_criteria += 1
+
+        if criteria.header is not None:
+            if (criteria.header == self.__header) and (criteria.value is not None):
+                indexed.append(self.__index_header.get(criteria.value, ()))
+            amount_criteria += 1
+
+        if (criteria.since is not None) or (criteria.until is not None):
+            indexed.append(self.__get_time_range(criteria.since, criteria.until))
+            amount_criteria += 1
+
+        if len(indexed) == 0:
+            return range(self.__first_id, self.__next_id), (amount_criteria == 0)
+
+        candidates = min(indexed, key=len)
+        return candidates, (amount_criteria == 1) and (len(indexed) == 1)
+
+
+    def __filter(self, candidates, criteria):
+        for identifier in candidates:
+            request = self.__get(identifier)
+
+            if (criteria.method is not None) and (request.get_method() != criteria.method):
+                continue
+
+            if (criteria.path is not None) and (RequestHistory.__get_path(request) != criteria.path):
+                continue
+
+            if (criteria.since is not None) and (request.get_timestamp() < criteria.since):
+                continue
+
+            if (criteria.until is not None) and (request.get_timestamp() > criteria.until):
+                continue
+
+            if (criteria.header is not None) and not RequestHistory.__has_header(request, criteria.header, criteria.value):
+                continue
+
+            yield identifier
+
+
+    def __get_time_range(self, since, until):
+        begin = self.__bisect(since) if since is not None else self.__first_id
+        end = self.__bisect(until, True) if until is not None else self.__next_id
+        return range(begin, max(begin, end))
+
+
+    def __bisect(self, timestamp, inclusive=False):
+        low, high = self.__first_id, self.__next_id
+        while low < high:
+            middle = (low + high) // 2
+            value = self.__get(middle).get_timestamp()
+
+            if (value < timestamp) or (inclusive and value == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+
+    def __get_header_keys(self, request):
+        """
+        Returns distinct values of the indexed header in the request, each value of a repeated header is indexed,
+        so indexed lookup finds the same requests as the scan does.
+
+        """
+        if self.__header is None:
+            return ()
+
+        values = []
+        for key, value in request.get_header_items():
+            if (key.lower() == self.__header) and (value not in values):
+                values.append(value)
+
+        return values
+
+
+    @staticmethod
+    def __has_header(request, header, value):
+        for current_key, current_value in request.get_header_items():
+            if (current_key.lower() == header) and ((value is None) or (current_value == value)):
+                return True
+
+        return False
+
+
+    @staticmethod
+    def __get_path(request):
+        return request.get_url().split('?', 1)[0]
+
+
+    @staticmethod
+    def __add_to_index(index, key, identifier):
+        if key is None:
+            return
+
+        identifiers = index.get(key)
+        if identifiers is None:
+            identifiers = collections.deque()
+            index[key] = identifiers
+
+        identifiers.append(identifier)
+
+
+    @staticmethod
+    def __remove_from_index(index, key, identifier):
+        if key is None:
+            return
+
+        identifiers = index.get(key)
+        if (identifiers is not None) and (len(identifiers) > 0) and (identifiers[0] == identifier):
+            identifiers.popleft()
+
+            if len(identifiers) == 0:
+                del index[key]
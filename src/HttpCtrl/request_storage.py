@@ -8,6 +8,8 @@ Copyright: The 3-Clause BSD License
 
 """
 
+import collections
+import fnmatch
 import threading
 
 from robot.api import logger
@@ -15,35 +17,220 @@ from robot.api import logger
 from HttpCtrl.utils.singleton import Singleton
 
 
+class RequestCriteria:
+    """
+    Criteria of a request that is waited by a test. Path is matched against the URL path without query, it might
+    be a glob pattern (for example, '/orders/*'), path without wildcards is matched exactly. Header is matched
+    case-insensitively, its value (if it is specified) is matched exactly. Criteria that are not specified match
+    any request.
+
+    """
+    def __init__(self, method=None, path=None, header=None, value=None):
+        self.method = method.upper() if method is not None else None
+        self.path = path
+        self.header = header.lower() if header is not None else None
+        self.value = value
+        self.is_pattern = (path is not None) and any(symbol in path for symbol in '*?[')
+
+
+    def __str__(self):
+        return "method: '%s', path: '%s', header: '%s', value: '%s'" % (self.method, self.path, self.header,
+                                                                        self.value)
+
+
+    def get_key(self):
+        """
+        Returns key of criteria in the index of waiters: method and exact path (None if it is not specified).
+
+        """
+        return self.method, self.path
+
+
+    def match(self, request):
+        if (self.method is not None) and (request.get_method() != self.method):
+            return False
+
+        if self.path is not None:
+            path = RequestCriteria.get_path(request)
+            if self.is_pattern is True:
+                if not fnmatch.fnmatchcase(path, self.path):
+                    return False
+            elif path != self.path:
+                return False
+
+        if self.header is not None:
+            for key, value in request.get_header_items():
+                if (key.lower() == self.header) and ((self.value is None) or (value == self.value)):
+                    return True
+
+            return False
+
+        return True
+
+
+    @staticmethod
+    def get_path(request):
+        return request.get_url().split('?', 1)[0]
+
+
+class RequestWaiter:
+    __slots__ = ('criteria', 'sequence', 'request', 'condition')
+
+    def __init__(self, criteria, sequence, condition):
+        self.criteria = criteria
+        self.sequence = sequence
+        self.request = None
+        self.condition = condition
+
+
 class RequestStorage(metaclass=Singleton):
-    def __init__(self):
-        self.__request = None
-        self.__event_incoming = threading.Condition()
+    """
+    Requests that are received by the server and that are not replied by stubs. Incoming request is dispatched to
+    the earliest waiter whose criteria it satisfies, otherwise it is queued in order of arrival until a waiter
+    takes it. Waiters are indexed by method and exact path, so the request is checked only against waiters that
+    might wait for it: four lookups for combinations of its method and path, and waiters with path patterns.
 
+    Queue keeps up to 128 requests, when it is full the oldest request is dropped. Each queued request holds its
+    connection and a reply worker of the server, so requests that are never received by the test do not exhaust
+    workers that are needed to reply other requests.
 
-    def __ready(self):
-        return self.__request is not None
+    """
+    __QUEUE_LIMIT = 128
+
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__requests = collections.deque()
+        self.__waiters = {}
+        self.__pattern_waiters = []
+        self.__sequence = 0
 
 
     def push(self, request):
-        with self.__event_incoming:
-            logger.info("Push request to the Request Storage: %s" % request)
-            self.__request = request
-            self.__event_incoming.notify()
+        """
+        Passes the request to the earliest waiter whose criteria it satisfies or queues it. Returns the oldest queued
+        request if it is dropped because the queue is full, otherwise None.
+
+        """
+        logger.info("Push request to the Request Storage: %s" % request)
+
+        with self.__lock:
+            waiter = self.__find_waiter(request)
+            if waiter is None:
+                self.__requests.append(request)
+                if len(self.__requests) > RequestStorage.__QUEUE_LIMIT:
+                    dropped = self.__requests.popleft()
+                    logger.info("Request is dropped, the queue of requests is full: %s" % dropped)
+                    return dropped
+
+                return None
 
+            self.__remove_waiter(waiter)
+            waiter.request = request
+            waiter.condition.notify()
+            return None
 
-    def pop(self, timeout=5.0):
-        with self.__event_incoming:
-            if not self.__ready():
-                result = self.__event_incoming.wait_for(self.__ready, timeout)
-                if result is False:
-                    return None
 
-            request = self.__request
-            self.__request = None
-            return request
+    def pop(self, timeout=5.0, criteria=None):
+        """
+        Returns the first queued request that satisfies criteria (any request if criteria is None) or waits for it
+        during `timeout` seconds. Returns None if the request is not received.
+
+        """
+        if criteria is None:
+            criteria = RequestCriteria()
+
+        with self.__lock:
+            request = self.__take_request(criteria)
+            if request is not None:
+                return request
+
+            waiter = RequestWaiter(criteria, self.__sequence, threading.Condition(self.__lock))
+            self.__sequence += 1
+            self.__add_waiter(waiter)
+
+            if waiter.condition.wait_for(lambda: waiter.request is not None, timeout) is False:
+                self.__remove_waiter(waiter)
+                return None
+
+            return waiter.request
+
+
+    def remove(self, request):
+        """
+        Removes the request from the queue if it has not been taken by a waiter yet.
+
+        """
+        with self.__lock:
+            if request in self.__requests:
+                self.__requests.remove(request)
 
 
     def clear(self):
-        with self.__event_incoming:
-            self.__request = None
+        """
+        Removes queued requests and waiters, waiter that is still waiting is not passed any request and it is
+        released by its timeout.
+
+        """
+        with self.__lock:
+            self.__requests.clear()
+            self.__waiters.clear()
+            self.__pattern_waiters.clear()
+            self.__sequence = 0
+
+
+    def __take_request(self, criteria):
+        for position, request in enumerate(self.__requests):
+            if criteria.match(request):
+                del self.__requests[position]
+                return request
+
+        return None
+
+
+    def __find_waiter(self, request):
+        method, path = request.get_method(), RequestCriteria.get_path(request)
+
+        candidate = None
+        for key in ((method, path), (method, None), (None, path), (None, None)):
+            for waiter in self.__waiters.get(key, ()):
+                if (candidate is not None) and (waiter.sequence > candidate.sequence):
+                    break   # waiters of the key are ordered, the rest are registered even later
+
+                if waiter.criteria.match(request):
+                    candidate = waiter
+                    break
+
+        for waiter in self.__pattern_waiters:
+            if (candidate is not None) and (waiter.sequence > candidate.sequence):
+                break
+
+            if waiter.criteria.match(request):
+                candidate = waiter
+                break
+
+        return candidate
+
+
+    def __add_waiter(self, waiter):
+        if waiter.criteria.is_pattern is True:
+            self.__pattern_waiters.append(waiter)
+        else:
+            self.__waiters.setdefault(waiter.criteria.get_key(), collections.deque()).append(waiter)
+
+
+    def __remove_waiter(self, waiter):
+        # waiter might be already removed if the storage has been cleared while it was waiting
+        if waiter.criteria.is_pattern is True:
+            if waiter in self.__pattern_waiters:
+                self.__pattern_waiters.remove(waiter)
+            return
+
+        key = waiter.criteria.get_key()
+        waiters = self.__waiters.get(key)
+        if (waiters is None) or (waiter not in waiters):
+            return
+
+        waiters.remove(waiter)
+        if len(waiters) == 0:
+            del self.__waiters[key]
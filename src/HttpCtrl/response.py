@@ -9,29 +9,65 @@ Copyright: The 3-Clause BSD License
 """
 
 
+from HttpCtrl.http_headers import HttpHeaders
+from HttpCtrl.stream_body import StreamBody
 from HttpCtrl.utils.logger import LoggerAssistant
 
 
 class Response:
-    def __init__(self, status, reason, body, body_file, headers : dict):
+    def __init__(self, status, reason, body, body_file, headers : HttpHeaders, body_digest=None):
         self.__status = status
         self.__reason = reason
-        self.__body = body
         self.__body_file = body_file
         self.__headers = headers
+        if (headers is not None) and not isinstance(headers, HttpHeaders):
+            self.__headers = HttpHeaders(headers)
+        self.__body_digest = body_digest
+
+        # body is encoded once when response is created, so it is sent and logged without conversions and copies
+        self.__set_body(*Response.__normalize_body(body))
 
     def __str__(self):
-        if (self.__body is None) or (len(self.__body) == 0):
+        if isinstance(self.__body, StreamBody):
+            return "%s\n%s" % (str(self.__status), str(self.__body))
+
+        if (self.__body is None) or (self.__body_length == 0):
             if self.__body_file is None:
                 return str(self.__status)
             else:
                 return "%s\n<body is in the file: '%s'>" % (self.__status, self.__body_file)
 
-        body_to_log = LoggerAssistant.get_body(self.__body)
+        encoding = "utf-8" if self.__is_text is True else None
+        body_to_log = LoggerAssistant.get_body(self.__body, encoding)
         return "%s\n%s" % (str(self.__status), body_to_log)
 
     def __copy__(self):
-        return Response(self.__status, self.__reason, self.__body, self.__body_file, self.__headers)
+        response = Response(self.__status, self.__reason, None, self.__body_file, self.__headers, self.__body_digest)
+        response.__set_body(self.__body, self.__is_text)
+        return response
+
+    def __set_body(self, body, is_text):
+        self.__body = body
+        self.__is_text = is_text
+
+        self.__body_length = None
+        if isinstance(body, memoryview):
+            self.__body_length = body.nbytes
+        elif isinstance(body, bytes):
+            self.__body_length = len(body)
+
+    @staticmethod
+    def __normalize_body(body):
+        if isinstance(body, str):
+            return body.encode("utf-8"), True
+
+        if isinstance(body, bytearray):
+            return memoryview(body), False
+
+        if isinstance(body, memoryview) and (body.format != 'B' or body.ndim != 1):
+            return body.cast('B'), False
+
+        return body, False
 
     def get_status(self):
         return self.__status
@@ -46,8 +82,25 @@ class Response:
         if (self.__body is None) and (self.__body_file is not None):
             with open(self.__body_file) as file_stream:
                 return file_stream.read()
-        
+
         return self.__body
 
-    def get_headers(self) -> dict:
+    def get_body_length(self):
+        """
+        Returns length of the body in bytes that is calculated once, None if the body is not in memory (it is in
+        the file or it is streamed).
+
+        """
+        return self.__body_length
+
+    def get_body_view(self):
+        if self.__body_length is None:
+            return None
+
+        return memoryview(self.__body)
+
+    def get_headers(self) -> HttpHeaders:
         return self.__headers
+
+    def get_body_digest(self):
+        return self.__body_digest
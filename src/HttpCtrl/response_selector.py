@@ -0,0 +1,123 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import random
+
+
+class SingleResponseSelector:
+    def __init__(self, response):
+        self.__response = response
+
+
+    def select(self):
+        return self.__response
+
+
+    def get_responses(self):
+        return [self.__response]
+
+
+class SequenceResponseSelector:
+    POLICY_CYCLE = 'cycle'
+    POLICY_LAST = 'last'
+
+
+    def __init__(self, responses, policy=POLICY_CYCLE):
+        if len(responses) == 0:
+            raise ValueError("Sequence of responses is empty.")
+
+        if policy not in (SequenceResponseSelector.POLICY_CYCLE, SequenceResponseSelector.POLICY_LAST):
+            raise ValueError("Unknown sequence policy '%s' (supported: '%s', '%s')." %
+                             (policy, SequenceResponseSelector.POLICY_CYCLE, SequenceResponseSelector.POLICY_LAST))
+
+        self.__responses = list(responses)
+        self.__policy = policy
+        self.__index = 0
+
+
+    def select(self):
+        response = self.__responses[self.__index]
+
+        if self.__index + 1 < len(self.__responses):
+            self.__index += 1
+        elif self.__policy == SequenceResponseSelector.POLICY_CYCLE:
+            self.__index = 0
+
+        return response
+
+
+    def get_responses(self):
+        return self.__responses
+
+
+class WeightedResponseSelector:
+    """
+    Selects responses randomly in line with their weights using alias table (Vose's alias method) that is built
+    once, so each selection takes constant time.
+
+    """
+    def __init__(self, responses, weights, seed=None):
+        if len(responses) == 0:
+            raise ValueError("Sequence of responses is empty.")
+
+        if len(responses) != len(weights):
+            raise ValueError("Amount of weights '%d' is not equal to amount of responses '%d'." %
+                             (len(weights), len(responses)))
+
+        if any(weight < 0 for weight in weights) or sum(weights) <= 0:
+            raise ValueError("Weights should be non-negative and their sum should be positive.")
+
+        self.__responses = list(responses)
+        self.__random = random.Random(seed)
+        self.__probabilities, self.__aliases = WeightedResponseSelector.__build_alias_table(weights)
+
+
+    def select(self):
+        index = int(self.__random.random() * len(self.__responses))
+        if self.__random.random() < self.__probabilities[index]:
+            return self.__responses[index]
+
+        return self.__responses[self.__aliases[index]]
+
+
+    def get_responses(self):
+        return self.__responses
+
+
+    @staticmethod
+    def __build_alias_table(weights):
+        amount = len(weights)
+        total = float(sum(weights))
+
+        scaled = [weight * amount / total for weight in weights]
+        probabilities = [0.0] * amount
+        aliases = [0] * amount
+
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+
+        while small and large:
+            index_small = small.pop()
+            index_large = large.pop()
+
+            probabilities[index_small] = scaled[index_small]
+            aliases[index_small] = index_large
+
+            scaled[index_large] = (scaled[index_large] + scaled[index_small]) - 1.0
+            if scaled[index_large] < 1.0:
+                small.append(index_large)
+            else:
+                large.append(index_large)
+
+        # remaining values are equal to 1.0 with precision of floating point arithmetic
+        for index in large + small:
+            probabilities[index] = 1.0
+
+        return probabilities, aliases
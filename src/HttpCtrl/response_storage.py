@@ -12,38 +12,102 @@ import threading
 
 from robot.api import logger
 
+from HttpCtrl.internal_messages import TerminationRequest
 from HttpCtrl.utils.singleton import Singleton
 
 
+class ResponseSlot:
+    __slots__ = ('response', 'generation', 'condition')
+
+    def __init__(self, generation, condition):
+        self.response = None
+        self.generation = generation
+        self.condition = condition
+
+
 class ResponseStorage(metaclass=Singleton):
+    """
+    Responses that are provided by a test for received requests. Each request that is waiting for response has its
+    own slot, therefore handlers of several requests wait for their responses independently and a response is
+    delivered only to the request it is intended for.
+
+    """
     def __init__(self):
-        self.__response = None
-        self.__event_incoming = threading.Condition()
+        self.__lock = threading.Lock()
+        self.__slots = {}
+        self.__generation = 0
+
 
+    def expect(self, request):
+        """
+        Registers request that is going to wait for response, it should be called before the request is passed to
+        the test, so a response that is provided immediately is not lost.
 
-    def __ready(self):
-        return self.__response is not None
+        """
+        with self.__lock:
+            self.__slots[request] = ResponseSlot(self.__generation, threading.Condition(self.__lock))
 
 
-    def push(self, response):
-        with self.__event_incoming:
+    def push(self, request, response):
+        with self.__lock:
+            slot = self.__slots.get(request)
+            if slot is None:
+                logger.info("Response is not delivered, the request is not waiting for response: %s" % response)
+                return
+
             logger.info("Push response to the Response Storage: %s" % response)
-            self.__response = response
-            self.__event_incoming.notify()
+            slot.response = response
+            slot.condition.notify()
+
+
+    def pop(self, request, timeout=5.0, keep=False):
+        """
+        Returns response for the request that has been registered by `expect`, None if the response is not provided
+        during `timeout` seconds or termination request if waiting is interrupted. If `keep` is True then the request
+        continues to wait for response after timeout.
+
+        """
+        with self.__lock:
+            slot = self.__slots.get(request)
+            if slot is None:
+                return None
+
+            slot.condition.wait_for(lambda: (slot.response is not None) or (slot.generation != self.__generation),
+                                    timeout)
+
+            if slot.response is not None:
+                response = slot.response
+            elif slot.generation != self.__generation:
+                response = TerminationRequest()
+            elif keep is True:
+                return None
+            else:
+                response = None
+
+            self.__slots.pop(request, None)    # slot is removed by `clear` if waiting is interrupted by it
+            return response
 
 
-    def pop(self, timeout=5.0):
-        with self.__event_incoming:
-            if not self.__ready():
-                result = self.__event_incoming.wait_for(self.__ready, timeout)
-                if result is False:
-                    return None
+    def interrupt(self):
+        """
+        Releases handlers that are waiting for response by termination request, including requests that have been
+        registered but are not waiting yet.
 
-            response = self.__response
-            self.__response = None
-            return response
+        """
+        with self.__lock:
+            self.__generation += 1
+            for slot in self.__slots.values():
+                slot.condition.notify()
 
 
     def clear(self):
-        with self.__event_incoming:
-            self.__response = None
+        """
+        Removes all slots, handlers that are still waiting for response are released by termination request.
+
+        """
+        with self.__lock:
+            self.__generation += 1
+            for slot in self.__slots.values():
+                slot.condition.notify()
+
+            self.__slots.clear()
@@ -0,0 +1,212 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import datetime
+import email.utils
+import random
+import threading
+
+
+class RetryPolicy:
+    """
+    Defines when a request is sent again and how long the client waits before the next attempt. A request is retried
+    if the response status is one of the retriable statuses or if the request is failed by one of the retriable
+    errors (name of the exception class or of any of its base classes). Delay is growing exponentially
+    (`backoff * multiplier ^ (attempt - 1)`), it is limited by `max_delay` and randomized by full jitter to spread
+    attempts of concurrent clients. Delay that is requested by the server by header 'Retry-After' has priority.
+
+    """
+    DEFAULT_STATUSES = (429, 502, 503, 504)
+    DEFAULT_ERRORS = ('ConnectionError', 'TimeoutError', 'timeout')
+
+
+    def __init__(self, attempts=1, statuses=DEFAULT_STATUSES, errors=DEFAULT_ERRORS, backoff=0.1, multiplier=2.0,
+                 max_delay=30.0, jitter=True, retry_after=True):
+        if attempts < 1:
+            raise ValueError("amount of attempts should be at least 1, but '%s' is provided" % attempts)
+
+        if (backoff < 0) or (max_delay < 0) or (multiplier < 1):
+            raise ValueError("backoff and maximum delay should be non-negative, multiplier should be at least 1")
+
+        self.__attempts = attempts
+        self.__statuses = frozenset(statuses)
+        self.__errors = frozenset(errors)
+        self.__backoff = backoff
+        self.__multiplier = multiplier
+        self.__max_delay = max_delay
+        self.__jitter = jitter
+        self.__retry_after = retry_after
+        self.__random = random.Random()
+
+
+    def __str__(self):
+        return "attempts: '%d', statuses: '%s', errors: '%s', backoff: '%s', max delay: '%s'" % \
+               (self.__attempts, ", ".join(str(status) for status in sorted(self.__statuses)),
+                ", ".join(sorted(self.__errors)), self.__backoff, self.__max_delay)
+
+
+    def get_attempts(self):
+        return self.__attempts
+
+
+    def is_retriable_status(self, status):
+        return status in self.__statuses
+
+
+    def is_retriable_error(self, exception):
+        return any(exception_type.__name__ in self.__errors for exception_type in type(exception).__mro__)
+
+
+    def get_delay(self, attempt, retry_after=None):
+        """
+        Returns delay in seconds before the attempt that follows the specified one (attempts are counted from 1).
+
+        """
+        if (self.__retry_after is True) and (retry_after is not None):
+            delay = RetryPolicy.parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.__max_delay)
+
+        delay = min(self.__max_delay, self.__backoff * (self.__multiplier ** (attempt - 1)))
+        if self.__jitter is True:
+            delay = self.__random.uniform(0.0, delay)
+
+        return delay
+
+
+    @staticmethod
+    def parse_statuses(statuses):
+        """
+        Converts comma-separated status codes and ranges (for example, '429, 500-599') to a set of status codes.
+
+        """
+        result = set()
+        for item in str(statuses).split(','):
+            item = item.strip()
+            if len(item) == 0:
+                continue
+
+            try:
+                if '-' in item:
+                    first, last = item.split('-', 1)
+                    result.update(range(int(first), int(last) + 1))
+                else:
+                    result.add(int(item))
+            except ValueError:
+                raise ValueError("invalid status code or range '%s'" % item)
+
+        return result
+
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Returns amount of seconds from header 'Retry-After' (delay in seconds or HTTP date) or None if the value is
+        invalid.
+
+        """
+        value = str(value).strip()
+        if value.isdigit():
+            return float(value)
+
+        try:
+            moment = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if moment is None:
+            return None
+
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=datetime.timezone.utc)
+
+        return max(0.0, (moment - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+class HedgingPolicy:
+    """
+    Hedged requests: if response is not received in `delay` seconds, one more copy of the request is sent, up to
+    `copies` additional copies. The first successful exchange wins, others are cancelled. Only methods that are
+    safe to repeat are hedged.
+
+    """
+    DEFAULT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+    def __init__(self, delay, copies=1, methods=DEFAULT_METHODS):
+        if delay < 0:
+            raise ValueError("hedging delay should be non-negative, but '%s' is provided" % delay)
+
+        if copies < 1:
+            raise ValueError("amount of copies should be at least 1, but '%s' is provided" % copies)
+
+        self.__delay = delay
+        self.__copies = copies
+        self.__methods = frozenset(method.upper() for method in methods)
+
+
+    def __str__(self):
+        return "delay: '%s', copies: '%d', methods: '%s'" % (self.__delay, self.__copies,
+                                                              ", ".join(sorted(self.__methods)))
+
+
+    def is_applicable(self, method):
+        return method.upper() in self.__methods
+
+
+    def execute(self, exchange, cancel):
+        """
+        Runs `exchange(index)` for the original request (index 0) and for its copies in separate threads and
+        returns result of the first successful one, `cancel(index)` is called for the others. If all exchanges are
+        failed then error of the last one is raised.
+
+        """
+        import queue
+
+        results = queue.Queue()
+
+        def run(index):
+            try:
+                results.put((index, exchange(index), None))
+            except Exception as exception:
+                results.put((index, None, exception))
+
+        def start(index):
+            thread = threading.Thread(target=run, args=(index,), name="HttpCtrl-HedgedRequest-%d" % index)
+            thread.daemon = True
+            thread.start()
+
+        start(0)
+        started, finished = 1, 0
+
+        while True:
+            timeout = self.__delay if started <= self.__copies else None
+            try:
+                index, result, error = results.get(timeout=timeout)
+            except queue.Empty:
+                start(started)
+                started += 1
+                continue
+
+            finished += 1
+            if error is None:
+                for other in range(started):
+                    if other != index:
+                        cancel(other)
+
+                return result
+
+            if finished == started:
+                if started <= self.__copies:
+                    start(started)      # the failed exchange is replaced by the next copy without delay
+                    started += 1
+                    continue
+
+                raise error
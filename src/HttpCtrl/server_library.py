@@ -0,0 +1,2009 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import threading
+
+from robot.api import logger
+
+from HttpCtrl.body_spool import BodySpool
+from HttpCtrl.compression import get_supported_encodings, is_supported
+from HttpCtrl.http_headers import HttpHeaders
+from HttpCtrl.internal_messages import IgnoreRequest
+from HttpCtrl.http_stub import HttpStubContainer, HttpStubCriteria, HttpStubThrottling
+from HttpCtrl.port_lease import PortLease
+from HttpCtrl.rate_limiter import TokenBucket
+from HttpCtrl.request_history import RequestHistory, RequestHistoryCriteria
+from HttpCtrl.request_storage import RequestCriteria, RequestStorage
+from HttpCtrl.response_selector import SingleResponseSelector, SequenceResponseSelector, WeightedResponseSelector
+from HttpCtrl.response_storage import ResponseStorage
+from HttpCtrl.response import Response
+from HttpCtrl.socket_options import ServerSocketOptions
+from HttpCtrl.stream_body import StreamBody
+from HttpCtrl.synthetic_body import SyntheticBody
+from HttpCtrl.traffic_recorder import TrafficRecorder
+from HttpCtrl.utils.address import get_unix_socket_path
+from HttpCtrl.warm_server_storage import WarmServerStorage
+
+
+class Server:
+    """
+
+    HTTP Server library that provides comprehensive interface to Robot Framework to control HTTP server.
+
+    See other HttpCtrl libraries:
+
+    - HttpCtrl.Client_ - HTTP/HTTP Client API for testing where easy-controlled HTTP/HTTPS client is required.
+
+    - HttpCtrl.Json_ - Json related API for testing where work with Json message is required.
+
+    - HttpCtrl.Logging_ - Logging related API to configure the logging system that is used by HttpCtrl library.
+
+    .. _HttpCtrl.Client: client.html
+    .. _HttpCtrl.Json: json.html
+    .. _HttpCtrl.Logging: logging.html
+
+    Here is an example of receiving POST request. In this example HTTP client sends POST request to HTTP server. HTTP
+    server receives it and checks incoming request for correctness.
+
+    .. code:: robotframework
+
+        *** Settings ***
+
+        Library         String
+        Library         HttpCtrl.Client
+        Library         HttpCtrl.Server
+
+        Test Setup       Initialize HTTP Client And Server
+        Test Teardown    Terminate HTTP Server
+
+        *** Test Cases ***
+
+        Receive And Reply To POST
+            ${request body}=   Set Variable   { "method": "POST" }
+            Send HTTP Request Async   POST   /post   ${request body}
+
+            Wait For Request
+            Reply By   200
+
+            ${method}=   Get Request Method
+            ${url}=      Get Request Url
+            ${body}=     Get Request Body
+            ${body}=     Decode Bytes To String   ${body}   UTF-8
+
+            Should Be Equal   ${method}   POST
+            Should Be Equal   ${url}      /post
+            Should Be Equal   ${body}     ${request body}
+
+        *** Keywords ***
+
+        Initialize HTTP Client And Server
+            Initialize Client   127.0.0.1   8000
+            Start Server        127.0.0.1   8000
+
+        Terminate HTTP Server
+            Stop Server
+
+    In case of requirement to use IPv6 the keyword `Initialize HTTP Client And Server` might be the following:
+
+    .. code:: robotframework
+
+        *** Keywords ***
+
+        Initialize HTTP Client And Server
+            Initialize Client   0000:0000:0000:0000:0000:0000:0000:0001   8000
+            Start Server        0000:0000:0000:0000:0000:0000:0000:0001   8000
+
+    There is an example where server stubs are using. Sever stub is a pre-defined function that is used by the server to
+    reply automatically to a request that satisfies a user specific HTTP criteria.
+
+    .. code:: robotframework
+
+        *** Settings ***
+
+        Library         String
+        Library         HttpCtrl.Client
+        Library         HttpCtrl.Server
+
+        Test Setup       Initialize HTTP Client And Server
+        Test Teardown    Terminate HTTP Server
+
+        *** Test Cases ***
+
+        Set Signle Stub And Send Request
+            # Set server stub to reply automatically to POST /api/v1/post
+            Set Stub Reply   POST   /api/v1/post   200   Post Message
+
+            # Send HTTP request to the server
+            Send HTTP Request   POST   /api/v1/post
+
+            # Check that the client receives pre-defined values by the stub
+            ${status}=     Get Response Status
+            ${body}=       Get Response Body
+            ${body}=       Decode Bytes To String   ${body}   UTF-8
+
+            Should Be Equal   ${status}   ${200}
+            Should Be Equal   ${body}     Post Message
+
+            # Check that the server receives a single request
+            ${count}=      Get Stub Count   POST   /api/v1/post
+            Should Be Equal   ${count}   ${1}
+
+        *** Keywords ***
+
+        Initialize HTTP Client And Server
+            Initialize Client   127.0.0.1   8000
+            Start Server        127.0.0.1   8000
+
+        Terminate HTTP Server
+            Stop Server
+
+    """
+
+    def __init__(self):
+        self.__response_headers = HttpHeaders()
+        self.__request = None
+
+        self.__server = None
+        self.__thread = None
+        self.__warm = False
+        self.__socket_options = ServerSocketOptions()
+
+
+    def __del__(self):
+        # warm server belongs to the whole run, its state is reset by the next start
+        if self.__warm is False:
+            self.stop_server()
+
+
+    def start_server(self, host, port=None, warm=False):
+        """
+
+        Start HTTP server on specific address and port. Server should be closed when it is not required, for example,
+        when test is over. In case of double call of \`Start Server\`, the previous will be stopped and only then the
+        next one HTTP server will be started.
+
+        In warm mode the server is kept running after \`Stop Server\`, only the state of the test is reset (received
+        requests, stubs, reply headers). The next \`Start Server\` in warm mode with the same host and port reuses
+        the listening socket and the serving thread, so restart takes no time. Warm server is stopped by
+        \`Stop Server\` with `force` argument or at the end of the run.
+
+        If port is '0' then a free port is chosen by the operating system, so parallel executors (for example,
+        pabot) never compete for the same port. Returns the port that is used by the server, it can be obtained by
+        \`Get Server Port\` as well.
+
+        If host has form 'unix:<path>' then the server listens to Unix domain socket with the path instead of TCP
+        port (port is not used and `${None}` is returned). It removes overhead of TCP loopback and port contention
+        when the service under test and the server are on the same host. Socket file is removed when the server is
+        stopped.
+
+        `host` [in] (string): Address that will be used by HTTP server to listen or 'unix:<path>' for Unix domain socket.
+
+        `port` [in] (string): Port that will be used by HTTP server to listen, '0' to choose a free port. Optional argument for Unix domain socket.
+
+        `warm` [in] (bool): Keep the server running between tests, by default `${False}`. Optional argument.
+
+        Example how to initialize server:
+
+        +--------------+-----------+------+
+        | Start Server | 127.0.0.1 | 8000 |
+        +--------------+-----------+------+
+
+        .. code:: text
+
+            Start Server   127.0.0.1   8000
+
+        Example how to start server on a free port and send request to it:
+
+        +----------+--------------+-----------+---+
+        | ${port}= | Start Server | 127.0.0.1 | 0 |
+        +----------+--------------+-----------+---+
+
+        .. code:: text
+
+            ${port}=   Start Server   127.0.0.1   0
+            Initialize Client   127.0.0.1   ${port}
+
+        Example how to start server on Unix domain socket and send request to it:
+
+        +--------------+-------------------------+
+        | Start Server | unix:/tmp/httpctrl.sock |
+        +--------------+-------------------------+
+
+        .. code:: text
+
+            Start Server        unix:/tmp/httpctrl.sock
+            Initialize Client   unix:/tmp/httpctrl.sock
+
+        It is a good practice to start server and stop it using 'Test Setup' and 'Test Teardown', for example:
+
+        .. code:: robotframework
+
+            *** Settings ***
+
+            Library         HttpCtrl.Server
+
+            Test Setup       Initialize HTTP Server
+            Test Teardown    Terminate HTTP Server
+
+            *** Test Cases ***
+
+            HTTP Server Based Test
+                Wait For Request
+                Reply By   200
+
+                # Check incoming request
+
+            *** Keywords ***
+
+            Initialize HTTP Server
+                Start Server        127.0.0.1   8000
+
+            Terminate HTTP Server
+                Stop Server
+
+        Example how to keep the server running between tests and stop it at the end of the suite:
+
+        .. code:: robotframework
+
+            *** Settings ***
+
+            Library         HttpCtrl.Server
+
+            Test Setup       Start Server   127.0.0.1   8000   warm=${True}
+            Test Teardown    Stop Server
+            Suite Teardown   Stop Server   force=${True}
+
+        """
+
+        return self.__start(host, port, None, None, warm)
+
+
+    def __start(self, host, port, ssl_context, tls_files, warm):
+        self.stop_server()
+
+        try:
+            unix_path = get_unix_socket_path(host)
+        except ValueError as exception:
+            raise AssertionError("Impossible to start HTTP server '%s' (reason: '%s')." % (host, str(exception)))
+
+        if unix_path is not None:
+            port = 0
+        elif port is None:
+            raise AssertionError("Impossible to start HTTP server '%s' (reason: 'port is not specified')." % host)
+
+        key = (host, int(port), tls_files, self.__socket_options.get_key())
+        if warm is True:
+            warm_server = WarmServerStorage().get(key)
+            if warm_server is not None:
+                self.__server, self.__thread = warm_server
+                self.__warm = True
+                self.__reset_state()
+
+                logger.info("Warm HTTP server '%s:%s' is reused." % (host, self.__server.get_port()))
+                return self.__server.get_port()
+
+        # warm server of the previous tests may listen to the same port
+        self.__stop_warm_server()
+
+        # the server module pulls 'http.server' and 'socketserver', it is loaded only when a server is really needed
+        from HttpCtrl.http_server import HttpServer
+
+        logger.info("Prepare HTTP server '%s:%s' and thread to serve it." % (host, port))
+
+        server = HttpServer(host, int(port), ssl_context, self.__socket_options)
+        thread = threading.Thread(target=server.start, args=())
+        thread.daemon = warm
+        thread.start()
+
+        # In case of start-stop, stop may be finished before server start and ir will be impossible to join thread.
+        try:
+            server.wait_run_state()
+        except Exception as exception:
+            thread.join()
+            raise AssertionError("Impossible to start HTTP server '%s:%s' (reason: '%s')." %
+                                 (host, port, str(exception)))
+
+        self.__server = server
+        self.__thread = thread
+        self.__warm = warm
+        if warm is True:
+            WarmServerStorage().set(key, self.__server, self.__thread)
+
+        return self.__server.get_port()
+
+
+    def __stop_warm_server(self):
+        warm_server = WarmServerStorage().pop()
+        if warm_server is not None:
+            server, thread = warm_server
+            server.stop()
+            thread.join()
+
+            self.__reset_state()
+            logger.info("Warm HTTP server is stopped.")
+
+
+    def __reset_state(self):
+        self.__response_headers = HttpHeaders()
+        self.__request = None
+
+        # handler that is waiting for reply of the previous test is released
+        ResponseStorage().interrupt()
+
+        ResponseStorage().clear()
+        RequestStorage().clear()
+        HttpStubContainer().clear()
+        RequestHistory().clear()
+
+
+    def start_https_server(self, host, port=None, certificate=None, key=None, password=None, warm=False):
+        """
+
+        Start HTTPS server on specific address and port. The server works in the same way as HTTP server that is
+        started by \`Start Server\` and it is stopped by \`Stop Server\`. SSL context is created once for the
+        server, TLS session tickets and session cache are enabled, so clients resume their sessions on the next
+        connections. TLS handshakes are performed by separate threads and do not block the server for other clients.
+        Returns the port that is used by the server (port '0' is supported as well as by \`Start Server\`).
+
+        If certificate is not specified then it is issued for the host by a local certificate authority that is
+        created once per process. CA certificate can be obtained by \`Get Server CA Certificate\` to configure
+        clients. Certificate generation requires package `cryptography` (see `pip install robotframework-httpctrl[tls]`).
+
+        `host` [in] (string): Address that will be used by HTTPS server to listen.
+
+        `port` [in] (string): Port that will be used by HTTPS server to listen.
+
+        `certificate` [in] (string): Path to the file with server certificate chain in PEM format (the file may contain private key as well). Optional argument.
+
+        `key` [in] (string): Path to the file with private key. Optional argument.
+
+        `password` [in] (string): Password to decrypt the private key. Optional argument.
+
+        `warm` [in] (bool): Keep the server running between tests (see \`Start Server\`), by default `${False}`. Optional argument.
+
+        Example how to start HTTPS server with generated certificate and send request to it:
+
+        +--------------------+-----------+------+
+        | Start HTTPS Server | 127.0.0.1 | 8443 |
+        +--------------------+-----------+------+
+
+        .. code:: text
+
+            Start HTTPS Server     127.0.0.1   8443
+            ${ca certificate}=     Get Server CA Certificate
+
+            Initialize Client      127.0.0.1   8443
+            Set Client CA Bundle   ${ca certificate}
+            Send HTTPS Request Async   GET   /api/v1/get
+
+        Example how to start HTTPS server with specific certificate:
+
+        +--------------------+-----------+------+------------+------------+
+        | Start HTTPS Server | 127.0.0.1 | 8443 | server.pem | server.key |
+        +--------------------+-----------+------+------------+------------+
+
+        .. code:: text
+
+            Start HTTPS Server   127.0.0.1   8443   ${CURDIR}/server.pem   ${CURDIR}/server.key
+
+        """
+        from HttpCtrl.tls_certificate import LocalCertificateAuthority, create_server_context
+
+        try:
+            if get_unix_socket_path(host) is not None:
+                raise ValueError("Unix domain socket is supported by HTTP server only")
+
+            if certificate is None:
+                certificate, key = LocalCertificateAuthority().issue(host)
+
+            ssl_context = create_server_context(certificate, key, password)
+        except Exception as exception:
+            raise AssertionError("Impossible to start HTTPS server (reason: '%s')." % str(exception))
+
+        return self.__start(host, port, ssl_context, (certificate, key), warm)
+
+
+    def get_server_ca_certificate(self):
+        """
+
+        Returns path to the certificate (PEM format) of the local certificate authority that issues certificates for
+        \`Start HTTPS Server\`. The path can be used by \`Set Client CA Bundle\` or by a service under test to
+        trust to the server.
+
+        +---------------------+---------------------------+
+        | ${ca certificate}=  | Get Server CA Certificate |
+        +---------------------+---------------------------+
+
+        .. code:: text
+
+            ${ca certificate}=   Get Server CA Certificate
+
+        """
+        from HttpCtrl.tls_certificate import LocalCertificateAuthority
+
+        ca_certificate_file = LocalCertificateAuthority().get_ca_certificate_file()
+        if ca_certificate_file is None:
+            raise AssertionError("Impossible to get server CA certificate (reason: 'HTTPS server with generated "
+                                 "certificate has not been started').")
+
+        return ca_certificate_file
+
+
+    def get_server_port(self):
+        """
+
+        Returns port that is used by the started server. It is useful when the server is started on port '0' and
+        the port is chosen by the operating system.
+
+        +-----------+-----------------+
+        | ${port}=  | Get Server Port |
+        +-----------+-----------------+
+
+        .. code:: text
+
+            ${port}=   Get Server Port
+
+        """
+        if self.__server is None:
+            raise AssertionError("Impossible to get server port (reason: 'server is not started').")
+
+        return self.__server.get_port()
+
+
+    def set_server_socket_options(self, backlog=None, nodelay=None, rcvbuf=None, sndbuf=None, defer_accept=None):
+        """
+
+        Sets options of the listening socket for the servers that are started by the next \`Start Server\` or
+        \`Start HTTPS Server\` calls. Options that are not specified keep default values of the operating system,
+        except backlog that is `SOMAXCONN` by default. The server accepts all pending connections on each wake-up,
+        therefore bursts of simultaneous connections (for example, from a service that is starting) are queued
+        instead of being refused.
+
+        `backlog` [in] (int): Maximum length of the queue of connections that are not accepted yet. Optional argument.
+
+        `nodelay` [in] (bool): Disable Nagle's algorithm (TCP_NODELAY) for accepted connections. Optional argument.
+
+        `rcvbuf` [in] (int): Size of socket receive buffer in bytes (SO_RCVBUF). Optional argument.
+
+        `sndbuf` [in] (int): Size of socket send buffer in bytes (SO_SNDBUF). Optional argument.
+
+        `defer_accept` [in] (int): Seconds to wait for request data before connection is accepted (TCP_DEFER_ACCEPT, Linux only), so idle connections do not occupy the server. Optional argument.
+
+        Example how to prepare server for thousands of simultaneous connections:
+
+        +---------------------------+--------------+-----------------+
+        | Set Server Socket Options | backlog=4096 | nodelay=${True} |
+        +---------------------------+--------------+-----------------+
+
+        .. code:: text
+
+            Set Server Socket Options   backlog=4096   nodelay=${True}   defer_accept=1
+            Start Server                127.0.0.1   8000
+
+        """
+        try:
+            self.__socket_options = ServerSocketOptions(backlog, nodelay, rcvbuf, sndbuf, defer_accept)
+        except ValueError as exception:
+            raise AssertionError("Impossible to set server socket options (reason: '%s')." % str(exception))
+
+        logger.info("Server socket options are set (%s)." % self.__socket_options)
+
+
+    def get_server_socket_option(self, name):
+        """
+
+        Returns value of the option of the listening socket of the started server that is really used by the operating
+        system. The value might differ from the requested one, for example, Linux doubles sizes of socket buffers.
+
+        `name` [in] (string): Name of the option: 'rcvbuf', 'sndbuf' or 'defer_accept'.
+
+        +------------+---------------------------+--------+
+        | ${rcvbuf}= | Get Server Socket Option  | rcvbuf |
+        +------------+---------------------------+--------+
+
+        .. code:: text
+
+            ${rcvbuf}=   Get Server Socket Option   rcvbuf
+
+        """
+        if self.__server is None:
+            raise AssertionError("Impossible to get server socket option (reason: 'server is not started').")
+
+        try:
+            return self.__server.get_socket_option(name)
+        except ValueError as exception:
+            raise AssertionError("Impossible to get server socket option (reason: '%s')." % str(exception))
+
+
+    def lease_server_port(self, host='127.0.0.1', first_port=20000, last_port=29999):
+        """
+
+        Leases a free port from the range for the current process and returns it. The lease is a file in a directory that is shared
+        by all processes on the host, it is created atomically, so the port is never leased by two processes (for
+        example, by pabot executors) even if they are started at the same time. It is useful when the port should be
+        known before the server is started, for example, to configure a service under test. Leases of dead processes
+        are reclaimed automatically, leases of the current process are released at the end of the run.
+
+        The lease directory is '<temp>/httpctrl-ports', it can be changed by environment variable
+        `HTTPCTRL_PORT_LEASE_DIR`.
+
+        `host` [in] (string): Address where the port should be free, by default '127.0.0.1'. Optional argument.
+
+        `first_port` [in] (int): The first port of the range, by default '20000'. Optional argument.
+
+        `last_port` [in] (int): The last port of the range, by default '29999'. Optional argument.
+
+        +----------+-------------------+
+        | ${port}= | Lease Server Port |
+        +----------+-------------------+
+
+        .. code:: text
+
+            ${port}=   Lease Server Port
+            Start Server   127.0.0.1   ${port}
+
+        """
+        try:
+            port = PortLease().acquire(host, int(first_port), int(last_port))
+        except Exception as exception:
+            raise AssertionError("Impossible to lease server port (reason: '%s')." % str(exception))
+
+        logger.info("Port '%d' is leased (lease directory: '%s')." % (port, PortLease().get_directory()))
+        return port
+
+
+    def release_server_port(self, port):
+        """
+
+        Releases port that is leased by \`Lease Server Port\`, so it can be leased by other processes.
+
+        `port` [in] (int): Leased port.
+
+        +---------------------+---------+
+        | Release Server Port | ${port} |
+        +---------------------+---------+
+
+        .. code:: text
+
+            Release Server Port   ${port}
+
+        """
+        if PortLease().release(int(port)) is False:
+            raise AssertionError("Impossible to release server port '%s' (reason: 'port is not leased by the "
+                                 "process')." % port)
+
+
+    def stop_server(self, force=False):
+        """
+
+        Stop HTTP server if it has been started. This function should be called if server has been started.
+
+        Server that is started in warm mode is not stopped, only the state of the test is reset (received requests,
+        stubs, reply headers), unless `force` is specified.
+
+        `force` [in] (bool): Stop server even if it is started in warm mode, by default `${False}`. Optional argument.
+
+        Example how to stop server:
+
+        +-------------+
+        | Stop Server |
+        +-------------+
+
+        .. code:: text
+
+            Stop Server
+
+        It is a good practice to start server and stop it using `Test Setup` and `Test Teardown` - see example for
+        \`Start Server\`.
+
+        Example how to stop server that is started in warm mode:
+
+        .. code:: text
+
+            Stop Server   force=${True}
+
+        """
+        if self.__server is None:
+            if force is True:
+                self.__stop_warm_server()
+            return
+
+        if (self.__warm is True) and (force is False):
+            self.__reset_state()
+
+            self.__server = None
+            self.__thread = None
+            self.__warm = False
+
+            logger.info("HTTP server state is reset (server is kept running in warm mode).")
+            return
+
+        self.__server.stop()
+        self.__thread.join()
+
+        if self.__warm is True:
+            WarmServerStorage().pop()
+
+        self.__reset_state()
+
+        self.__server = None
+        self.__thread = None
+        self.__warm = False
+
+        logger.info("HTTP server is stopped.")
+
+
+    def wait_for_request(self, timeout=5):
+        """
+
+        Command to server to wait incoming request. This call is blocked until HTTP request arrives. Basically server
+        receives all requests after \`Start Server\` and places them to internal queue. When test call function
+        \`Wait For Request\` it checks the queue and if it is not empty returns the first request in the queue. If the
+        queue is empty then function waits when the server receives request and place it to the queue. There is
+        default time period '5 seconds' to wait request and this waiting time can be changed. If during wait time the
+        request is not received then timeout error occurs.
+
+        `timeout` [in] (int): Period of time in seconds when a request should be received by HTTP server.
+
+        Example how to wait request.
+
+        +------------------+
+        | Wait For Request |
+        +------------------+
+
+        .. code:: text
+
+            Wait For Request
+
+        Example how to wait request during 2 seconds.
+
+        +------------------+---+
+        | Wait For Request | 2 |
+        +------------------+---+
+
+        .. code:: text
+
+            Wait For Request   2
+
+        """
+        self.__request = RequestStorage().pop(int(timeout))
+        if self.__request is None:
+            raise AssertionError("Timeout: request was not received.")
+
+        logger.info("Request is received: %s" % self.__request)
+
+
+    def wait_for_request_matching(self, method=None, path=None, header=None, value=None, timeout=5):
+        """
+
+        Command to server to wait incoming request that satisfies all specified criteria. This call is blocked until
+        such request arrives. Request that arrives while the test is waiting is passed to it directly. Requests that
+        do not satisfy the criteria are kept in the internal queue in order of arrival for the next
+        \`Wait For Request\` or \`Wait For Request Matching\` calls and wait there for reply, so the server
+        continues to receive requests meanwhile. Queued request waits for reply during 5 seconds after its arrival,
+        then its connection is closed and it is removed from the queue. The queue keeps up to 128 requests, when it
+        is full the oldest request is dropped. If the request is not received during `timeout` seconds then timeout
+        error occurs.
+
+        `method` [in] (string): Request method. Optional argument.
+
+        `path` [in] (string): Path of the request URL without query, glob pattern is supported, for example, '/orders/*'. Optional argument.
+
+        `header` [in] (string): Name of a header that request should contain (case-insensitive). Optional argument.
+
+        `value` [in] (string): Value of the header specified by `header`. Optional argument.
+
+        `timeout` [in] (int): Period of time in seconds when a request should be received by HTTP server. Optional argument.
+
+        Example how to wait for `POST` request to `/orders` while other requests are received:
+
+        +---------------------------+------+---------+
+        | Wait For Request Matching | POST | /orders |
+        +---------------------------+------+---------+
+
+        .. code:: text
+
+            Wait For Request Matching   POST   /orders
+            Reply By   201
+
+            Wait For Request
+            Reply By   200
+
+        Example how to wait for request with a specific header to any order during 10 seconds:
+
+        .. code:: text
+
+            Wait For Request Matching   path=/orders/*   header=X-Source   value=checkout   timeout=10
+
+        """
+        criteria = RequestCriteria(method, path, header, value)
+        self.__request = RequestStorage().pop(float(timeout), criteria)
+        if self.__request is None:
+            raise AssertionError("Timeout: request that satisfies criteria (%s) was not received." % criteria)
+
+        logger.info("Request is received: %s" % self.__request)
+
+
+    def wait_for_no_request(self, timeout=5.0):
+        """
+
+        Command to server to wait for no incoming request during specific time. This call is blocked until HTTP request
+        arrives or timeout. Basically server receives all requests after \`Start Server\` and places them to internal
+        queue. When test call function \`Wait For No Request\` it checks the queue and if it is not empty returns throws
+        exception. Otherwise it waits for request during 'timeout' seconds. If during this time request is received then
+        exception is thrown.
+
+        `timeout` [in] (int): Period of time in seconds when requests should not be received by HTTP server.
+
+        Example how to wait for lack of requests.
+
+        +---------------------+
+        | Wait For No Request |
+        +---------------------+
+
+        .. code:: text
+
+            Wait For No Request
+
+        Example how to wait for lack of requests during 10 seconds.
+
+        +---------------------+----+
+        | Wait For No Request | 10 |
+        +---------------------+----+
+
+        .. code:: text
+
+            Wait For No Request   10
+
+        """
+        self.__request = RequestStorage().pop(int(timeout))
+        if self.__request is not None:
+            raise AssertionError("Request was received: %s." % self.__request)
+
+        logger.info("Request is not received.")
+
+
+    def wait_and_ignore_request(self):
+        """
+
+        Command to server to wait incoming request and ignore it by closing connection. This call is blocked until HTTP
+        request arrives. Basically server receives all requests after \`Start Server\` and places them to internal
+        queue. When test call function \`Wait And Ignore Request\` it checks the queue and if it is not empty returns
+        the first request in the queue is ignore and connection is closed. If the queue is empty then function waits
+        when the server receives request and place it to the queue.
+
+        Example how to wait and ignore request.
+
+        +-------------------------+
+        | Wait And Ignore Request |
+        +-------------------------+
+
+        .. code:: text
+
+            Wait And Ignore Request
+
+        """
+        self.wait_for_request()
+        ResponseStorage().push(self.__request, IgnoreRequest())
+        logger.info("Request is ignored by closing connection.")
+
+
+    def set_stub_reply(self, method, url, status, body=None):
+        """
+        
+        Sets stub reply for HTTP(S) server. This function sets a server stub to reply automatically by a specific 
+        response to a specific request. When the stub is used to reply, then corresponding statistic is incremented
+        (see \`Get Stub Count\`).
+
+        `method` [in] (string): Request method that is used to handle by server stub (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource that is used by server stub, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        `status` [in] (int|string): HTTP status code for response that is used by server stub.
+
+        `body` [in] (string|bytes): Response body that is used by server stub.
+
+        Example how to set stub to reply automatically to request `POST` `/api/v1/request` by status `200`.
+
+        +----------------+------+-----------------+-----+
+        | Set Stub Reply | POST | /api/v1/request | 200 |
+        +----------------+------+-----------------+-----+
+
+        .. code:: text
+        
+            Set Stub Reply   POST   /api/v1/request   200
+        
+        Example how to set stub to reply automatically using a specific body.
+
+        +----------------+------+-----------------+-----+--------------------------+
+        | Set Stub Reply | POST | /api/v1/request | 202 | Request has been handled |
+        +----------------+------+-----------------+-----+--------------------------+
+
+        .. code:: text
+
+            Set Stub Reply   POST   /api/v1/request   200   Request has been handled
+
+        """
+        if self.__server is None:
+            message_error = "Impossible to set server stub reply (reason: 'server is not created')."
+            raise AssertionError(message_error)
+        
+        criteria = HttpStubCriteria(method=method, url=url)
+        response = Response(int(status), None, body, None, None)
+        HttpStubContainer().add(criteria, SingleResponseSelector(response))
+
+
+    def set_stub_stream_reply(self, method, url, status, body, chunk_size=65536):
+        """
+
+        Sets stub reply for HTTP(S) server that streams the body: the body is produced chunk by chunk while it is
+        sent, each chunk is flushed to the client immediately using chunked transfer encoding (HTTP/1.0 clients
+        receive the body until the connection is closed). Memory consumption does not depend on the body size,
+        therefore the stub is able to simulate large or endless streams like NDJSON feeds, server-sent events or
+        long-poll responses.
+
+        The body is a callable object that returns a new iterable (for example, generator) or file-like object for
+        each request. Seekable file-like object can be used directly, it is rewound before each reply. Chunks may
+        be strings (encoded by UTF-8) or bytes.
+
+        `method` [in] (string): Request method that is used to handle by server stub (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource that is used by server stub, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        `status` [in] (int|string): HTTP status code for response that is used by server stub.
+
+        `body` [in] (callable|file): Source of the body that is used by server stub.
+
+        `chunk_size` [in] (int): Size of chunks that are read from file-like object, by default '65536'. Optional argument.
+
+        Example how to set stub that streams NDJSON feed with 1000 records:
+
+        .. code:: text
+
+            ${feed}=   Evaluate   lambda: ('{"id": %d}\\\\n' % index for index in range(1000))
+            Set Stub Stream Reply   GET   /api/v1/feed   200   ${feed}
+
+        Example how to set stub that streams a big file:
+
+        .. code:: text
+
+            ${file}=   Evaluate   open(r'${CURDIR}/big.bin', 'rb')
+            Set Stub Stream Reply   GET   /api/v1/file   200   ${file}
+
+        """
+        if self.__server is None:
+            raise AssertionError("Impossible to set server stub stream reply (reason: 'server is not created').")
+
+        criteria = HttpStubCriteria(method=method, url=url)
+        response = Response(int(status), None, self.__create_stream_body(body, chunk_size), None, None)
+        HttpStubContainer().add(criteria, SingleResponseSelector(response))
+
+
+    @staticmethod
+    def __create_stream_body(body, chunk_size):
+        try:
+            return StreamBody(body, int(chunk_size))
+        except TypeError as exception:
+            raise AssertionError("Impossible to create stream body (reason: '%s')." % str(exception))
+
+
+    def set_stub_synthetic_reply(self, method, url, status, size, pattern=None, seed=None):
+        """
+
+        Sets stub reply for HTTP(S) server that replies by a synthetic body of the specified size. The body consists
+        of a repeating pattern or of pseudo-random data that is defined by a seed, it is generated while it is sent
+        from a small buffer, so multi-gigabyte responses take trivial memory. The content is deterministic, its
+        digest can be obtained by \`Get Synthetic Body Digest\` to check the body on the client side (see
+        \`Enable Response Body Digest\` in HttpCtrl.Client_).
+
+        `method` [in] (string): Request method that is used to handle by server stub (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource that is used by server stub, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        `status` [in] (int|string): HTTP status code for response that is used by server stub.
+
+        `size` [in] (int|string): Size of the body in bytes, binary suffixes 'K', 'M', 'G', 'T' are supported, for example, '4G'.
+
+        `pattern` [in] (string|bytes): Pattern that is repeated in the body, by default 'x'. Optional argument.
+
+        `seed` [in] (int|string): Seed of pseudo-random data, it cannot be used with pattern. Optional argument.
+
+        Example how to set stub that replies by 4 GByte body with pseudo-random data:
+
+        +--------------------------+-----+-----------------+-----+----+---------+
+        | Set Stub Synthetic Reply | GET | /api/v1/archive | 200 | 4G | seed=42 |
+        +--------------------------+-----+-----------------+-----+----+---------+
+
+        .. code:: text
+
+            Set Stub Synthetic Reply   GET   /api/v1/archive   200   4G   seed=42
+
+        """
+        if self.__server is None:
+            raise AssertionError("Impossible to set server stub synthetic reply (reason: 'server is not created').")
+
+        criteria = HttpStubCriteria(method=method, url=url)
+        response = Response(int(status), None, self.__create_synthetic_body(size, pattern, seed), None, None)
+        HttpStubContainer().add(criteria, SingleResponseSelector(response))
+
+
+    def get_synthetic_body_digest(self, size, pattern=None, seed=None, algorithm='sha256'):
+        """
+
+        Returns hex digest of the synthetic body that is defined by the size, pattern and seed (see
+        \`Set Stub Synthetic Reply\`). The digest is calculated without keeping the body in memory.
+
+        `size` [in] (int|string): Size of the body in bytes, binary suffixes 'K', 'M', 'G', 'T' are supported.
+
+        `pattern` [in] (string|bytes): Pattern that is repeated in the body, by default 'x'. Optional argument.
+
+        `seed` [in] (int|string): Seed of pseudo-random data. Optional argument.
+
+        `algorithm` [in] (string): Hash algorithm (any algorithm that is supported by 'hashlib'), by default 'sha256'. Optional argument.
+
+        Example how to check the body that is received by client:
+
+        .. code:: text
+
+            Set Stub Synthetic Reply     GET   /api/v1/archive   200   1G   seed=42
+            ${expected digest}=   Get Synthetic Body Digest   1G   seed=42
+
+            Enable Response Body Digest   keep_body=${False}
+            Send HTTP Request   GET   /api/v1/archive
+            ${digest}=   Get Response Body Digest
+            Should Be Equal   ${digest}   ${expected digest}
+
+        """
+        body = self.__create_synthetic_body(size, pattern, seed)
+
+        try:
+            return body.get_digest(algorithm)
+        except ValueError as exception:
+            raise AssertionError("Impossible to get synthetic body digest (reason: '%s')." % str(exception))
+
+
+    @staticmethod
+    def __create_synthetic_body(size, pattern, seed):
+        try:
+            return SyntheticBody(SyntheticBody.parse_size(size), pattern, seed)
+        except ValueError as exception:
+            raise AssertionError("Impossible to create synthetic body (reason: '%s')." % str(exception))
+
+
+    def set_stub_sequence_reply(self, method, url, statuses, bodies=None, policy='cycle'):
+        """
+
+        Sets stub reply for HTTP(S) server that replies by the specified sequence of responses: the first request is
+        replied by the first response, the second request - by the second response, etc. When the sequence is over,
+        the stub follows the policy: `cycle` - start the sequence from the beginning, `last` - reply by the last
+        response of the sequence.
+
+        `method` [in] (string): Request method that is used to handle by server stub (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource that is used by server stub, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        `statuses` [in] (list): HTTP status codes for responses that are used by server stub.
+
+        `bodies` [in] (list): Response bodies that correspond to the statuses. Optional argument.
+
+        `policy` [in] (string): Policy that is used when the sequence is over - `cycle` (by default) or `last`.
+
+        Example how to set stub that replies by `503` twice and then always by `200`.
+
+        +-------------------------+-----+-------------+-------------+---------+------+
+        | Set Stub Sequence Reply | GET | /api/v1/get | ${statuses} | ${None} | last |
+        +-------------------------+-----+-------------+-------------+---------+------+
+
+        .. code:: text
+
+            ${statuses}=   Create List   503   503   200
+            Set Stub Sequence Reply   GET   /api/v1/get   ${statuses}   policy=last
+
+        Example how to set stub that replies by different bodies in turn.
+
+        .. code:: text
+
+            ${statuses}=   Create List   200     200
+            ${bodies}=     Create List   Ping    Pong
+            Set Stub Sequence Reply   GET   /api/v1/get   ${statuses}   ${bodies}
+
+        """
+        if self.__server is None:
+            message_error = "Impossible to set server stub reply (reason: 'server is not created')."
+            raise AssertionError(message_error)
+
+        responses = self.__create_stub_responses(statuses, bodies)
+
+        try:
+            selector = SequenceResponseSelector(responses, policy)
+        except ValueError as exception:
+            raise AssertionError("Impossible to set server stub reply (reason: '%s')." % str(exception))
+
+        HttpStubContainer().add(HttpStubCriteria(method=method, url=url), selector)
+
+
+    def set_stub_weighted_reply(self, method, url, statuses, weights, bodies=None, seed=None):
+        """
+
+        Sets stub reply for HTTP(S) server that replies by randomly chosen response in line with the specified weights.
+        For example, weights `99` and `1` for statuses `200` and `503` mean that 1% of requests are replied by `503`.
+        It takes constant time to choose a response regardless of amount of responses.
+
+        `method` [in] (string): Request method that is used to handle by server stub (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource that is used by server stub, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        `statuses` [in] (list): HTTP status codes for responses that are used by server stub.
+
+        `weights` [in] (list): Non-negative weights that correspond to the statuses.
+
+        `bodies` [in] (list): Response bodies that correspond to the statuses. Optional argument.
+
+        `seed` [in] (int|string): Seed for the random generator to make the sequence of responses reproducible. Optional argument.
+
+        Example how to set stub that simulates flaky upstream where 1% of requests fail.
+
+        +-------------------------+-----+-------------+-------------+------------+
+        | Set Stub Weighted Reply | GET | /api/v1/get | ${statuses} | ${weights} |
+        +-------------------------+-----+-------------+-------------+------------+
+
+        .. code:: text
+
+            ${statuses}=   Create List   200   503
+            ${weights}=    Create List   99    1
+            Set Stub Weighted Reply   GET   /api/v1/get   ${statuses}   ${weights}   seed=42
+
+        """
+        if self.__server is None:
+            message_error = "Impossible to set server stub reply (reason: 'server is not created')."
+            raise AssertionError(message_error)
+
+        responses = self.__create_stub_responses(statuses, bodies)
+
+        try:
+            weights = [float(weight) for weight in weights]
+            selector = WeightedResponseSelector(responses, weights, seed)
+        except ValueError as exception:
+            raise AssertionError("Impossible to set server stub reply (reason: '%s')." % str(exception))
+
+        HttpStubContainer().add(HttpStubCriteria(method=method, url=url), selector)
+
+
+    def __create_stub_responses(self, statuses, bodies):
+        if bodies is None:
+            bodies = [None] * len(statuses)
+
+        if len(bodies) != len(statuses):
+            message_error = "Impossible to set server stub reply (reason: 'amount of bodies '%d' is not equal to " \
+                            "amount of statuses '%d')." % (len(bodies), len(statuses))
+            raise AssertionError(message_error)
+
+        return [Response(int(status), None, body, None, None) for status, body in zip(statuses, bodies)]
+
+
+    def get_stub_count(self, method, url):
+        """
+        
+        Returns server stub statistic that defines how many time the stub was used by server to reply.
+        
+        `method` [in] (string): Request method that is used to handle by server stub (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource that is used by server stub, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        Example how to get server stub statistic for request with `POST` method and URL `/api/v2/request`.
+
+        +----------------+------+-----------------+
+        | Get Stub Count | POST | /api/v2/request |
+        +----------------+------+-----------------+
+
+        .. code:: text
+
+            Get Stub Count   POST   /api/v2/request
+
+        Example how to get server stub statistic for request with `GET` method and URL `/get`
+
+        +----------------+------+-----+
+        | Get Stub Count | GET | /get |
+        +----------------+------+-----+
+
+        .. code:: text
+
+            Get Stub Count   GET   /get
+
+        """
+        if self.__server is None:
+            message_error = "Impossible to get server stub statistic (reason: 'server is not created')."
+            raise AssertionError(message_error)
+
+        criteria = HttpStubCriteria(method=method, url=url)
+        return HttpStubContainer().count(criteria)
+
+
+    def set_stub_rate_limit(self, method, url, rate, burst=1, status=429, body=None):
+        """
+
+        Sets rate limit for the server stub that has been set by \`Set Stub Reply\`. The limit is enforced by a token
+        bucket: the stub replies to `rate` requests per second on average and allows bursts up to `burst` requests.
+        Requests over the limit are replied by throttling response with header `Retry-After` that contains amount of
+        seconds after that the next request is going to be allowed (see \`Get Stub Rejected Count\`).
+
+        `method` [in] (string): Request method that is used to handle by server stub (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource that is used by server stub, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        `rate` [in] (float|string): Amount of requests per second that are allowed by the stub.
+
+        `burst` [in] (int|string): Amount of requests that are allowed in a burst (by default is `1`).
+
+        `status` [in] (int|string): HTTP status code for throttling response (by default is `429`).
+
+        `body` [in] (string|bytes): Body for throttling response. Optional argument.
+
+        Example how to allow 10 requests per second with bursts up to 20 requests for stub `GET` `/api/v1/get`.
+
+        +---------------------+-----+-------------+----+----+
+        | Set Stub Rate Limit | GET | /api/v1/get | 10 | 20 |
+        +---------------------+-----+-------------+----+----+
+
+        .. code:: text
+
+            Set Stub Reply        GET   /api/v1/get   200   Get Message
+            Set Stub Rate Limit   GET   /api/v1/get   10    20
+
+        Example how to reply by `503` with a specific body when the rate limit is exceeded.
+
+        +---------------------+-----+-------------+---+---+-----+---------------+
+        | Set Stub Rate Limit | GET | /api/v1/get | 1 | 1 | 503 | Try it later. |
+        +---------------------+-----+-------------+---+---+-----+---------------+
+
+        .. code:: text
+
+            Set Stub Rate Limit   GET   /api/v1/get   1   1   503   Try it later.
+
+        """
+        if self.__server is None:
+            message_error = "Impossible to set server stub rate limit (reason: 'server is not created')."
+            raise AssertionError(message_error)
+
+        try:
+            limiter = TokenBucket(float(rate), int(burst))
+        except ValueError as exception:
+            raise AssertionError("Impossible to set server stub rate limit (reason: '%s')." % str(exception))
+
+        criteria = HttpStubCriteria(method=method, url=url)
+        throttling = HttpStubThrottling(limiter, int(status), body)
+
+        if HttpStubContainer().set_throttling(criteria, throttling) is False:
+            message_error = "Impossible to set server stub rate limit (reason: 'stub '%s %s' does not exist')." % (method, url)
+            raise AssertionError(message_error)
+
+
+    def set_stub_compression(self, method, url, encodings=None):
+        """
+
+        Enables compression of responses of the server stub that has been set by \`Set Stub Reply\`, \`Set Stub
+        Sequence Reply\` or \`Set Stub Weighted Reply\`. Bodies are compressed once when the keyword is called and
+        the encoded variant is chosen for each request in line with its `Accept-Encoding` header. The stub replies
+        with headers `Content-Encoding` and `Vary`, the body is sent as is if the client does not accept any of the
+        encodings. The stub replies by 406 (Not Acceptable) if the client excludes the body without encoding as well
+        by `identity;q=0` or `*;q=0` in `Accept-Encoding` header. Encodings `gzip` and `deflate` are always supported, `br` and `zstd` are supported if packages
+        `brotli` and `zstandard` are installed (see `pip install robotframework-httpctrl[compression]`).
+
+        `method` [in] (string): Request method that is used to handle by server stub (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource that is used by server stub, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        `encodings` [in] (string): Comma-separated encodings in order of server preference, by default all supported encodings are used. Optional argument.
+
+        Example how to serve gzip-compressed body by the stub:
+
+        +----------------------+-----+-------------+------+
+        | Set Stub Compression | GET | /api/v1/get | gzip |
+        +----------------------+-----+-------------+------+
+
+        .. code:: text
+
+            Set Stub Reply         GET   /api/v1/get   200   ${large body}
+            Set Stub Compression   GET   /api/v1/get   gzip
+
+        Example how to serve body using all supported encodings:
+
+        .. code:: text
+
+            Set Stub Compression   GET   /api/v1/get
+
+        """
+        if self.__server is None:
+            message_error = "Impossible to set server stub compression (reason: 'server is not created')."
+            raise AssertionError(message_error)
+
+        if encodings is None:
+            encodings = get_supported_encodings()
+        else:
+            encodings = [encoding.strip().lower() for encoding in encodings.split(',') if encoding.strip()]
+
+        for encoding in encodings:
+            if not is_supported(encoding):
+                message_error = "Impossible to set server stub compression (reason: 'encoding '%s' is not supported')." % encoding
+                raise AssertionError(message_error)
+
+        criteria = HttpStubCriteria(method=method, url=url)
+        if HttpStubContainer().set_compression(criteria, encodings) is False:
+            message_error = "Impossible to set server stub compression (reason: 'stub '%s %s' does not exist')." % (method, url)
+            raise AssertionError(message_error)
+
+
+    def get_stub_allowed_count(self, method, url):
+        """
+
+        Returns amount of requests that were allowed by server stub rate limit and replied by the stub response (see
+        \`Set Stub Rate Limit\`). It is equal to \`Get Stub Count\` if the rate limit is not set.
+
+        `method` [in] (string): Request method that is used to handle by server stub (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource that is used by server stub, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        Example how to get amount of allowed requests for the stub with `GET` method and URL `/api/v1/get`.
+
+        +------------------------+-----+-------------+
+        | Get Stub Allowed Count | GET | /api/v1/get |
+        +------------------------+-----+-------------+
+
+        .. code:: text
+
+            ${allowed}=   Get Stub Allowed Count   GET   /api/v1/get
+
+        """
+        if self.__server is None:
+            message_error = "Impossible to get server stub statistic (reason: 'server is not created')."
+            raise AssertionError(message_error)
+
+        criteria = HttpStubCriteria(method=method, url=url)
+        return HttpStubContainer().count(criteria) - HttpStubContainer().rejected(criteria)
+
+
+    def get_stub_rejected_count(self, method, url):
+        """
+
+        Returns amount of requests that were rejected by server stub rate limit and replied by throttling response (see
+        \`Set Stub Rate Limit\`).
+
+        `method` [in] (string): Request method that is used to handle by server stub (GET, POST, DELETE, etc., see: RFC 7231, RFC 5789).
+
+        `url` [in] (string): Path to the resource that is used by server stub, for example, in case address www.httpbin.org/ip - '/ip' is an path.
+
+        Example how to get amount of rejected requests for the stub with `GET` method and URL `/api/v1/get`.
+
+        +-------------------------+-----+-------------+
+        | Get Stub Rejected Count | GET | /api/v1/get |
+        +-------------------------+-----+-------------+
+
+        .. code:: text
+
+            ${rejected}=   Get Stub Rejected Count   GET   /api/v1/get
+
+        """
+        if self.__server is None:
+            message_error = "Impossible to get server stub statistic (reason: 'server is not created')."
+            raise AssertionError(message_error)
+
+        criteria = HttpStubCriteria(method=method, url=url)
+        return HttpStubContainer().rejected(criteria)
+
+
+    def get_request_source_address(self):
+        """
+
+        Returns source address (client address) of received request as string value. This function should be called
+        after \`Wait For Request\`, otherwise None is returned.
+
+        Example how to obtain source address of incoming request:
+
+        +----------------------------+
+        | Get Request Source Address |
+        +----------------------------+
+
+        .. code:: text
+
+            ${source address}=   Get Request Source Address
+
+        """
+        return self.__request.get_source_address()
+
+
+    def get_request_source_port(self):
+        """
+
+        Returns source port (client port) of received request as string value. This function should be called
+        after \`Wait For Request\`, otherwise None is returned.
+
+        Example how to obtain source port of incoming request:
+
+        +-------------------------+
+        | Get Request Source Port |
+        +-------------------------+
+
+        .. code:: text
+
+            ${source port}=   Get Request Source Port
+
+        """
+        return str(self.__request.get_source_port())
+
+
+    def get_request_source_port_as_integer(self):
+        """
+
+        Returns source port (client port) of received request as integer value. This function should be called
+        after \`Wait For Request\`, otherwise None is returned.
+
+        Example how to obtain source port of incoming request:
+
+        +------------------------------------+
+        | Get Request Source Port As Integer |
+        +------------------------------------+
+
+        .. code:: text
+
+            ${source port}=   Get Request Source Port As Integer
+
+        """
+        return self.__request.get_source_port()
+
+
+    def get_request_method(self):
+        """
+
+        Returns method of received request as a string. This function should be called after \`Wait For Request\`,
+        otherwise None is returned.
+
+        Example how to obtain method of incoming request:
+
+        +--------------------+
+        | Get Request Method |
+        +--------------------+
+
+        .. code:: text
+
+            Get Request Method
+
+        """
+        return self.__request.get_method()
+
+
+    def get_request_body(self):
+        """
+
+        Returns body of received request as a string. This function should be called after \`Wait For Request\`,
+        otherwise None is returned. Body that is spooled to disk (see \`Set Request Body Spool Threshold\`) is
+        returned as read-only memory-mapped view (`mmap`) that is loaded on demand: it supports length, indexing,
+        slicing (slice is returned as bytes) and search by method `find`.
+
+        Example how to obtain body of incoming request:
+
+        +------------------+
+        | Get Request Body |
+        +------------------+
+
+        .. code:: text
+
+            Get Request Body
+
+        """
+        return self.__request.get_body()
+
+
+    def get_request_body_digest(self, algorithm='sha256'):
+        """
+
+        Returns hex digest of the body of received request. This function should be called after
+        \`Wait For Request\`. Body that is spooled to disk is not loaded to memory to calculate the digest.
+
+        `algorithm` [in] (string): Hash algorithm that is supported by `hashlib`, by default 'sha256'. Optional argument.
+
+        Example how to check body of a large upload:
+
+        +------------+-------------------------+
+        | ${digest}= | Get Request Body Digest |
+        +------------+-------------------------+
+
+        .. code:: text
+
+            Set Request Body Spool Threshold   16M
+            Wait For Request
+            ${digest}=   Get Request Body Digest
+            Should Be Equal   ${digest}   ${expected digest}
+
+        """
+        try:
+            return self.__request.get_body_digest(algorithm)
+        except ValueError as exception:
+            raise AssertionError("Impossible to get request body digest (reason: '%s')." % str(exception))
+
+
+    def save_request_body(self, path):
+        """
+
+        Saves body of received request to the file. This function should be called after \`Wait For Request\`.
+        Body that is spooled to disk is copied without loading it to memory.
+
+        `path` [in] (string): Path to the file where the body is saved, the file is overwritten if it exists.
+
+        Example how to save body of received request:
+
+        +-------------------+-----------------+
+        | Save Request Body | /tmp/upload.bin |
+        +-------------------+-----------------+
+
+        .. code:: text
+
+            Save Request Body   ${OUTPUT DIR}/upload.bin
+
+        """
+        try:
+            self.__request.save_body(path)
+        except OSError as exception:
+            raise AssertionError("Impossible to save request body (reason: '%s')." % str(exception))
+
+        logger.info("Request body ('%d' bytes) is saved to '%s'." % (self.__request.get_body_length(), path))
+
+
+    def set_request_body_spool_threshold(self, threshold, directory=None):
+        """
+
+        Set size of request body above which the body is streamed to a temporary spool file instead of memory. Spooled
+        body is mapped to memory only when it is accessed (see \`Get Request Body\`), \`Get Request Body Digest\`
+        and \`Save Request Body\` do not load it at all. The file is removed when the request is not kept by the
+        server anymore (including the request history, see \`Set Request History Size\`). Spooling is disabled by
+        default, use `None` to disable it again.
+
+        `threshold` [in] (int|string): Body size in bytes, binary suffixes 'K', 'M', 'G' are supported, for example, '16M'.
+
+        `directory` [in] (string): Directory for spool files, by default the system temporary directory. Optional argument.
+
+        Example how to spool bodies that are larger than 16 MByte:
+
+        +----------------------------------+-----+
+        | Set Request Body Spool Threshold | 16M |
+        +----------------------------------+-----+
+
+        .. code:: text
+
+            Set Request Body Spool Threshold   16M   directory=${TEMPDIR}
+
+        """
+        try:
+            if (threshold is None) or (str(threshold).strip().lower() == 'none'):
+                threshold = None
+            else:
+                threshold = SyntheticBody.parse_size(threshold)
+
+            BodySpool().set_threshold(threshold, directory)
+        except ValueError as exception:
+            raise AssertionError("Impossible to set request body spool threshold (reason: '%s')." % str(exception))
+
+        logger.info("Request body spool threshold is set to '%s'." % threshold)
+
+
+    def get_request_headers(self):
+        """
+
+        Returns headers of received request as a dictionary. This function should be called after \`Wait For Request\`,
+        otherwise None is returned. Header names are case-insensitive, the first value is returned for repeated
+        headers (all values are returned by method `get_all`).
+
+        Example how to obtain headers of incoming request:
+
+        +---------------------+
+        | Get Request Headers |
+        +---------------------+
+
+        .. code:: text
+
+            Get Request Headers
+
+        """
+        return self.__request.get_headers()
+
+
+    def get_request_url(self):
+        """
+
+        Returns URL of received request as a string. This function should be called after \`Wait For Request\`,
+        otherwise None is returned.
+
+        Example how to obtain URL of incoming request:
+
+        +-----------------+
+        | Get Request Url |
+        +-----------------+
+
+        .. code:: text
+
+            Get Request Url
+
+        """
+        return self.__request.get_url()
+
+
+    def set_request_history_size(self, size):
+        """
+
+        Set amount of the last received requests that are kept by the server to be queried by
+        \`Get Requests Matching\` and \`Count Requests Matching\`. By default the server keeps `10000` requests.
+        Requests (including requests that are replied by server stubs) are kept regardless of
+        \`Wait For Request\`. The current history is cleared. History is disabled if the size is `0`.
+
+        `size` [in] (int|string): Amount of requests to keep.
+
+        Example how to keep the last 100000 requests:
+
+        +--------------------------+--------+
+        | Set Request History Size | 100000 |
+        +--------------------------+--------+
+
+        .. code:: text
+
+            Set Request History Size   100000
+
+        """
+        try:
+            size = int(size)
+            if size < 0:
+                raise ValueError("history size should be non-negative, but '%d' is provided" % size)
+        except (TypeError, ValueError) as exception:
+            raise AssertionError("Impossible to set request history size (reason: '%s')." % str(exception))
+
+        RequestHistory().set_capacity(size)
+
+
+    def set_request_history_index_header(self, header):
+        """
+
+        Set header that is indexed by the request history, so \`Get Requests Matching\` and
+        \`Count Requests Matching\` with this header and its value are answered without scanning the history. Only
+        one header can be indexed, header name is case-insensitive.
+
+        `header` [in] (string): Name of the header to index.
+
+        Example how to index header `X-Request-Source`:
+
+        +----------------------------------+------------------+
+        | Set Request History Index Header | X-Request-Source |
+        +----------------------------------+------------------+
+
+        .. code:: text
+
+            Set Request History Index Header   X-Request-Source
+
+        """
+        RequestHistory().set_index_header(header)
+
+
+    def get_requests_matching(self, method=None, path=None, header=None, value=None, since=None, until=None):
+        """
+
+        Returns list of received requests (in order of arrival) from the request history that satisfy all specified
+        criteria. Method, path and the indexed header (see \`Set Request History Index Header\`) are looked up by
+        indexes. Use \`Get Method From Request\`, \`Get Url From Request\`, \`Get Headers From Request\` and
+        \`Get Body From Request\` to inspect returned requests.
+
+        `method` [in] (string): Request method. Optional argument.
+
+        `path` [in] (string): Path of the request URL without query, for example, '/orders'. Optional argument.
+
+        `header` [in] (string): Name of a header that request should contain (case-insensitive). Optional argument.
+
+        `value` [in] (string): Value of the header specified by `header`. Optional argument.
+
+        `since` [in] (float|string): Time (seconds since epoch) when the request has been received or later. Optional argument.
+
+        `until` [in] (float|string): Time (seconds since epoch) when the request has been received or earlier. Optional argument.
+
+        Example how to get all `POST` requests to `/orders`:
+
+        +--------------+-----------------------+------+---------+
+        | ${requests}= | Get Requests Matching | POST | /orders |
+        +--------------+-----------------------+------+---------+
+
+        .. code:: text
+
+            ${requests}=   Get Requests Matching   POST   /orders
+            ${body}=       Get Body From Request   ${requests}[0]
+
+        Example how to get requests that were received during the last 10 seconds:
+
+        .. code:: text
+
+            ${now}=        Get Current Date   result_format=epoch
+            ${requests}=   Get Requests Matching   since=${now - 10}
+
+        """
+        criteria = self.__create_history_criteria(method, path, header, value, since, until)
+        return RequestHistory().find(criteria)
+
+
+    def count_requests_matching(self, method=None, path=None, header=None, value=None, since=None, until=None):
+        """
+
+        Returns amount of received requests in the request history that satisfy all specified criteria. Criteria are
+        the same as for \`Get Requests Matching\`.
+
+        `method` [in] (string): Request method. Optional argument.
+
+        `path` [in] (string): Path of the request URL without query, for example, '/orders'. Optional argument.
+
+        `header` [in] (string): Name of a header that request should contain (case-insensitive). Optional argument.
+
+        `value` [in] (string): Value of the header specified by `header`. Optional argument.
+
+        `since` [in] (float|string): Time (seconds since epoch) when the request has been received or later. Optional argument.
+
+        `until` [in] (float|string): Time (seconds since epoch) when the request has been received or earlier. Optional argument.
+
+        Example how to check that exactly 3 `POST` requests to `/orders` carried header `X-Tenant: blue`:
+
+        +-----------+-------------------------+------+---------+----------+------+
+        | ${count}= | Count Requests Matching | POST | /orders | X-Tenant | blue |
+        +-----------+-------------------------+------+---------+----------+------+
+
+        .. code:: text
+
+            ${count}=   Count Requests Matching   POST   /orders   X-Tenant   blue
+            Should Be Equal   ${count}   ${3}
+
+        """
+        criteria = self.__create_history_criteria(method, path, header, value, since, until)
+        return RequestHistory().count(criteria)
+
+
+    def clear_request_history(self):
+        """
+
+        Remove all requests from the request history. The history is also cleared by \`Stop Server\`.
+
+        Example how to clear the request history:
+
+        +-----------------------+
+        | Clear Request History |
+        +-----------------------+
+
+        .. code:: text
+
+            Clear Request History
+
+        """
+        RequestHistory().clear()
+
+
+    def get_method_from_request(self, request):
+        """
+
+        Returns method of the request object that was obtained by \`Get Requests Matching\`.
+
+        Example how to get method from a request object:
+
+        +------------+-------------------------+------------+
+        | ${method}= | Get Method From Request | ${request} |
+        +------------+-------------------------+------------+
+
+        """
+        return request.get_method()
+
+
+    def get_url_from_request(self, request):
+        """
+
+        Returns URL of the request object that was obtained by \`Get Requests Matching\`.
+
+        Example how to get URL from a request object:
+
+        +---------+----------------------+------------+
+        | ${url}= | Get Url From Request | ${request} |
+        +---------+----------------------+------------+
+
+        """
+        return request.get_url()
+
+
+    def get_headers_from_request(self, request):
+        """
+
+        Returns headers of the request object that was obtained by \`Get Requests Matching\`.
+
+        Example how to get headers from a request object:
+
+        +-------------+--------------------------+------------+
+        | ${headers}= | Get Headers From Request | ${request} |
+        +-------------+--------------------------+------------+
+
+        """
+        return request.get_headers()
+
+
+    def get_body_from_request(self, request):
+        """
+
+        Returns body of the request object that was obtained by \`Get Requests Matching\`.
+
+        Example how to get body from a request object:
+
+        +----------+-----------------------+------------+
+        | ${body}= | Get Body From Request | ${request} |
+        +----------+-----------------------+------------+
+
+        """
+        return request.get_body()
+
+
+    @staticmethod
+    def __create_history_criteria(method, path, header, value, since, until):
+        return RequestHistoryCriteria(method=method, path=path, header=header, value=value,
+                                      since=float(since) if since is not None else None,
+                                      until=float(until) if until is not None else None)
+
+
+    def set_reply_header(self, key, value):
+        """
+
+        Set or insert new (if it does not exist yet) header to HTTP response. To send response itself function
+        \`Reply By\` is used. Header names are case-insensitive, all values of the header are replaced by the
+        value (see \`Add Reply Header\` to send repeated headers).
+
+        `key` [in] (string): HTTP header name.
+
+        `value` [in] (string): HTTP header value.
+
+        Example how to set header for HTTP response:
+
+        +------------------+--------+----------------+
+        | Set Reply Header | Origin | 127.0.0.1:8000 |
+        +------------------+--------+----------------+
+
+        .. code:: text
+
+            Set Reply Header   Origin   127.0.0.1:8000
+
+        Example how to set several headers for HTTP response:
+
+        +------------------+-------------+----------------+
+        | Set Reply Header | Origin      | 127.0.0.1:8001 |
+        +------------------+-------------+----------------+
+        | Set Reply Header | City-Source | St.-Petersburg |
+        +------------------+-------------+----------------+
+
+        .. code:: text
+
+            Set Reply Header   Origin        127.0.0.1:8000
+            Set Reply Header   City-Source   St.-Petersburg
+
+        """
+        self.__response_headers[key] = value
+
+
+    def add_reply_header(self, key, value):
+        """
+
+        Add one more value of header to HTTP response, existing values of the header are kept, so the header is sent
+        several times (for example, `Set-Cookie`).
+
+        `key` [in] (string): HTTP header name.
+
+        `value` [in] (string): HTTP header value.
+
+        +------------------+------------+---------+
+        | Add Reply Header | Set-Cookie | id=a3fW |
+        +------------------+------------+---------+
+
+        .. code:: text
+
+            Add Reply Header   Set-Cookie   id=a3fW
+            Add Reply Header   Set-Cookie   lang=en
+
+        """
+        self.__response_headers.add(key, value)
+
+
+    def reply_by(self, status, body=None):
+        """
+
+        Send response using specified HTTP code and body. This function should be called after \`Wait For Request\`.
+
+        `status` [in] (string): HTTP status code for response.
+
+        `body` [in] (string|bytes): Body that should contain response.
+
+        Example how to reply by 204 (No Content) to incoming request:
+
+        +----------+-----+
+        | Reply By | 204 |
+        +----------+-----+
+
+        .. code:: text
+
+            Reply By   204
+
+        Example how to reply 200 (OK) with body to incoming request:
+
+        +----------+-----+--------------------------+
+        | Reply By | 200 | { "status": "accepted" } |
+        +----------+-----+--------------------------+
+
+        .. code:: text
+
+            ${response body}=   Set Variable   { "status": "accepted" }
+            Reply By   204   ${response body}
+
+        Example how to reply with a body represented by a sequence of bytes:
+
+        ..code:: text
+
+            Wait For Request
+
+            ${body bytes}=   Evaluate   bytes((0x0a, 0x12, 0x0a))
+            Reply By   200   ${body bytes}
+
+        """
+        response = Response(int(status), None, body, None, self.__response_headers)
+        ResponseStorage().push(self.__request, response)
+
+
+    def reply_by_stream(self, status, body, chunk_size=65536):
+        """
+
+        Send response using specified HTTP code and streamed body. This function should be called after
+        \`Wait For Request\`. The body is sent chunk by chunk using chunked transfer encoding, each chunk is flushed
+        to the client immediately, so the body is never kept in memory (see \`Set Stub Stream Reply\`). Headers
+        that are set by \`Set Reply Header\` are sent as well.
+
+        `status` [in] (string): HTTP status code for response.
+
+        `body` [in] (iterable|file|callable): Source of the body: iterable (for example, generator) of string or bytes chunks, file-like object or callable that returns one of them.
+
+        `chunk_size` [in] (int): Size of chunks that are read from file-like object, by default '65536'. Optional argument.
+
+        Example how to reply by server-sent events:
+
+        .. code:: text
+
+            Wait For Request
+            Set Reply Header   Content-Type   text/event-stream
+            ${events}=   Evaluate   ('data: %d\\\\n\\\\n' % index for index in range(10))
+            Reply By Stream   200   ${events}
+
+        """
+        response = Response(int(status), None, self.__create_stream_body(body, chunk_size), None,
+                            self.__response_headers)
+        ResponseStorage().push(self.__request, response)
+
+
+    def reply_by_synthetic_body(self, status, size, pattern=None, seed=None):
+        """
+
+        Send response using specified HTTP code and synthetic body of the specified size. This function should be
+        called after \`Wait For Request\`. The body is generated while it is sent, so it takes trivial memory
+        regardless of its size (see \`Set Stub Synthetic Reply\`).
+
+        `status` [in] (string): HTTP status code for response.
+
+        `size` [in] (int|string): Size of the body in bytes, binary suffixes 'K', 'M', 'G', 'T' are supported, for example, '512M'.
+
+        `pattern` [in] (string|bytes): Pattern that is repeated in the body, by default 'x'. Optional argument.
+
+        `seed` [in] (int|string): Seed of pseudo-random data, it cannot be used with pattern. Optional argument.
+
+        Example how to reply by 512 MByte body:
+
+        +-------------------------+-----+------+
+        | Reply By Synthetic Body | 200 | 512M |
+        +-------------------------+-----+------+
+
+        .. code:: text
+
+            Wait For Request
+            Reply By Synthetic Body   200   512M
+
+        """
+        response = Response(int(status), None, self.__create_synthetic_body(size, pattern, seed), None,
+                            self.__response_headers)
+        ResponseStorage().push(self.__request, response)
+
+
+    def start_traffic_recording(self, filename):
+        """
+
+        Start recording of server traffic to the specified file. Each request that is received by the server and the
+        response that is sent to it (including responses of server stubs) are appended to the file with timestamps
+        as a single JSON line (NDJSON format), bodies are encoded using Base64. Records are written by a separate
+        thread, therefore recording does not slow down the server. Recording is not stopped by \`Stop Server\`, so
+        it is possible to record traffic of the whole test suite.
+
+        `filename` [in] (string): Path to the file where traffic is going to be recorded. If the file exists then
+        records are appended to it.
+
+        Example how to record traffic of the test suite:
+
+        +-------------------------+-------------------+
+        | Start Traffic Recording | traffic.ndjson    |
+        +-------------------------+-------------------+
+
+        .. code:: robotframework
+
+            *** Settings ***
+
+            Library         HttpCtrl.Server
+
+            Suite Setup      Start Traffic Recording   traffic.ndjson
+            Suite Teardown   Stop Traffic Recording
+
+        """
+        try:
+            TrafficRecorder().start(filename)
+        except Exception as exception:
+            raise AssertionError("Impossible to start traffic recording (reason: '%s')." % str(exception))
+
+
+    def stop_traffic_recording(self):
+        """
+
+        Stop recording of server traffic that has been started by \`Start Traffic Recording\`. All records that are
+        received before the call are written to the file. If recording has been terminated due to error (for
+        example, the file cannot be reopened after rotation) then the error is reported and recording is stopped.
+
+        Example how to stop traffic recording:
+
+        +------------------------+
+        | Stop Traffic Recording |
+        +------------------------+
+
+        .. code:: text
+
+            Stop Traffic Recording
+
+        """
+        try:
+            TrafficRecorder().stop()
+        except RuntimeError as exception:
+            raise AssertionError("Impossible to stop traffic recording (reason: '%s')." % str(exception))
+
+
+    def rotate_traffic_recording(self, filename=None):
+        """
+
+        Close the current traffic recording file and continue recording to a new one. Returns path to the closed file.
+
+        `filename` [in] (string): Path to the file where traffic is going to be recorded. If it is not specified then the
+        current file is renamed using numeric suffix (for example, 'traffic.ndjson.1') and recording is continued to the
+        original path. Optional argument.
+
+        Example how to rotate traffic recording file after each test:
+
+        +-------------------+--------------------------+
+        | ${recorded file}= | Rotate Traffic Recording |
+        +-------------------+--------------------------+
+
+        .. code:: text
+
+            ${recorded file}=   Rotate Traffic Recording
+
+        Example how to continue recording to a specific file:
+
+        .. code:: text
+
+            ${recorded file}=   Rotate Traffic Recording   second_part.ndjson
+
+        """
+        try:
+            rotated_filename = TrafficRecorder().rotate(filename)
+        except Exception as exception:
+            raise AssertionError("Impossible to rotate traffic recording (reason: '%s')." % str(exception))
+
+        logger.info("Traffic recording file '%s' is closed." % rotated_filename)
+        return rotated_filename
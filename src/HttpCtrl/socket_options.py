@@ -0,0 +1,126 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import socket
+
+
+class ServerSocketOptions:
+    """
+    Options of the listening socket of the server and of accepted connections. Option that is None is not changed,
+    so the default value of the operating system is used. Backlog is `socket.SOMAXCONN` by default (the kernel
+    limits it by its own maximum), so bursts of connections are queued instead of being refused.
+
+    """
+    DEFAULT_BACKLOG = socket.SOMAXCONN
+
+
+    def __init__(self, backlog=None, nodelay=None, rcvbuf=None, sndbuf=None, defer_accept=None):
+        self.backlog = ServerSocketOptions.__to_integer('backlog', backlog, 1)
+        self.nodelay = ServerSocketOptions.__to_bool('nodelay', nodelay)
+        self.rcvbuf = ServerSocketOptions.__to_integer('rcvbuf', rcvbuf, 1)
+        self.sndbuf = ServerSocketOptions.__to_integer('sndbuf', sndbuf, 1)
+        self.defer_accept = ServerSocketOptions.__to_integer('defer_accept', defer_accept, 0)
+
+        if (self.defer_accept is not None) and not hasattr(socket, 'TCP_DEFER_ACCEPT'):
+            raise ValueError("option 'defer_accept' (TCP_DEFER_ACCEPT) is not supported by the platform")
+
+
+    def __str__(self):
+        return "backlog: '%s', nodelay: '%s', rcvbuf: '%s', sndbuf: '%s', defer_accept: '%s'" % self.get_key()
+
+
+    def get_key(self):
+        return self.get_backlog(), self.nodelay, self.rcvbuf, self.sndbuf, self.defer_accept
+
+
+    def get_backlog(self):
+        if self.backlog is None:
+            return ServerSocketOptions.DEFAULT_BACKLOG
+
+        return self.backlog
+
+
+    def apply_to_listener(self, listener):
+        """
+        Applies options before the socket is bound: buffer sizes affect TCP window scaling that is negotiated by
+        handshake, therefore they are set on the listening socket and inherited by accepted connections.
+
+        """
+        if self.rcvbuf is not None:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+
+        if self.sndbuf is not None:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf)
+
+        if not ServerSocketOptions.__is_tcp(listener):
+            return
+
+        if self.defer_accept is not None:
+            # connection is accepted only when data has arrived, idle connections do not occupy the server
+            listener.setsockopt(socket.IPPROTO_TCP, socket.TCP_DEFER_ACCEPT, self.defer_accept)
+
+
+    def apply_to_connection(self, connection):
+        if (self.nodelay is not None) and ServerSocketOptions.__is_tcp(connection):
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 if self.nodelay else 0)
+
+
+    @staticmethod
+    def get_listener_option(listener, name):
+        """
+        Returns value of the option that is really used by the listening socket, the operating system might adjust
+        the requested value (for example, Linux doubles buffer sizes).
+
+        """
+        levels = {'rcvbuf': (socket.SOL_SOCKET, socket.SO_RCVBUF), 'sndbuf': (socket.SOL_SOCKET, socket.SO_SNDBUF)}
+        if ServerSocketOptions.__is_tcp(listener) and hasattr(socket, 'TCP_DEFER_ACCEPT'):
+            levels['defer_accept'] = (socket.IPPROTO_TCP, socket.TCP_DEFER_ACCEPT)
+
+        if name not in levels:
+            raise ValueError("option '%s' of the listening socket cannot be read, supported options: '%s'" %
+                             (name, "', '".join(levels)))
+
+        return listener.getsockopt(*levels[name])
+
+
+    @staticmethod
+    def __is_tcp(sock):
+        return sock.family in (socket.AF_INET, socket.AF_INET6)
+
+
+    @staticmethod
+    def __to_integer(name, value, minimum):
+        if value is None:
+            return None
+
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise ValueError("option '%s' should be an integer, but '%s' is provided" % (name, value))
+
+        if value < minimum:
+            raise ValueError("option '%s' should be at least '%d', but '%d' is provided" % (name, minimum, value))
+
+        return value
+
+
+    @staticmethod
+    def __to_bool(name, value):
+        if (value is None) or isinstance(value, bool):
+            return value
+
+        normalized = str(value).strip().lower()
+        if normalized in ('true', 'yes', 'on', '1'):
+            return True
+
+        if normalized in ('false', 'no', 'off', '0'):
+            return False
+
+        raise ValueError("option '%s' should be a boolean, but '%s' is provided" % (name, value))
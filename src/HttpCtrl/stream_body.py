@@ -0,0 +1,109 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import threading
+
+
+class StreamBody:
+    """
+    Response body that is produced chunk by chunk while it is sent, so it is never kept in memory. Source of the
+    body might be:
+
+    - iterable or iterator (for example, generator) of chunks (string or bytes) - it can be sent only once;
+
+    - file-like object (an object with 'read' method) - it is read by chunks, seekable object is rewound before
+      sending, so it can be sent many times;
+
+    - callable that returns one of the objects above - it is called for each response (useful for stubs), the
+      returned object is closed when it is sent.
+
+    """
+    DEFAULT_CHUNK_SIZE = 65536
+
+
+    def __init__(self, source, chunk_size=DEFAULT_CHUNK_SIZE):
+        if isinstance(source, (str, bytes, bytearray)) or not StreamBody.is_stream_source(source):
+            raise TypeError("stream source should be iterable, file-like object or callable, but '%s' is provided" %
+                            type(source).__name__)
+
+        self.__source = source
+        self.__chunk_size = chunk_size
+        self.__lock = threading.Lock()
+        self.__consumed = False
+
+
+    def __str__(self):
+        return "<streamed body>"
+
+
+    def get_length(self):
+        """
+        Returns length of the body if it is known in advance, otherwise None (the body is sent by chunks).
+
+        """
+        return None
+
+
+    @staticmethod
+    def is_stream_source(source):
+        if isinstance(source, (str, bytes, bytearray, dict, list, tuple)):
+            return False
+
+        return callable(source) or hasattr(source, 'read') or hasattr(source, '__iter__')
+
+
+    def chunks(self):
+        """
+        Returns generator of non-empty chunks (bytes) of the body.
+
+        """
+        if callable(self.__source) and not hasattr(self.__source, 'read'):
+            source = self.__source()
+            try:
+                yield from self.__read(source)
+            finally:
+                if hasattr(source, 'close'):
+                    source.close()
+
+            return
+
+        with self.__lock:
+            if hasattr(self.__source, 'read') and hasattr(self.__source, 'seek') and \
+                    (not hasattr(self.__source, 'seekable') or self.__source.seekable()):
+                self.__source.seek(0)
+            elif self.__consumed is True:
+                return  # iterator has been already sent
+
+            self.__consumed = True
+
+            yield from self.__read(self.__source)
+
+
+    def __read(self, source):
+        if hasattr(source, 'read'):
+            while True:
+                chunk = source.read(self.__chunk_size)
+                if not chunk:
+                    break
+
+                yield StreamBody.__to_bytes(chunk)
+        else:
+            for chunk in source:
+                chunk = StreamBody.__to_bytes(chunk)
+                if chunk:
+                    yield chunk
+
+
+    @staticmethod
+    def __to_bytes(chunk):
+        if isinstance(chunk, str):
+            return chunk.encode('utf-8')
+
+        return bytes(chunk)
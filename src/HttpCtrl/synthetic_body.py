@@ -0,0 +1,145 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import hashlib
+import random
+import threading
+
+from HttpCtrl.stream_body import StreamBody
+
+
+class SyntheticBody(StreamBody):
+    """
+    Body of the specified size that is generated while it is sent: it consists of a repeating pattern or of
+    pseudo-random data that is defined by a seed. Chunks are views of one small buffer that is created once, so
+    memory consumption does not depend on the body size. The content is deterministic, therefore its digest is
+    known in advance and can be checked by a client.
+
+    """
+    DEFAULT_PATTERN = b'x'
+    DEFAULT_CHUNK_SIZE = 65536
+
+    __RANDOM_BLOCK_SIZE = 1048576   # 1 MByte
+    __SIZE_UNITS = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+
+
+    def __init__(self, size, pattern=None, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        if size < 0:
+            raise ValueError("body size should be non-negative, but '%d' is provided" % size)
+
+        if (pattern is not None) and (seed is not None):
+            raise ValueError("pattern and seed cannot be used together")
+
+        if isinstance(pattern, str):
+            pattern = pattern.encode('utf-8')
+
+        # the same seed gives the same content regardless of its representation (Robot Framework passes strings)
+        if isinstance(seed, str) and seed.strip().lstrip('-').isdigit():
+            seed = int(seed)
+
+        if (pattern is not None) and (len(pattern) == 0):
+            raise ValueError("pattern should not be empty")
+
+        self.__size = size
+        self.__pattern = pattern
+        self.__seed = seed
+        self.__chunk_size = chunk_size
+
+        self.__buffer = self.__create_buffer()
+        self.__digests = {}
+        self.__lock = threading.Lock()
+
+
+    def __str__(self):
+        if self.__seed is not None:
+            return "<synthetic body: '%d' bytes, seed: '%s'>" % (self.__size, self.__seed)
+
+        return "<synthetic body: '%d' bytes, pattern: '%s'>" % (self.__size, self.__get_pattern())
+
+
+    def __len__(self):
+        return self.__size
+
+
+    def get_length(self):
+        return self.__size
+
+
+    def chunks(self):
+        buffer = memoryview(self.__buffer)
+
+        left, offset = self.__size, 0
+        while left > 0:
+            length = min(left, self.__chunk_size, len(buffer) - offset)
+            yield buffer[offset:offset + length]
+
+            left -= length
+            offset = (offset + length) % len(buffer)
+
+
+    def get_digest(self, algorithm='sha256'):
+        """
+        Returns hex digest of the body, it is calculated once for each algorithm.
+
+        """
+        with self.__lock:
+            digest = self.__digests.get(algorithm)
+            if digest is None:
+                hasher = hashlib.new(algorithm)
+                for chunk in self.chunks():
+                    hasher.update(chunk)
+
+                digest = hasher.hexdigest()
+                self.__digests[algorithm] = digest
+
+            return digest
+
+
+    @staticmethod
+    def parse_size(size):
+        """
+        Converts size to amount of bytes, the size might have binary unit suffix: 'K', 'M', 'G' or 'T' (for example,
+        '512K' or '4G').
+
+        """
+        if isinstance(size, int):
+            return size
+
+        value = str(size).strip().upper()
+        if value.endswith('B'):
+            value = value[:-1]
+
+        multiplier = 1
+        if value and value[-1] in SyntheticBody.__SIZE_UNITS:
+            multiplier = SyntheticBody.__SIZE_UNITS[value[-1]]
+            value = value[:-1]
+
+        try:
+            return int(value) * multiplier
+        except ValueError:
+            raise ValueError("invalid body size '%s'" % size)
+
+
+    def __get_pattern(self):
+        if self.__pattern is None:
+            return SyntheticBody.DEFAULT_PATTERN
+
+        return self.__pattern
+
+
+    def __create_buffer(self):
+        if self.__seed is not None:
+            # random block is bigger than a chunk to avoid short period of the content
+            size = max(self.__chunk_size, SyntheticBody.__RANDOM_BLOCK_SIZE)
+            return random.Random(self.__seed).getrandbits(size * 8).to_bytes(size, 'little')
+
+        # buffer consists of whole patterns to continue the pattern in the next chunk
+        pattern = self.__get_pattern()
+        return pattern * max(1, self.__chunk_size // len(pattern))
@@ -0,0 +1,180 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import atexit
+import datetime
+import ipaddress
+import os
+import shutil
+import ssl
+import tempfile
+import threading
+
+from HttpCtrl.utils.singleton import Singleton
+
+
+def create_server_context(certificate, key=None, password=None):
+    """
+    Creates server SSL context that is used by HTTPS server for all its connections. Session tickets (TLS 1.3) and
+    session cache (TLS 1.2) are enabled, so clients that reconnect to the server resume their sessions.
+
+    """
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certificate, key, password)
+
+    context.options &= ~ssl.OP_NO_TICKET
+    if hasattr(context, 'num_tickets'):
+        context.num_tickets = 2
+
+    return context
+
+
+class LocalCertificateAuthority(metaclass=Singleton):
+    """
+    Local certificate authority that issues server certificates for HTTPS server. CA and certificates are generated
+    once per process (generation of keys is the most expensive part of it) and stored to a temporary directory that
+    is removed on exit. Optional package 'cryptography' is required to generate them.
+
+    """
+    __VALIDITY_DAYS = 365
+
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__directory = None
+        self.__ca_key = None
+        self.__ca_certificate = None
+        self.__ca_certificate_file = None
+        self.__certificates = {}
+
+
+    def get_ca_certificate_file(self):
+        """
+        Returns path to CA certificate (PEM format) or None if CA has not been created yet.
+
+        """
+        return self.__ca_certificate_file
+
+
+    def issue(self, host):
+        """
+        Returns paths to certificate and private key (PEM format) that are issued for the host.
+
+        """
+        with self.__lock:
+            files = self.__certificates.get(host)
+            if files is None:
+                cryptography = LocalCertificateAuthority.__import_cryptography()
+
+                if self.__ca_certificate is None:
+                    self.__create_authority(cryptography)
+
+                files = self.__create_certificate(cryptography, host)
+                self.__certificates[host] = files
+
+            return files
+
+
+    def __create_authority(self, cryptography):
+        x509, hashes, serialization, ec, NameOID = cryptography
+
+        self.__directory = tempfile.mkdtemp(prefix='httpctrl-tls-')
+        atexit.register(shutil.rmtree, self.__directory, True)
+
+        self.__ca_key = ec.generate_private_key(ec.SECP256R1())
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "HttpCtrl Local CA")])
+        public_key = self.__ca_key.public_key()
+
+        builder = LocalCertificateAuthority.__create_builder(x509, name, name, public_key)
+        builder = builder.add_extension(x509.BasicConstraints(ca=True, path_length=0), critical=True)
+        builder = builder.add_extension(x509.KeyUsage(digital_signature=True, content_commitment=False,
+                                                      key_encipherment=False, data_encipherment=False,
+                                                      key_agreement=False, key_cert_sign=True, crl_sign=True,
+                                                      encipher_only=False, decipher_only=False), critical=True)
+        builder = builder.add_extension(x509.SubjectKeyIdentifier.from_public_key(public_key), critical=False)
+
+        self.__ca_certificate = builder.sign(self.__ca_key, hashes.SHA256())
+        self.__ca_certificate_file = self.__write('ca.pem', self.__ca_certificate.public_bytes(serialization.Encoding.PEM))
+
+
+    def __create_certificate(self, cryptography, host):
+        x509, hashes, serialization, ec, NameOID = cryptography
+
+        key = ec.generate_private_key(ec.SECP256R1())
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, host)])
+
+        builder = LocalCertificateAuthority.__create_builder(x509, name, self.__ca_certificate.subject,
+                                                             key.public_key())
+        builder = builder.add_extension(x509.SubjectAlternativeName(LocalCertificateAuthority.__get_names(x509, host)),
+                                        critical=False)
+        builder = builder.add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=True)
+        builder = builder.add_extension(x509.ExtendedKeyUsage([x509.ExtendedKeyUsageOID.SERVER_AUTH]), critical=False)
+        builder = builder.add_extension(x509.SubjectKeyIdentifier.from_public_key(key.public_key()), critical=False)
+        builder = builder.add_extension(
+            x509.AuthorityKeyIdentifier.from_issuer_public_key(self.__ca_key.public_key()), critical=False)
+
+        certificate = builder.sign(self.__ca_key, hashes.SHA256())
+
+        # the file name should not depend on the host to support any host representation (for example, IPv6)
+        index = len(self.__certificates)
+        certificate_file = self.__write('server-%d.pem' % index, certificate.public_bytes(serialization.Encoding.PEM))
+        key_file = self.__write('server-%d.key' % index, key.private_bytes(serialization.Encoding.PEM,
+                                                                             serialization.PrivateFormat.PKCS8,
+                                                                             serialization.NoEncryption()))
+        return certificate_file, key_file
+
+
+    def __write(self, filename, content):
+        path = os.path.join(self.__directory, filename)
+        with open(path, 'wb') as file_stream:
+            file_stream.write(content)
+
+        return path
+
+
+    @staticmethod
+    def __create_builder(x509, subject, issuer, public_key):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return x509.CertificateBuilder() \
+            .subject_name(subject) \
+            .issuer_name(issuer) \
+            .public_key(public_key) \
+            .serial_number(x509.random_serial_number()) \
+            .not_valid_before(now - datetime.timedelta(days=1)) \
+            .not_valid_after(now + datetime.timedelta(days=LocalCertificateAuthority.__VALIDITY_DAYS))
+
+
+    @staticmethod
+    def __get_names(x509, host):
+        names = []
+        for name in (host, 'localhost', '127.0.0.1', '::1'):
+            try:
+                entry = x509.IPAddress(ipaddress.ip_address(name))
+            except ValueError:
+                entry = x509.DNSName(name)
+
+            if entry not in names:
+                names.append(entry)
+
+        return names
+
+
+    @staticmethod
+    def __import_cryptography():
+        try:
+            from cryptography import x509
+            from cryptography.hazmat.primitives import hashes, serialization
+            from cryptography.hazmat.primitives.asymmetric import ec
+            from cryptography.x509.oid import NameOID
+        except ImportError:
+            raise RuntimeError("package 'cryptography' is required to generate certificates, install it or use "
+                               "'pip install robotframework-httpctrl[tls]'")
+
+        return x509, hashes, serialization, ec, NameOID
@@ -0,0 +1,254 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import atexit
+import base64
+import json
+import os
+import queue
+import threading
+import time
+
+from robot.api import logger
+
+from HttpCtrl.stream_body import StreamBody
+from HttpCtrl.utils.singleton import Singleton
+
+
+class TrafficRecorder(metaclass=Singleton):
+    """
+    Appends received requests and sent responses to NDJSON log (one JSON object per line). Records are serialized
+    and written by a separate thread, the server thread only places them to the queue. A record that cannot be
+    written is skipped, recording is terminated only if the log cannot be reopened.
+
+    """
+    __BUFFER_SIZE = 1024 * 1024
+
+    __COMMAND_RECORD = 0
+    __COMMAND_ROTATE = 1
+    __COMMAND_STOP = 2
+
+    __WAIT_PERIOD = 0.1
+
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__queue = None
+        self.__thread = None
+        self.__filename = None
+        self.__error = None
+
+        atexit.register(self.__stop_at_exit)
+
+
+    def is_active(self):
+        return self.__queue is not None
+
+
+    def start(self, filename):
+        with self.__lock:
+            if self.__queue is not None:
+                raise RuntimeError("traffic is already recorded to '%s'" % self.__filename)
+
+            file_stream = open(filename, "ab", buffering=TrafficRecorder.__BUFFER_SIZE)
+
+            self.__filename = filename
+            self.__error = None
+            self.__queue = queue.SimpleQueue()
+            self.__thread = threading.Thread(target=self.__write, args=(self.__queue, file_stream))
+            self.__thread.daemon = True
+            self.__thread.start()
+
+        logger.info("Traffic recording to '%s' is started." % filename)
+
+
+    def stop(self):
+        """
+        Stops recording, error is raised if recording has been terminated by the writer error before.
+
+        """
+        with self.__lock:
+            if self.__queue is None:
+                return
+
+            if self.__thread.is_alive():
+                self.__queue.put((TrafficRecorder.__COMMAND_STOP, None))
+                self.__thread.join()
+
+            filename, error = self.__filename, self.__error
+
+            self.__queue = None
+            self.__thread = None
+            self.__filename = None
+            self.__error = None
+
+        if error is not None:
+            raise RuntimeError("traffic recording to '%s' has been terminated due to error: %s" % (filename, error))
+
+        logger.info("Traffic recording to '%s' is stopped." % filename)
+
+
+    def rotate(self, filename=None):
+        """
+        Closes the current log and continues recording to a new one. If the new filename is not specified then the
+        current log is renamed using the first free numeric suffix and recording is continued to the original file.
+        Returns path to the log that has been closed.
+
+        """
+        with self.__lock:
+            if self.__queue is None:
+                raise RuntimeError("traffic recording is not started")
+
+            result = {}
+            completed = threading.Event()
+
+            self.__queue.put((TrafficRecorder.__COMMAND_ROTATE, (filename, result, completed)))
+            while not completed.wait(TrafficRecorder.__WAIT_PERIOD):
+                if not self.__thread.is_alive():
+                    raise RuntimeError("traffic recording has been terminated due to error: %s" % self.__error)
+
+            if 'error' in result:
+                raise result['error']
+
+            if filename is not None:
+                self.__filename = filename
+
+            return result['rotated']
+
+
+    def record(self, request, response):
+        traffic_queue = self.__queue
+        if (traffic_queue is not None) and (self.__error is None):
+            traffic_queue.put((TrafficRecorder.__COMMAND_RECORD, (request, response, time.time())))
+
+
+    def __stop_at_exit(self):
+        try:
+            self.stop()
+        except RuntimeError:
+            pass    # nobody can handle the error at exit
+
+
+    def __write(self, traffic_queue, file_stream):
+        try:
+            while True:
+                command, arguments = traffic_queue.get()
+
+                if command == TrafficRecorder.__COMMAND_RECORD:
+                    TrafficRecorder.__write_record(file_stream, arguments)
+
+                elif command == TrafficRecorder.__COMMAND_ROTATE:
+                    file_stream = self.__rotate(file_stream, *arguments)
+
+                elif command == TrafficRecorder.__COMMAND_STOP:
+                    break
+
+                if traffic_queue.empty():
+                    file_stream.flush()
+
+        except Exception as exception:
+            self.__error = exception
+
+        finally:
+            if file_stream is not None:
+                try:
+                    file_stream.close()
+                except OSError:
+                    pass
+
+
+    @staticmethod
+    def __write_record(file_stream, arguments):
+        try:
+            file_stream.write(TrafficRecorder.__serialize(*arguments))
+        except Exception as exception:
+            # the record is lost, but the next records are written
+            logger.info("Traffic record is not written (reason: '%s')." % str(exception))
+
+
+    def __rotate(self, file_stream, filename, result, completed):
+        try:
+            current_filename = file_stream.name
+            file_stream.close()
+
+            if filename is None:
+                filename = current_filename
+                rotated_filename = TrafficRecorder.__get_rotated_filename(current_filename)
+                os.replace(current_filename, rotated_filename)
+            else:
+                rotated_filename = current_filename
+
+            file_stream = open(filename, "ab", buffering=TrafficRecorder.__BUFFER_SIZE)
+            result['rotated'] = rotated_filename
+
+        except Exception as exception:
+            result['error'] = exception
+
+            # keep recording to the current log if it is impossible to rotate it, recording is terminated if the
+            # current log cannot be reopened as well
+            file_stream = open(file_stream.name, "ab", buffering=TrafficRecorder.__BUFFER_SIZE)
+
+        finally:
+            completed.set()
+
+        return file_stream
+
+
+    @staticmethod
+    def __get_rotated_filename(filename):
+        index = 1
+        while os.path.exists("%s.%d" % (filename, index)):
+            index += 1
+
+        return "%s.%d" % (filename, index)
+
+
+    @staticmethod
+    def __serialize(request, response, timestamp):
+        record = {
+            'received': request.get_timestamp(),
+            'replied': timestamp,
+            'source': {'address': request.get_source_address(), 'port': request.get_source_port()},
+            'request': {
+                'method': request.get_method(),
+                'url': request.get_url(),
+                'headers': [[key, value] for key, value in request.get_header_items()],
+                'body': TrafficRecorder.__serialize_body(request.get_body())
+            },
+            'response': None
+        }
+
+        if response is not None:
+            record['response'] = {
+                'status': response.get_status(),
+                'headers': TrafficRecorder.__serialize_headers(response.get_headers()),
+                'body': TrafficRecorder.__serialize_body(response.get_body())
+            }
+
+        return json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+    @staticmethod
+    def __serialize_headers(headers):
+        if headers is None:
+            return []
+
+        return [[key, value] for key, value in headers.raw_items()]
+
+
+    @staticmethod
+    def __serialize_body(body):
+        if (body is None) or isinstance(body, StreamBody):
+            return None  # streamed body is not kept in memory, so it is not recorded
+
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        return base64.b64encode(body).decode('ascii')
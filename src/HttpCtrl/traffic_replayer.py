@@ -0,0 +1,127 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import base64
+import json
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TrafficReplayer:
+    """
+    Replays requests from traffic log that is written by `TrafficRecorder`. Requests are sent by `send_function`
+    that takes method, url, headers (list of (name, value) pairs in the recorded order including repeated headers)
+    and body and returns `Response`.
+
+    """
+    # headers that are defined by connection and body, they are recalculated for each replayed request
+    __SKIPPED_HEADERS = frozenset(['host', 'content-length', 'connection', 'transfer-encoding'])
+
+
+    def __init__(self, send_function, speed=1.0, connections=1):
+        if speed < 0:
+            raise ValueError("Replay speed should be non-negative (current value: '%s')." % speed)
+
+        if connections < 1:
+            raise ValueError("Amount of connections should be at least 1 (current value: '%s')." % connections)
+
+        self.__send_function = send_function
+        self.__speed = speed
+        self.__connections = connections
+
+        self.__lock = threading.Lock()
+        self.__latencies = []
+        self.__mismatches = []
+        self.__errors = []
+
+
+    def replay(self, filename):
+        start_time = None
+        first_timestamp = None
+
+        with ThreadPoolExecutor(max_workers=self.__connections) as executor:
+            for index, record in enumerate(TrafficReplayer.read(filename)):
+                if self.__speed > 0:
+                    if start_time is None:
+                        start_time = time.monotonic()
+                        first_timestamp = record['received']
+
+                    delay = (record['received'] - first_timestamp) / self.__speed - (time.monotonic() - start_time)
+                    if delay > 0:
+                        time.sleep(delay)
+
+                executor.submit(self.__replay_record, index, record)
+
+        return self.__create_report()
+
+
+    @staticmethod
+    def read(filename):
+        with open(filename, "rb") as file_stream:
+            for line in file_stream:
+                if line.strip():
+                    yield json.loads(line)
+
+
+    def __replay_record(self, index, record):
+        request = record['request']
+
+        headers = [(key, value) for key, value in request['headers']
+                   if key.lower() not in TrafficReplayer.__SKIPPED_HEADERS]
+
+        body = request['body']
+        if body is not None:
+            body = base64.b64decode(body)
+
+        expected_status = None
+        if record['response'] is not None:
+            expected_status = record['response']['status']
+
+        start_time = time.perf_counter()
+        try:
+            response = self.__send_function(request['method'], request['url'], headers, body)
+        except Exception as exception:
+            with self.__lock:
+                self.__errors.append({'index': index, 'method': request['method'], 'url': request['url'],
+                                      'reason': str(exception)})
+            return
+
+        latency = time.perf_counter() - start_time
+
+        with self.__lock:
+            self.__latencies.append((index, latency))
+
+            if (expected_status is not None) and (response.get_status() != expected_status):
+                self.__mismatches.append({'index': index, 'method': request['method'], 'url': request['url'],
+                                          'expected': expected_status, 'actual': response.get_status()})
+
+
+    def __create_report(self):
+        ordered_latencies = [latency for _, latency in sorted(self.__latencies)]
+        latencies = sorted(ordered_latencies)
+
+        def percentile(value):
+            if len(latencies) == 0:
+                return None
+
+            return latencies[min(len(latencies) - 1, int(len(latencies) * value))]
+
+        return {
+            'total': len(self.__latencies) + len(self.__errors),
+            'latencies': ordered_latencies,
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'p99': percentile(0.99),
+            'max': latencies[-1] if len(latencies) > 0 else None,
+            'mismatches': sorted(self.__mismatches, key=lambda mismatch: mismatch['index']),
+            'errors': sorted(self.__errors, key=lambda error: error['index'])
+        }
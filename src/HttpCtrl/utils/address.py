@@ -0,0 +1,26 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+UNIX_SOCKET_PREFIX = 'unix:'
+
+
+def get_unix_socket_path(address):
+    """
+    Returns path of Unix domain socket if the address has form 'unix:<path>', otherwise None.
+
+    """
+    if not isinstance(address, str) or not address.startswith(UNIX_SOCKET_PREFIX):
+        return None
+
+    path = address[len(UNIX_SOCKET_PREFIX):]
+    if len(path) == 0:
+        raise ValueError("path of Unix domain socket is not specified in address '%s'" % address)
+
+    return path
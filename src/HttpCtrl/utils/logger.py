@@ -27,11 +27,34 @@ class LoggerAssistant:
 
 
     @staticmethod
-    def get_body(body):
-        if body is not None:
-            if (LoggerAssistant.__MAX_BODY_SIZE_TO_LOG is None) or (len(body) < LoggerAssistant.__MAX_BODY_SIZE_TO_LOG):
-                return body
-            else:
-                return "%s...\n...\n<display only the first '%d' from '%d' symbols>" % (body[:LoggerAssistant.__MAX_BODY_SIZE_TO_LOG], LoggerAssistant.__MAX_BODY_SIZE_TO_LOG, len(body))
-
-        return ""
+    def get_body(body, encoding=None):
+        """
+        Returns body or its first part to log, only the part that is logged is converted. Binary body is decoded
+        if encoding is specified.
+
+        """
+        if body is None:
+            return ""
+
+        limit = LoggerAssistant.__MAX_BODY_SIZE_TO_LOG
+        length = body.nbytes if isinstance(body, memoryview) else len(body)
+
+        if (limit is None) or (length < limit):
+            return LoggerAssistant.__convert(body, encoding)
+
+        # memoryview is sliced without copying of the body
+        body_part = LoggerAssistant.__convert(body[:limit], encoding)
+        return "%s...\n...\n<display only the first '%d' from '%d' symbols>" % (body_part, limit, length)
+
+
+    @staticmethod
+    def __convert(body, encoding):
+        if isinstance(body, memoryview):
+            body = body.tobytes()
+        elif not isinstance(body, (bytes, bytearray, str)):
+            body = body[:]  # memory-mapped body of spooled request is sliced to bytes
+
+        if (encoding is not None) and isinstance(body, bytes):
+            return body.decode(encoding, errors='replace')
+
+        return body
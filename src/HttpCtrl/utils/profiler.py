@@ -0,0 +1,214 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import contextlib
+import os
+import threading
+
+from HttpCtrl.utils.singleton import Singleton
+
+
+class ProfilingResult:
+    def __init__(self, stats, snapshot, sections, skipped):
+        self.__stats = stats
+        self.__snapshot = snapshot
+        self.__sections = sections
+        self.__skipped = skipped
+
+
+    def get_sections(self):
+        return self.__sections
+
+
+    def get_skipped(self):
+        return self.__skipped
+
+
+    def dump(self, prefix):
+        """
+        Writes CPU profile to '<prefix>.pstats' and memory snapshot to '<prefix>.snapshot' and returns list of
+        written files. Files are not created if there is no corresponding data.
+
+        """
+        filenames = []
+        if self.__stats is not None:
+            filename = prefix + ".pstats"
+            self.__stats.dump_stats(filename)
+            filenames.append(filename)
+
+        if self.__snapshot is not None:
+            filename = prefix + ".snapshot"
+            self.__snapshot.dump(filename)
+            filenames.append(filename)
+
+        return filenames
+
+
+    def summarize(self, top):
+        import io
+        import pstats
+
+        summary = "Profiled sections: '%d', skipped sections: '%d'.\n" % (self.__sections, self.__skipped)
+
+        if self.__stats is not None:
+            stream = io.StringIO()
+            stats = pstats.Stats(stream=stream)
+            stats.add(self.__stats)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+            summary += "\nTop '%d' functions by cumulative time:\n%s" % (top, stream.getvalue().strip('\n'))
+
+        if self.__snapshot is not None:
+            statistics = self.__snapshot.statistics('lineno')
+            summary += "\n\nTop '%d' allocators (total: '%d' bytes):\n" % (top, sum(stat.size for stat in statistics))
+            summary += "\n".join(str(stat) for stat in statistics[:top])
+
+        return summary
+
+
+class Profiler(metaclass=Singleton):
+    """
+    Collects CPU profile of HttpCtrl sections (server request handling and client calls) and allocations that are
+    made by HttpCtrl code. Each section is profiled by its own `cProfile.Profile` in the thread where it is executed
+    and the result is merged to the common statistics, therefore threads that do not belong to HttpCtrl are not
+    profiled. Python 3.12+ allows only one active profiler per process - concurrent sections are skipped there.
+    Profiling modules are imported on the first start because they are not needed by the most of test runs.
+
+    """
+    __NULL_SECTION = contextlib.nullcontext()
+    __PACKAGE_PATTERN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '*')
+
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+
+        self.__active = False
+        self.__generation = 0
+        self.__own_tracing = False
+        self.__trace_memory = False
+
+        self.__stats = None
+        self.__sections = 0
+        self.__skipped = 0
+
+
+    def is_active(self):
+        return self.__active
+
+
+    def start(self, trace_memory=True, frames=10):
+        import tracemalloc
+
+        with self.__lock:
+            if self.__active is True:
+                raise RuntimeError("profiling is already started")
+
+            self.__stats = None
+            self.__sections = 0
+            self.__skipped = 0
+
+            self.__trace_memory = trace_memory
+            self.__own_tracing = False
+            if trace_memory is True and not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+                self.__own_tracing = True
+
+            self.__generation += 1
+            self.__active = True
+
+
+    def stop(self):
+        import tracemalloc
+
+        with self.__lock:
+            if self.__active is False:
+                raise RuntimeError("profiling is not started")
+
+            self.__active = False
+
+            snapshot = None
+            if self.__trace_memory is True and tracemalloc.is_tracing():
+                snapshot = tracemalloc.take_snapshot()
+                snapshot = snapshot.filter_traces([tracemalloc.Filter(True, Profiler.__PACKAGE_PATTERN, all_frames=True)])
+
+                if self.__own_tracing is True:
+                    tracemalloc.stop()
+
+            result = ProfilingResult(self.__stats, snapshot, self.__sections, self.__skipped)
+            self.__stats = None
+            return result
+
+
+    def section(self):
+        """
+        Returns context manager that profiles the enclosed code if profiling is active. Nested sections of the same
+        thread are profiled by the outer one.
+
+        """
+        if (self.__active is False) or getattr(self.__local, 'profiling', False):
+            return Profiler.__NULL_SECTION
+
+        return _ProfilingSection(self, self.__generation)
+
+
+    def enter_section(self):
+        self.__local.profiling = True
+
+
+    def leave_section(self, generation, profile):
+        import pstats
+
+        self.__local.profiling = False
+
+        with self.__lock:
+            if (self.__active is False) or (generation != self.__generation):
+                return
+
+            if profile is None:
+                self.__skipped += 1
+                return
+
+            self.__sections += 1
+            if self.__stats is None:
+                self.__stats = pstats.Stats(profile)
+            else:
+                self.__stats.add(profile)
+
+
+class _ProfilingSection:
+    def __init__(self, profiler, generation):
+        self.__profiler = profiler
+        self.__generation = generation
+        self.__profile = None
+
+
+    def __enter__(self):
+        import cProfile
+
+        self.__profiler.enter_section()
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            self.__profile = profile
+        except ValueError:
+            # another profiler is active (Python 3.12+ allows only one per process)
+            self.__profile = None
+
+        return self
+
+
+    def __exit__(self, *args):
+        if self.__profile is not None:
+            self.__profile.disable()
+            self.__profile.create_stats()
+
+        self.__profiler.leave_section(self.__generation, self.__profile)
+        return False
@@ -0,0 +1,55 @@
+"""
+
+HttpCtrl library provides HTTP/HTTPS client and server API to Robot Framework to make REST API testing easy.
+
+Authors: Andrei Novikov
+Date: 2018-2022
+Copyright: The 3-Clause BSD License
+
+"""
+
+import threading
+
+from HttpCtrl.utils.singleton import Singleton
+
+
+class WarmServerStorage(metaclass=Singleton):
+    """
+    Keeps server that is started in warm mode and its serving thread between tests, because server library
+    instance is created for each test. Server is identified by its endpoint and TLS configuration.
+
+    """
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__key = None
+        self.__server = None
+        self.__thread = None
+
+
+    def get(self, key):
+        with self.__lock:
+            if (self.__server is None) or (self.__key != key):
+                return None
+
+            return self.__server, self.__thread
+
+
+    def set(self, key, server, thread):
+        with self.__lock:
+            self.__key = key
+            self.__server = server
+            self.__thread = thread
+
+
+    def pop(self):
+        with self.__lock:
+            if self.__server is None:
+                return None
+
+            server, thread = self.__server, self.__thread
+
+            self.__key = None
+            self.__server = None
+            self.__thread = None
+
+            return server, thread